@@ -0,0 +1,60 @@
+# scripts/bench_timestamps.py
+"""
+Micro-benchmark of timestamp parsing in the model constructors.
+
+Builds Container models from 100k synthetic `docker ps --format json` rows three ways: with
+the old strptime-based parsing, with the lazy `created` field left unread, and with every
+`created` read (forcing parse_docker_timestamp). Run from the repository root:
+
+    python scripts/bench_timestamps.py [rows]
+"""
+
+import os
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.models.container import Container  # noqa: E402
+from src.utils.docker_utils import parse_ports, parse_size  # noqa: E402
+
+
+def make_rows(count):
+    return [{
+        "ID": f"{i:012x}", "Names": f"app-{i}", "Image": "nginx:latest", "Status": "Up 2 hours",
+        "State": "running", "CreatedAt": f"2024-07-{i % 28 + 1:02d} {i % 24:02d}:{i % 60:02d}:{i % 60:02d} +0000 UTC",
+        "Ports": "0.0.0.0:8080->80/tcp", "Command": '"nginx -g daemon off;"', "Labels": "", "Networks": "bridge",
+        "Mounts": "", "Size": "0B", "RunningFor": "2 hours ago",
+    } for i in range(count)]
+
+
+def strptime_from_dict(data):
+    # Container.from_dict, but parsing `created` eagerly with strptime as it used to
+    return Container(
+        id=data['ID'], name=data['Names'], image=data['Image'], status=data['Status'], state=data['State'],
+        created=datetime.strptime(data['CreatedAt'], "%Y-%m-%d %H:%M:%S %z %Z"),
+        port_mappings=parse_ports(data['Ports']), command=data['Command'], labels=data['Labels'],
+        networks=data['Networks'], mounts=data['Mounts'], size_bytes=parse_size(data['Size']),
+    )
+
+
+def bench(label, build, rows):
+    start = time.perf_counter()
+    for row in rows:
+        build(row)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} {elapsed * 1e6 / len(rows):8.2f} us/row  ({elapsed:.3f}s total)")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    rows = make_rows(count)
+    print(f"{count} rows")
+    bench("strptime (before)", strptime_from_dict, rows)
+    bench("lazy, created unread", Container.from_dict, rows)
+    bench("lazy, created read", lambda data: Container.from_dict(data).created, rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+# src/core/disk_usage.py
+
+import logging
+import threading
+import time
+from typing import Callable, Dict, NamedTuple, Optional, TypeVar
+
+from .docker_client import api_request
+from .models.container import Container
+from .models.image import Image
+from .models.volume import Volume
+
+# Set up logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+DEFAULT_REFRESH_INTERVAL = 60.0
+
+
+class BuildCacheRecord(NamedTuple):
+    """
+    One build cache entry of a `system df` report.
+    """
+    id: str
+    type: str
+    description: str
+    size_bytes: int
+    in_use: bool
+    shared: bool
+    usage_count: int
+
+
+def _build_cache_record(record: dict) -> BuildCacheRecord:
+    return BuildCacheRecord(
+        id=record['ID'],
+        type=record.get('Type', ""),
+        description=record.get('Description', ""),
+        size_bytes=record.get('Size', -1),
+        in_use=record.get('InUse', False),
+        shared=record.get('Shared', False),
+        usage_count=record.get('UsageCount', 0),
+    )
+
+
+def _index(items: Optional[list], build: Callable[[dict], T], key: Callable[[T], str]) -> Dict[str, T]:
+    index: Dict[str, T] = {}
+    for data in items or []:
+        try:
+            item = build(data)
+        except KeyError as e:
+            logger.error(f"Missing key in disk usage data: {e}")
+            continue
+        index[key(item)] = item
+    return index
+
+
+class DiskUsage:
+    """
+    One `GET /system/df` report, indexed for lookups.
+
+    Volumes are keyed by name, images and containers by ID and build cache records by ID, so
+    looking up the usage of one object is a dict lookup however many objects the daemon has.
+    """
+
+    def __init__(self, volumes: Dict[str, Volume], images: Dict[str, Image], containers: Dict[str, Container],
+                 build_cache: Dict[str, BuildCacheRecord], layers_size: int, taken_at: float):
+        self.volumes = volumes
+        self.images = images
+        self.containers = containers
+        self.build_cache = build_cache
+        self.layers_size = layers_size
+        self.taken_at = taken_at
+
+    @classmethod
+    def from_api(cls, data: dict, taken_at: float) -> 'DiskUsage':
+        """
+        Index a `GET /system/df` payload.
+
+        Args:
+            data (dict): The payload.
+            taken_at (float): When the report was taken, on the index's clock.
+
+        Returns:
+            DiskUsage: The indexed report. Entries with missing keys are logged and skipped.
+        """
+        volumes = _index(data.get('Volumes'), Volume.from_api, lambda volume: volume.name)
+        images = _index(data.get('Images'), Image.from_api, lambda image: image.id)
+        containers = _index(data.get('Containers'), Container.from_api, lambda container: container.id)
+        build_cache = _index(data.get('BuildCache'), _build_cache_record, lambda record: record.id)
+        return cls(volumes, images, containers, build_cache, data.get('LayersSize', 0), taken_at)
+
+    def volume_size(self, volume_name: str) -> int:
+        """
+        Get the size of a volume in bytes, -1 if it is unknown.
+        """
+        volume = self.volumes.get(volume_name)
+        return volume.size_bytes if volume is not None else -1
+
+    @property
+    def volumes_size(self) -> int:
+        return sum(volume.size_bytes for volume in self.volumes.values() if volume.size_bytes > 0)
+
+    @property
+    def containers_size(self) -> int:
+        return sum(container.size_bytes for container in self.containers.values() if container.size_bytes > 0)
+
+    @property
+    def build_cache_size(self) -> int:
+        # Shared records are counted under the records that own them
+        return sum(record.size_bytes for record in self.build_cache.values()
+                   if record.size_bytes > 0 and not record.shared)
+
+
+def fetch_disk_usage(clock: Callable[[], float] = time.monotonic) -> Optional[DiskUsage]:
+    """
+    Take a `system df` report of every object kind in a single request.
+
+    Returns:
+        Optional[DiskUsage]: The indexed report, or None if the request failed.
+    """
+    # The daemon walks every volume and layer to answer, so give it as long as it needs
+    success, output = api_request("GET", "/system/df", timeout=None)
+    if not success:
+        logger.error(f"Failed to get disk usage: {output}")
+        return None
+    return DiskUsage.from_api(output, clock())
+
+
+class DiskUsageIndex:
+    """
+    Keeps the latest `system df` report and refreshes it at most once per interval.
+
+    Computing disk usage makes the daemon walk every volume and layer, so lookups are served
+    from the last report while it is younger than `refresh_interval`. Callers that find the
+    report stale while another caller is refreshing it wait for that refresh instead of
+    starting their own.
+    """
+
+    def __init__(self, refresh_interval: float = DEFAULT_REFRESH_INTERVAL,
+                 fetch: Optional[Callable[[], Optional[DiskUsage]]] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            refresh_interval (float): How long a report is served before it is taken again, in seconds.
+            fetch (Optional[Callable[[], Optional[DiskUsage]]]): Takes a report, defaults to fetch_disk_usage().
+            clock (Callable[[], float]): The monotonic time source.
+        """
+        self.refresh_interval = refresh_interval
+        self.fetch = fetch or (lambda: fetch_disk_usage(clock))
+        self.clock = clock
+        self._usage: Optional[DiskUsage] = None
+        self._lock = threading.Lock()
+
+    def _is_fresh(self, usage: Optional[DiskUsage], max_age: float) -> bool:
+        return usage is not None and self.clock() - usage.taken_at < max_age
+
+    def get(self, max_age: Optional[float] = None) -> Optional[DiskUsage]:
+        """
+        Get a report no older than `max_age`, taking a new one if needed.
+
+        Args:
+            max_age (Optional[float]): The oldest acceptable report in seconds, defaults to the refresh interval;
+                0 forces a new report.
+
+        Returns:
+            Optional[DiskUsage]: The report, or the previous one (None if there is none) if a new one could not be taken.
+        """
+        max_age = self.refresh_interval if max_age is None else max_age
+        usage = self._usage
+        if self._is_fresh(usage, max_age):
+            return usage
+        with self._lock:
+            # Someone else may have refreshed it while we waited
+            usage = self._usage
+            if self._is_fresh(usage, max_age):
+                return usage
+            fresh = self.fetch()
+            if fresh is not None:
+                self._usage = fresh
+            return self._usage
+
+    def peek(self) -> Optional[DiskUsage]:
+        """
+        Get the last report without refreshing it.
+        """
+        return self._usage
+
+    def volume_size(self, volume_name: str) -> int:
+        """
+        Get the size of a volume in bytes from a fresh enough report, -1 if it is unknown.
+        """
+        usage = self.get()
+        return usage.volume_size(volume_name) if usage is not None else -1
+
+    def invalidate(self) -> None:
+        """
+        Make the next lookup take a new report, e.g. after volumes or images were removed.
+        """
+        with self._lock:
+            self._usage = None
+
+
+# Shared by the service layer and the views
+disk_usage_index = DiskUsageIndex()
@@ -0,0 +1,508 @@
+# src/core/docker_client.py
+
+import http.client
+import json
+import logging
+import os
+import socket
+import threading
+import time
+from collections import abc
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Tuple
+from urllib.parse import quote, urlencode, urlparse
+
+# Set up logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+DEFAULT_SOCKET_PATH = "/var/run/docker.sock"
+DEFAULT_POOL_SIZE = 8
+DEFAULT_TIMEOUT = 60.0
+PING_TIMEOUT = 3.0
+
+
+class DockerClientError(Exception):
+    """
+    Raised when the Docker Engine API cannot be reached or the exchange fails.
+    """
+
+
+class DockerAPIError(DockerClientError):
+    """
+    Raised when the Docker Engine API answers with an error status.
+    """
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class APIResponse(NamedTuple):
+    """
+    A fully read response from the Docker Engine API.
+    """
+    status: int
+    headers: http.client.HTTPMessage
+    body: bytes
+
+    def json(self) -> Any:
+        """
+        Decode the response body as JSON.
+
+        Returns:
+            Any: The decoded body, or None if the body is empty.
+        """
+        if not self.body:
+            return None
+        return json.loads(self.body)
+
+
+class DockerStream:
+    """
+    An open streaming response (events, logs, stats, progress) on a dedicated connection.
+    """
+
+    def __init__(self, conn: http.client.HTTPConnection, response: http.client.HTTPResponse):
+        self._conn = conn
+        self._response = response
+        self.status = response.status
+        self.headers = response.headers
+
+    def read(self, amount: int) -> bytes:
+        """
+        Read up to `amount` bytes, blocking until at least some data arrives.
+
+        Returns:
+            bytes: The data read, or b"" once the stream has ended.
+
+        Raises:
+            DockerClientError: If the connection fails mid-stream.
+        """
+        try:
+            return self._response.read1(amount)
+        except (OSError, ValueError, http.client.HTTPException) as e:
+            raise DockerClientError(f"Stream interrupted: {e}") from e
+
+    def read_exactly(self, amount: int) -> bytes:
+        """
+        Read exactly `amount` bytes, unless the stream ends first.
+
+        Returns:
+            bytes: The data read; shorter than `amount` only at the end of the stream.
+
+        Raises:
+            DockerClientError: If the connection fails mid-stream.
+        """
+        chunks = []
+        remaining = amount
+        while remaining > 0:
+            chunk = self.read(remaining)
+            if not chunk:
+                break
+            chunks.append(chunk)
+            remaining -= len(chunk)
+        return b"".join(chunks)
+
+    def iter_lines(self) -> Iterator[bytes]:
+        """
+        Iterate over the non-empty lines of the stream as they arrive.
+
+        Yields:
+            bytes: Each line, without surrounding whitespace.
+
+        Raises:
+            DockerClientError: If the connection fails mid-stream.
+        """
+        while True:
+            try:
+                line = self._response.readline()
+            except (OSError, ValueError, http.client.HTTPException) as e:
+                raise DockerClientError(f"Stream interrupted: {e}") from e
+            if not line:
+                return
+            line = line.strip()
+            if line:
+                yield line
+
+    def iter_json(self) -> Iterator[Any]:
+        """
+        Iterate over a newline-delimited JSON stream as messages arrive.
+
+        Yields:
+            Any: Each decoded message; lines that are not valid JSON are skipped.
+        """
+        for line in self.iter_lines():
+            try:
+                yield json.loads(line)
+            except ValueError:
+                logger.warning(f"Skipping malformed stream message: {line[:200]!r}")
+
+    def interrupt(self) -> None:
+        """
+        Unblock a reader waiting on this stream from another thread; the reader then sees the end of the stream.
+        """
+        sock = self._conn.sock
+        if sock is not None:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    """
+    An HTTP connection that talks to the Docker daemon over a unix socket.
+    """
+
+    def __init__(self, socket_path: str, timeout: Optional[float] = DEFAULT_TIMEOUT):
+        super().__init__("localhost", timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self) -> None:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(self.socket_path)
+        except OSError:
+            sock.close()
+            raise
+        self.sock = sock
+
+
+class DockerClient:
+    """
+    A thread-safe Docker Engine API client backed by a pool of keep-alive connections.
+
+    Each request borrows an idle connection from the pool (or opens a new one), and hands it
+    back once the response has been read completely, so consecutive calls cost a single
+    round trip on an already open socket.
+    """
+
+    def __init__(self, base_url: Optional[str] = None, pool_size: int = DEFAULT_POOL_SIZE,
+                 timeout: Optional[float] = DEFAULT_TIMEOUT):
+        """
+        Args:
+            base_url (Optional[str]): The daemon address, e.g. "unix:///var/run/docker.sock" or
+                "tcp://127.0.0.1:2375". Defaults to $DOCKER_HOST, then the local unix socket.
+            pool_size (int): The maximum number of idle connections kept open.
+            timeout (Optional[float]): The default socket timeout in seconds.
+        """
+        self.base_url = base_url or os.environ.get("DOCKER_HOST") or f"unix://{DEFAULT_SOCKET_PATH}"
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self._idle: List[http.client.HTTPConnection] = []
+        self._lock = threading.Lock()
+        # Why the engine is known to be unreachable, set by an EngineMonitor; requests fail fast meanwhile
+        self.unavailable: Optional[str] = None
+
+        parsed = urlparse(self.base_url)
+        if parsed.scheme == "unix":
+            self._socket_path = parsed.path or DEFAULT_SOCKET_PATH
+            self._host, self._port = None, None
+        elif parsed.scheme in ("tcp", "http"):
+            self._socket_path = None
+            self._host, self._port = parsed.hostname or "localhost", parsed.port or 2375
+        else:
+            raise DockerClientError(f"Unsupported Docker host: {self.base_url}")
+
+    def _new_connection(self) -> http.client.HTTPConnection:
+        if self._socket_path is not None:
+            return UnixHTTPConnection(self._socket_path, timeout=self.timeout)
+        return http.client.HTTPConnection(self._host, self._port, timeout=self.timeout)
+
+    def _acquire(self) -> Tuple[http.client.HTTPConnection, bool]:
+        with self._lock:
+            if self._idle:
+                return self._idle.pop(), True
+        return self._new_connection(), False
+
+    def _release(self, conn: http.client.HTTPConnection) -> None:
+        with self._lock:
+            if len(self._idle) < self.pool_size:
+                self._idle.append(conn)
+                return
+        conn.close()
+
+    @staticmethod
+    def _set_timeout(conn: http.client.HTTPConnection, timeout: Optional[float]) -> None:
+        conn.timeout = timeout
+        if conn.sock is not None:
+            conn.sock.settimeout(timeout)
+
+    @staticmethod
+    def build_url(path: str, params: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Build a request target from an API path and query parameters.
+
+        Dict and list values are JSON encoded (as the API expects for `filters`), booleans are
+        sent as 1/0 and None values are dropped.
+
+        Args:
+            path (str): The API path, e.g. "/containers/json".
+            params (Optional[Dict[str, Any]]): The query parameters.
+
+        Returns:
+            str: The request target.
+        """
+        if not params:
+            return path
+        query = []
+        for key, value in params.items():
+            if value is None:
+                continue
+            if isinstance(value, bool):
+                value = "1" if value else "0"
+            elif isinstance(value, (dict, list)):
+                value = json.dumps(value)
+            query.append((key, str(value)))
+        return f"{path}?{urlencode(query)}" if query else path
+
+    @staticmethod
+    def _encode_body(body: Any, headers: Dict[str, str]) -> Any:
+        # Iterators of bytes (e.g. a tar being built on the fly) are sent with chunked encoding
+        if body is None or isinstance(body, (bytes, abc.Iterator)):
+            return body
+        headers.setdefault("Content-Type", "application/json")
+        return json.dumps(body).encode("utf-8")
+
+    def request(self, method: str, path: str, params: Optional[Dict[str, Any]] = None,
+                body: Any = None, headers: Optional[Dict[str, str]] = None,
+                timeout: Optional[float] = DEFAULT_TIMEOUT) -> APIResponse:
+        """
+        Send a request over a pooled connection and read the whole response.
+
+        Args:
+            method (str): The HTTP method.
+            path (str): The API path.
+            params (Optional[Dict[str, Any]]): The query parameters.
+            body (Any): A JSON-serialisable payload, raw bytes, or an iterator of bytes.
+            headers (Optional[Dict[str, str]]): Extra request headers.
+            timeout (Optional[float]): The socket timeout for this request, None to wait forever.
+
+        Returns:
+            APIResponse: The response status, headers and body.
+
+        Raises:
+            DockerClientError: If the daemon cannot be reached or the exchange fails, or immediately
+                while the engine is known to be down.
+        """
+        self._check_available(method, path)
+        return self._exchange(method, path, params, body, headers, timeout)
+
+    def _check_available(self, method: str, path: str) -> None:
+        reason = self.unavailable
+        if reason is not None:
+            raise DockerClientError(f"{method} {path} failed: Docker engine is down ({reason})")
+
+    def _exchange(self, method: str, path: str, params: Optional[Dict[str, Any]], body: Any,
+                  headers: Optional[Dict[str, str]], timeout: Optional[float]) -> APIResponse:
+        headers = dict(headers or {})
+        payload = self._encode_body(body, headers)
+        url = self.build_url(path, params)
+
+        # A stream can only be sent once, so it gets a fresh connection instead of a retry on a pooled one
+        replayable = not isinstance(payload, abc.Iterator)
+
+        while True:
+            conn, reused = self._acquire() if replayable else (self._new_connection(), False)
+            self._set_timeout(conn, timeout)
+            try:
+                conn.request(method, url, body=payload, headers=headers)
+                response = conn.getresponse()
+                data = response.read()
+            except (OSError, http.client.HTTPException) as e:
+                conn.close()
+                # An idle keep-alive connection may have been closed by the daemon; retry on a fresh one.
+                if reused and isinstance(e, (ConnectionError, http.client.RemoteDisconnected,
+                                             http.client.BadStatusLine)):
+                    continue
+                raise DockerClientError(f"{method} {path} failed: {e}") from e
+
+            if response.will_close:
+                conn.close()
+            else:
+                self._release(conn)
+            return APIResponse(response.status, response.headers, data)
+
+    def request_json(self, method: str, path: str, params: Optional[Dict[str, Any]] = None,
+                     body: Any = None, headers: Optional[Dict[str, str]] = None,
+                     timeout: Optional[float] = DEFAULT_TIMEOUT) -> Any:
+        """
+        Send a request and decode its JSON response.
+
+        Returns:
+            Any: The decoded response body, or None if it is empty.
+
+        Raises:
+            DockerAPIError: If the daemon answers with an error status.
+            DockerClientError: If the daemon cannot be reached or the exchange fails.
+        """
+        response = self.request(method, path, params=params, body=body, headers=headers, timeout=timeout)
+        if response.status >= 400:
+            raise DockerAPIError(response.status, api_error_message(response.body))
+        try:
+            return response.json()
+        except ValueError as e:
+            raise DockerClientError(f"Invalid JSON in response to {method} {path}: {e}") from e
+
+    @contextmanager
+    def stream(self, method: str, path: str, params: Optional[Dict[str, Any]] = None,
+               body: Any = None, headers: Optional[Dict[str, str]] = None,
+               timeout: Optional[float] = None) -> Iterator[DockerStream]:
+        """
+        Open a long-lived streaming response (events, logs, stats, progress).
+
+        The stream gets a dedicated connection that is closed when the context exits, so it
+        never blocks the pool.
+
+        Yields:
+            DockerStream: The open stream, ready to be read incrementally.
+
+        Raises:
+            DockerAPIError: If the daemon answers with an error status.
+            DockerClientError: If the daemon cannot be reached or the exchange fails.
+        """
+        self._check_available(method, path)
+        headers = dict(headers or {})
+        payload = self._encode_body(body, headers)
+        conn = self._new_connection()
+        conn.timeout = timeout
+        try:
+            try:
+                conn.request(method, self.build_url(path, params), body=payload, headers=headers)
+                response = conn.getresponse()
+            except (OSError, http.client.HTTPException) as e:
+                raise DockerClientError(f"{method} {path} failed: {e}") from e
+            if response.status >= 400:
+                raise DockerAPIError(response.status, api_error_message(response.read()))
+            yield DockerStream(conn, response)
+        finally:
+            conn.close()
+
+    def ping(self, timeout: Optional[float] = PING_TIMEOUT) -> float:
+        """
+        Check that the daemon answers `GET /_ping`, the cheapest call of the Engine API.
+
+        Unlike other requests, a ping is sent even while the engine is known to be down, since
+        it is how the engine is found to be back.
+
+        Args:
+            timeout (Optional[float]): The socket timeout in seconds.
+
+        Returns:
+            float: The round trip time in seconds.
+
+        Raises:
+            DockerAPIError: If the daemon answers with an error status, e.g. while it starts.
+            DockerClientError: If the daemon cannot be reached.
+        """
+        started = time.perf_counter()
+        response = self._exchange("GET", "/_ping", None, None, None, timeout)
+        if response.status >= 400:
+            raise DockerAPIError(response.status, api_error_message(response.body))
+        return time.perf_counter() - started
+
+    def close(self) -> None:
+        """
+        Close every idle connection in the pool.
+        """
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+
+
+def api_error_message(body: bytes) -> str:
+    """
+    Extract the error message from an Engine API error body.
+
+    Args:
+        body (bytes): The response body.
+
+    Returns:
+        str: The daemon's message, or the raw body if it is not a JSON error object.
+    """
+    try:
+        data = json.loads(body)
+        if isinstance(data, dict) and "message" in data:
+            return data["message"]
+    except ValueError:
+        pass
+    return body.decode("utf-8", errors="replace").strip()
+
+
+def quote_path(value: str) -> str:
+    """
+    Quote an object ID, name or image reference for use in an API path.
+
+    Slashes and colons are kept as-is, since the daemon routes image references such as
+    "localhost:5000/app" through wildcard path segments.
+
+    Args:
+        value (str): The ID, name or reference.
+
+    Returns:
+        str: The quoted value.
+    """
+    return quote(value, safe="/:")
+
+
+_client: Optional[DockerClient] = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> DockerClient:
+    """
+    Get the process-wide shared Docker client, creating it on first use.
+
+    Returns:
+        DockerClient: The shared client.
+    """
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = DockerClient()
+        return _client
+
+
+def set_client(client: Optional[DockerClient]) -> None:
+    """
+    Replace the process-wide shared Docker client, closing the previous one.
+
+    Args:
+        client (Optional[DockerClient]): The new client, or None to recreate it from the environment on next use.
+    """
+    global _client
+    with _client_lock:
+        previous, _client = _client, client
+    if previous is not None and previous is not client:
+        previous.close()
+
+
+def api_request(method: str, path: str, params: Optional[Dict[str, Any]] = None,
+                body: Any = None, headers: Optional[Dict[str, str]] = None,
+                timeout: Optional[float] = DEFAULT_TIMEOUT) -> Tuple[bool, Any]:
+    """
+    Execute a Docker Engine API request on the shared client.
+
+    Args:
+        method (str): The HTTP method.
+        path (str): The API path.
+        params (Optional[Dict[str, Any]]): The query parameters.
+        body (Any): A JSON-serialisable payload, or raw bytes.
+        headers (Optional[Dict[str, str]]): Extra request headers.
+        timeout (Optional[float]): The socket timeout for this request, None to wait forever.
+
+    Returns:
+        Tuple[bool, Any]: A tuple containing a boolean indicating success and either the decoded
+        JSON response or the error message.
+    """
+    try:
+        return True, get_client().request_json(method, path, params=params, body=body,
+                                               headers=headers, timeout=timeout)
+    except DockerClientError as e:
+        error_message = f"Error executing Docker API request: {e}"
+        logger.error(error_message)
+        return False, error_message
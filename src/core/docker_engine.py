@@ -3,6 +3,7 @@ import shutil
 from typing import Tuple, List, Optional
 import logging
 import platform
+from .docker_client import DockerClientError, get_client
 
 # Set up logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -26,15 +27,18 @@ class DockerEngineManager:
     @staticmethod
     def is_docker_running() -> bool:
         """
-        Check if the Docker engine is currently running.
+        Check if the Docker engine is currently running by pinging its API.
+
+        A ping costs the daemon next to nothing, unlike `docker info`, which gathers a full
+        system report in a separate process.
 
         Returns:
             bool: True if Docker is running, False otherwise.
         """
         try:
-            subprocess.run(["docker", "info"], capture_output=True, check=True)
+            get_client().ping()
             return True
-        except subprocess.CalledProcessError:
+        except DockerClientError:
             return False
 
     @classmethod
@@ -0,0 +1,215 @@
+# src/core/engine_monitor.py
+
+import logging
+import threading
+import time
+from typing import Callable, List, NamedTuple, Optional
+
+from .docker_client import DockerAPIError, DockerClient, DockerClientError, get_client
+from src.utils.ring_buffer import RingBuffer
+
+# Set up logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# States of the engine, as seen from its pings
+STARTING = "starting"  # Not pinged yet, or answering with an error while it starts
+UP = "up"
+DEGRADED = "degraded"  # Answering slowly, or missed a ping after being up
+DOWN = "down"
+
+
+class EngineHealth(NamedTuple):
+    """
+    The outcome of the latest ping, with latency statistics over the recent ones.
+    """
+    state: str
+    latency: Optional[float]  # Seconds, None if the ping failed
+    average_latency: Optional[float]
+    max_latency: Optional[float]
+    failures: int  # Consecutive failed pings
+    error: str
+    checked_at: float  # Seconds since the epoch
+    since: float  # When the engine entered this state, in seconds since the epoch
+
+
+INITIAL_HEALTH = EngineHealth(STARTING, None, None, None, 0, "", 0.0, 0.0)
+
+
+class EngineMonitor:
+    """
+    Follows whether the Docker engine answers, by pinging it from a background thread.
+
+    A ping is the cheapest call of the Engine API, so the engine is checked every `interval`
+    seconds at no noticeable cost. While it does not answer, pings back off exponentially
+    from `min_backoff` to `max_backoff` seconds, and the client is marked unavailable so that
+    every other request fails at once instead of waiting out its own timeout.
+
+    Subscriber callbacks run on the monitor's background thread, after every ping.
+    """
+
+    def __init__(self, client: Optional[DockerClient] = None, interval: float = 5.0,
+                 min_backoff: float = 1.0, max_backoff: float = 30.0, slow_latency: float = 0.5,
+                 failures_until_down: int = 2, window: int = 20, clock: Callable[[], float] = time.time):
+        """
+        Args:
+            client (Optional[DockerClient]): The client to ping and gate, defaults to the shared client.
+            interval (float): The seconds between pings while the engine answers.
+            min_backoff (float): The first delay in seconds after a failed ping.
+            max_backoff (float): The longest delay in seconds between pings while the engine is down.
+            slow_latency (float): The average round trip in seconds above which the engine is degraded.
+            failures_until_down (int): The consecutive failed pings after which an engine that was up is down.
+            window (int): The number of recent pings the latency statistics cover.
+            clock (Callable[[], float]): The wall clock, in seconds since the epoch.
+        """
+        self.client = client
+        self.interval = interval
+        self.min_backoff = min_backoff
+        self.max_backoff = max_backoff
+        self.slow_latency = slow_latency
+        self.failures_until_down = failures_until_down
+        self.clock = clock
+        self._latencies: RingBuffer[float] = RingBuffer(window)
+        self._health = INITIAL_HEALTH
+        self._delay = min_backoff
+        self._subscribers: List[Callable[[EngineHealth], None]] = []
+        self._lock = threading.RLock()
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def health(self) -> EngineHealth:
+        return self._health
+
+    @property
+    def state(self) -> str:
+        return self._health.state
+
+    def is_down(self) -> bool:
+        return self._health.state == DOWN
+
+    def subscribe(self, callback: Callable[[EngineHealth], None]) -> Callable[[], None]:
+        """
+        Register a callback for the outcome of every ping.
+
+        Args:
+            callback (Callable[[EngineHealth], None]): Called with the new EngineHealth.
+
+        Returns:
+            Callable[[], None]: A function that removes the subscription.
+        """
+        with self._lock:
+            self._subscribers.append(callback)
+        return lambda: self.unsubscribe(callback)
+
+    def unsubscribe(self, callback: Callable[[EngineHealth], None]) -> None:
+        """
+        Remove a callback registered with subscribe().
+        """
+        with self._lock:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+
+    def _publish(self, health: EngineHealth) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for callback in subscribers:
+            try:
+                callback(health)
+            except Exception:
+                logger.exception("Engine monitor subscriber failed")
+
+    def check(self) -> EngineHealth:
+        """
+        Ping the engine once, update its state and notify the subscribers.
+
+        Returns:
+            EngineHealth: The new health.
+        """
+        client = self.client or get_client()
+        latency, error, answered = None, "", False
+        try:
+            latency = client.ping()
+        except DockerAPIError as e:
+            error, answered = e.message, True
+        except DockerClientError as e:
+            # The socket error says more than the request that failed
+            error = str(e.__cause__ or e)
+
+        with self._lock:
+            previous = self._health
+            failures = 0 if latency is not None else previous.failures + 1
+            if latency is not None:
+                self._latencies.append(latency)
+            latencies = self._latencies.snapshot()
+            average = sum(latencies) / len(latencies) if latencies else None
+
+            if latency is not None:
+                state = DEGRADED if average > self.slow_latency else UP
+            elif answered:
+                # The daemon is there but not ready to serve, as while it starts
+                state = STARTING
+            elif previous.state in (UP, DEGRADED) and failures < self.failures_until_down:
+                state = DEGRADED
+            else:
+                state = DOWN
+
+            now = self.clock()
+            since = previous.since if state == previous.state and previous.checked_at else now
+            health = EngineHealth(state, latency, average, max(latencies) if latencies else None,
+                                  failures, error, now, since)
+            self._health = health
+            if latency is not None:
+                self._delay = self.interval
+            else:
+                # The first failure is retried soon; only repeated ones back off
+                self._delay = self.min_backoff if failures == 1 else min(self._delay * 2, self.max_backoff)
+            client.unavailable = error if state == DOWN else None
+
+        if state != previous.state:
+            log = logger.warning if state in (DEGRADED, DOWN) else logger.info
+            log(f"Docker engine is {state}" + (f": {error}" if error else ""))
+        self._publish(health)
+        return health
+
+    def next_delay(self) -> float:
+        """
+        Get the seconds until the next ping: `interval` while the engine answers, backing off while it does not.
+        """
+        return self._delay
+
+    def check_now(self) -> None:
+        """
+        Ping the engine as soon as possible instead of waiting out the delay, e.g. after starting it.
+        """
+        with self._lock:
+            self._delay = self.min_backoff
+        self._wake.set()
+
+    def start(self) -> None:
+        """
+        Start pinging the engine in a background thread.
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name="docky-engine-monitor", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = 5.0) -> None:
+        """
+        Stop pinging the engine and let requests through again.
+        """
+        self._stopped.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        (self.client or get_client()).unavailable = None
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            self.check()
+            self._wake.wait(self.next_delay())
+            self._wake.clear()
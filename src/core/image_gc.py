@@ -0,0 +1,296 @@
+# src/core/image_gc.py
+
+import logging
+import time
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from .disk_usage import disk_usage_index
+from .docker_client import DockerAPIError, DockerClientError, get_client, quote_path
+from .inspect_cache import inspect_cache
+from .layer_index import LayerIndex
+from .services.batch import DEFAULT_MAX_WORKERS, FAILED, SUCCEEDED, BulkResult, run_bulk
+
+# Set up logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+UNTAGGED = "<none>:<none>"
+
+
+class GCPolicy(NamedTuple):
+    """
+    Which images an image garbage collection removes.
+
+    A tag expires when it is not one of the `keep_last` newest tags of its repository (if
+    set) and its image is older than `older_than` seconds (if set); with neither set, no tag
+    expires. Images whose tags have all expired are removed. Untagged images are removed if
+    `untagged` is set, or, with `dangling`, only those no other image is built on; `older_than`
+    applies to them too.
+    """
+    older_than: Optional[float] = None
+    keep_last: Optional[int] = None
+    dangling: bool = True
+    untagged: bool = False
+
+
+class ImageNode(NamedTuple):
+    id: str
+    parent: str
+    tags: Tuple[str, ...]
+    created: int
+    size_bytes: int
+
+
+class ImageGraph:
+    """
+    Every image (intermediate ones included) with its parent, children and the containers using it.
+
+    Built from two listings, so a graph of thousands of images costs two requests.
+    """
+
+    def __init__(self, images: Iterable[ImageNode], container_images: Dict[str, Set[str]]):
+        """
+        Args:
+            images (Iterable[ImageNode]): The images.
+            container_images (Dict[str, Set[str]]): The IDs of the containers using each image, keyed by image ID.
+        """
+        self.images: Dict[str, ImageNode] = {image.id: image for image in images}
+        self.children: Dict[str, Set[str]] = {image_id: set() for image_id in self.images}
+        for image in self.images.values():
+            if image.parent in self.children:
+                self.children[image.parent].add(image.id)
+        self.containers = container_images
+
+    @classmethod
+    def from_api(cls, images: List[dict], containers: List[dict]) -> 'ImageGraph':
+        """
+        Build the graph from `GET /images/json?all=1` and `GET /containers/json?all=1` payloads.
+        """
+        # IDs are kept without their "sha256:" prefix, as everywhere else
+        nodes = [ImageNode(
+            id=data['Id'].split(':', 1)[-1],
+            parent=(data.get('ParentId') or "").split(':', 1)[-1],
+            tags=tuple(tag for tag in data.get('RepoTags') or () if tag != UNTAGGED),
+            created=data.get('Created', 0),
+            size_bytes=data.get('Size', -1),
+        ) for data in images]
+        container_images: Dict[str, Set[str]] = {}
+        for data in containers:
+            image_id = data.get('ImageID', "").split(':', 1)[-1]
+            container_images.setdefault(image_id, set()).add(data['Id'])
+        return cls(nodes, container_images)
+
+    @classmethod
+    def fetch(cls) -> 'ImageGraph':
+        """
+        List the images and containers from the daemon and build the graph.
+
+        Raises:
+            DockerClientError: If the daemon cannot be reached or answers with an error.
+        """
+        client = get_client()
+        images = client.request_json("GET", "/images/json", params={"all": True})
+        containers = client.request_json("GET", "/containers/json", params={"all": True})
+        return cls.from_api(images, containers)
+
+
+class GCAction(NamedTuple):
+    """
+    One step of a plan: untag a reference, or delete an image by ID.
+    """
+    kind: str  # UNTAG or DELETE
+    target: str
+    image_id: str
+
+
+UNTAG = "untag"
+DELETE = "delete"
+
+
+class GCPlan(NamedTuple):
+    """
+    What a garbage collection would do, in a safe order.
+
+    `untags` come first (any order), then each of `waves` in turn; within a wave, no image is
+    the parent of another, and each image is deleted only after all its children. `kept`
+    gives the reason each image matching the policy is nonetheless kept. Planning changes
+    nothing, so a plan doubles as the dry run.
+    """
+    untags: List[GCAction]
+    waves: List[List[GCAction]]
+    kept: Dict[str, str]
+    parents: Dict[str, str]
+    freed_bytes: int
+    exact: bool  # Whether freed_bytes counts shared layers exactly or is a lower bound
+
+    @property
+    def deletions(self) -> int:
+        return sum(len(wave) for wave in self.waves)
+
+
+def _expired_tags(graph: ImageGraph, policy: GCPolicy, now: float) -> Set[str]:
+    if policy.keep_last is None and policy.older_than is None:
+        return set()
+    by_repository: Dict[str, List[Tuple[int, str]]] = {}
+    for image in graph.images.values():
+        for tag in image.tags:
+            by_repository.setdefault(tag.rpartition(':')[0], []).append((image.created, tag))
+    expired = set()
+    for tags in by_repository.values():
+        tags.sort(reverse=True)
+        for position, (created, tag) in enumerate(tags):
+            if policy.keep_last is not None and position < policy.keep_last:
+                continue
+            if policy.older_than is not None and now - created < policy.older_than:
+                continue
+            expired.add(tag)
+    return expired
+
+
+def plan_gc(policy: GCPolicy, graph: Optional[ImageGraph] = None, layer_index: Optional[LayerIndex] = None,
+            now: Optional[float] = None) -> GCPlan:
+    """
+    Work out which images a policy removes and in which order, without changing anything.
+
+    An image is only deleted if no container (running or not) uses it and every image built
+    on it is deleted too; otherwise its expired tags are still removed if it keeps others.
+
+    Args:
+        policy (GCPolicy): What to remove.
+        graph (Optional[ImageGraph]): The image graph, fetched from the daemon if not given.
+        layer_index (Optional[LayerIndex]): If given, it is refreshed and used to count the freed space exactly;
+            otherwise the space is estimated from the disk usage report.
+        now (Optional[float]): The current time in seconds since the epoch, for `older_than`.
+
+    Returns:
+        GCPlan: The plan; run it with run_gc().
+    """
+    graph = graph or ImageGraph.fetch()
+    now = time.time() if now is None else now
+    expired = _expired_tags(graph, policy, now)
+
+    candidates = set()
+    for image in graph.images.values():
+        if image.tags:
+            if all(tag in expired for tag in image.tags):
+                candidates.add(image.id)
+        elif policy.older_than is not None and now - image.created < policy.older_than:
+            continue
+        elif policy.untagged or (policy.dangling and not graph.children[image.id]):
+            candidates.add(image.id)
+
+    kept: Dict[str, str] = {}
+    for image_id in list(candidates):
+        if graph.containers.get(image_id):
+            kept[image_id] = f"used by {len(graph.containers[image_id])} container(s)"
+            candidates.discard(image_id)
+    # Keep every image with a kept child, up to the root of each chain
+    changed = True
+    while changed:
+        changed = False
+        for image_id in list(candidates):
+            if any(child not in candidates for child in graph.children[image_id]):
+                kept[image_id] = "has dependent child images"
+                candidates.discard(image_id)
+                changed = True
+
+    untags = []
+    for image in graph.images.values():
+        tags = [tag for tag in image.tags if tag in expired]
+        if image.id in candidates:
+            # Leave one tag so the image can be deleted by ID without forcing
+            tags = tags[:-1]
+        elif len(tags) == len(image.tags):
+            continue  # Removing its last tag would try to delete a kept image
+        untags.extend(GCAction(UNTAG, tag, image.id) for tag in tags)
+
+    waves = []
+    remaining = set(candidates)
+    while remaining:
+        wave = sorted(image_id for image_id in remaining if not graph.children[image_id] & remaining)
+        if not wave:
+            break  # A cycle, which a real image graph never has
+        waves.append([GCAction(DELETE, image_id, image_id) for image_id in wave])
+        remaining.difference_update(wave)
+
+    if layer_index is not None:
+        layer_index.refresh(graph.images)
+        freed, exact = layer_index.report(candidates).unique_bytes, True
+    else:
+        # Layers shared between two removed images count for neither
+        usage = disk_usage_index.get()
+        known = usage.images if usage is not None else {}
+        freed = sum(max(known[image_id].unique_size_bytes, 0) for image_id in candidates if image_id in known)
+        exact = False
+    parents = {image_id: graph.images[image_id].parent for image_id in candidates}
+    return GCPlan(untags, waves, kept, parents, freed, exact)
+
+
+def _run_action(action: GCAction) -> Tuple[str, str]:
+    try:
+        # Removing a large image can take the daemon a while. Untagged parents are deleted by
+        # later waves, so the daemon must not prune them out from under the plan
+        get_client().request_json("DELETE", f"/images/{quote_path(action.target)}", params={"noprune": True},
+                                  timeout=None)
+        return SUCCEEDED, ""
+    except DockerAPIError as e:
+        if e.status == 404 and action.kind == DELETE:
+            return SUCCEEDED, ""  # Already gone, e.g. pruned by another removal
+        return FAILED, e.message
+    except DockerClientError as e:
+        return FAILED, str(e)
+    finally:
+        inspect_cache.invalidate("image", action.target)
+
+
+def run_gc(plan: GCPlan, max_workers: int = DEFAULT_MAX_WORKERS,
+           on_progress: Optional[Callable[[str, str, str], None]] = None) -> BulkResult:
+    """
+    Carry out a plan with bounded parallelism, one wave at a time.
+
+    An image whose deletion fails stays, and so do its ancestors in later waves, which would
+    fail anyway. A deleted image whose extra tags could not be removed is not deleted either.
+    The daemon is told not to prune untagged parents, which later waves delete themselves; an
+    image that is already gone counts as removed.
+
+    Args:
+        plan (GCPlan): The plan from plan_gc().
+        max_workers (int): The maximum number of removals in flight at once.
+        on_progress (Optional[Callable[[str, str, str], None]]): Called with (target, outcome, message) as each
+            step completes, from a worker thread.
+
+    Returns:
+        BulkResult: The targets removed and those that failed, with their errors.
+    """
+    result = BulkResult([], {}, [])
+    steps = {action.target: action for action in plan.untags}
+    untagged = run_bulk(steps, lambda target: _run_action(steps[target]), max_workers, on_progress)
+    result.succeeded.extend(untagged.succeeded)
+    result.failed.update(untagged.failed)
+
+    blocked: Set[str] = set()
+
+    def block(image_id: str) -> None:
+        while image_id in plan.parents and image_id not in blocked:
+            blocked.add(image_id)
+            image_id = plan.parents[image_id]
+
+    for target in untagged.failed:
+        block(steps[target].image_id)
+    for wave in plan.waves:
+        steps = {}
+        for action in wave:
+            if action.image_id in blocked:
+                result.failed[action.target] = "Kept because a tag or dependent image could not be removed"
+            else:
+                steps[action.target] = action
+        deleted = run_bulk(steps, lambda target: _run_action(steps[target]), max_workers, on_progress)
+        result.succeeded.extend(deleted.succeeded)
+        result.failed.update(deleted.failed)
+        for target in deleted.failed:
+            block(target)
+
+    disk_usage_index.invalidate()
+    logger.info(f"Image garbage collection removed {len(result.succeeded)} tags and images, "
+                f"{len(result.failed)} failed")
+    return result
@@ -0,0 +1,261 @@
+# src/core/inspect_cache.py
+
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, NamedTuple, Optional, Set, Tuple
+
+DEFAULT_MAX_ENTRIES = 1024
+DEFAULT_TTL = 10.0
+
+# What a full or shortened object ID looks like, as opposed to a name
+_OBJECT_ID = re.compile(r"[0-9a-f]{1,64}")
+
+# Kinds for payloads taken from a listing, whose shape differs from the inspect payload
+IMAGE_SUMMARY = "image-summary"
+NETWORK_SUMMARY = "network-summary"
+
+
+class CacheStats(NamedTuple):
+    """
+    Counters for tuning an InspectCache.
+    """
+    hits: int
+    misses: int
+    coalesced: int
+    evictions: int
+    expirations: int
+    invalidations: int
+    size: int
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses + self.coalesced
+        return (self.hits + self.coalesced) / lookups if lookups else 0.0
+
+
+class _Entry(NamedTuple):
+    expires_at: float
+    value: Any
+    aliases: Set[str]
+    object_id: str  # The payload's full ID, if it has one
+
+
+class _Pending:
+    """
+    A fetch in flight; callers asking for the same key wait for it instead of fetching again.
+    """
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: Optional[BaseException] = None
+        self.invalidated = False
+
+
+def _object_id(value: Any) -> str:
+    object_id = value.get('Id') if isinstance(value, dict) else None
+    return object_id.split(':', 1)[-1] if isinstance(object_id, str) else ""
+
+
+def _aliases(key: str, value: Any) -> Set[str]:
+    # Every name an Engine API payload can be looked up or invalidated by
+    aliases = {key}
+    if isinstance(value, dict):
+        for field in ('Id', 'Name'):
+            if isinstance(value.get(field), str):
+                aliases.add(value[field].split(':', 1)[-1] if field == 'Id' else value[field].lstrip('/'))
+        aliases.update(name.lstrip('/') for name in value.get('Names') or [])
+        aliases.update(value.get('RepoTags') or [])
+    aliases.discard("")
+    return aliases
+
+
+class InspectCache:
+    """
+    A size-bounded LRU cache of inspect payloads keyed by resource kind and ID.
+
+    Entries expire after a per-entry TTL and are dropped early by invalidate() whenever the
+    service layer changes the object or a daemon event names it. Concurrent lookups of the
+    same key while it is being fetched share that single fetch. Lookups that find nothing
+    (a None result) are not cached.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, ttl: float = DEFAULT_TTL,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            max_entries (int): The maximum number of cached payloads; the least recently used are evicted first.
+            ttl (float): The default lifetime of an entry in seconds.
+            clock (Callable[[], float]): The monotonic time source.
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.clock = clock
+        self._entries: "OrderedDict[Tuple[str, str], _Entry]" = OrderedDict()
+        self._pending: Dict[Tuple[str, str], _Pending] = {}
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0, "coalesced": 0, "evictions": 0,
+                          "expirations": 0, "invalidations": 0}
+
+    def get_or_fetch(self, kind: str, key: str, fetch: Callable[[], Any], ttl: Optional[float] = None) -> Any:
+        """
+        Get a cached payload, or fetch and cache it.
+
+        Args:
+            kind (str): The resource kind, e.g. "container".
+            key (str): The ID or name the caller looks the object up by.
+            fetch (Callable[[], Any]): Loads the payload; returns None if the object does not exist.
+            ttl (Optional[float]): The lifetime of a newly cached entry, defaults to the cache TTL.
+
+        Returns:
+            Any: The payload, or None if the object does not exist.
+        """
+        cache_key = (kind, key)
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            if entry is not None:
+                if entry.expires_at > self.clock():
+                    self._entries.move_to_end(cache_key)
+                    self._counters["hits"] += 1
+                    return entry.value
+                del self._entries[cache_key]
+                self._counters["expirations"] += 1
+
+            pending = self._pending.get(cache_key)
+            if pending is not None:
+                self._counters["coalesced"] += 1
+                owner = False
+            else:
+                pending = self._pending[cache_key] = _Pending()
+                self._counters["misses"] += 1
+                owner = True
+
+        if not owner:
+            pending.done.wait()
+            if pending.error is not None:
+                raise pending.error
+            return pending.value
+
+        try:
+            pending.value = fetch()
+        except BaseException as e:
+            pending.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._pending[cache_key]
+                # Do not keep a payload that was invalidated while it was being fetched
+                if pending.error is None and pending.value is not None and not pending.invalidated:
+                    self._store(cache_key, pending.value, ttl)
+            pending.done.set()
+        return pending.value
+
+    def get(self, kind: str, key: str) -> Any:
+        """
+        Get a cached payload without fetching it.
+
+        Args:
+            kind (str): The resource kind.
+            key (str): The ID or name the object was looked up by.
+
+        Returns:
+            Any: The payload, or None if it is not cached or has expired.
+        """
+        cache_key = (kind, key)
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            if entry is None:
+                return None
+            if entry.expires_at <= self.clock():
+                del self._entries[cache_key]
+                self._counters["expirations"] += 1
+                return None
+            self._entries.move_to_end(cache_key)
+            self._counters["hits"] += 1
+            return entry.value
+
+    def put(self, kind: str, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """
+        Cache a payload fetched elsewhere, e.g. by a batched lookup.
+
+        Args:
+            kind (str): The resource kind.
+            key (str): The ID or name the object was looked up by.
+            value (Any): The payload.
+            ttl (Optional[float]): The lifetime of the entry, defaults to the cache TTL.
+        """
+        with self._lock:
+            self._store((kind, key), value, ttl)
+
+    def _store(self, cache_key: Tuple[str, str], value: Any, ttl: Optional[float]) -> None:
+        expires_at = self.clock() + (self.ttl if ttl is None else ttl)
+        self._entries[cache_key] = _Entry(expires_at, value, _aliases(cache_key[1], value), _object_id(value))
+        self._entries.move_to_end(cache_key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._counters["evictions"] += 1
+
+    def invalidate(self, kind: str, key: Optional[str] = None) -> None:
+        """
+        Drop the cached payloads of an object, or of a whole kind.
+
+        An entry matches if it was looked up by, or its payload carries, the given name or ID
+        exactly, or if the given ID is a prefix of its ID. Names never match by prefix, so
+        invalidating "web" keeps "web-2". Invalidating a kind also drops its summaries, e.g. "image-summary" for "image".
+
+        Args:
+            kind (str): The resource kind.
+            key (Optional[str]): The ID or name of the object, None to drop every entry of the kind.
+        """
+        if key is not None:
+            key = key.split(':', 1)[-1] if key.startswith("sha256:") else key
+        with self._lock:
+            for cache_key, entry in list(self._entries.items()):
+                if self._same_kind(cache_key[0], kind) and (key is None or self._matches(entry.aliases, entry.object_id, key)):
+                    del self._entries[cache_key]
+                    self._counters["invalidations"] += 1
+            for (pending_kind, pending_key), pending in self._pending.items():
+                if self._same_kind(pending_kind, kind) and (key is None or self._matches_lookup(pending_key, key)):
+                    pending.invalidated = True
+
+    @staticmethod
+    def _same_kind(cached_kind: str, kind: str) -> bool:
+        return cached_kind == kind or cached_kind == f"{kind}-summary"
+
+    @staticmethod
+    def _matches(aliases: Set[str], object_id: str, key: str) -> bool:
+        return key in aliases or (bool(object_id) and _OBJECT_ID.fullmatch(key) is not None
+                                  and object_id.startswith(key))
+
+    @staticmethod
+    def _matches_lookup(lookup_key: str, key: str) -> bool:
+        # A fetch in flight has no payload yet, so a short ID it was looked up by must cover a full one
+        if lookup_key == key:
+            return True
+        return (_OBJECT_ID.fullmatch(lookup_key) is not None and _OBJECT_ID.fullmatch(key) is not None
+                and (key.startswith(lookup_key) or lookup_key.startswith(key)))
+
+    def clear(self) -> None:
+        """
+        Drop every cached payload.
+        """
+        with self._lock:
+            self._entries.clear()
+            for pending in self._pending.values():
+                pending.invalidated = True
+
+    def stats(self) -> CacheStats:
+        """
+        Get the cache counters.
+
+        Returns:
+            CacheStats: Hits, misses, coalesced lookups, evictions, expirations, invalidations and the current size.
+        """
+        with self._lock:
+            return CacheStats(size=len(self._entries), **self._counters)
+
+
+# The cache shared by the service layer
+inspect_cache = InspectCache()
@@ -0,0 +1,241 @@
+# src/core/label_index.py
+
+import logging
+import re
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Mapping, NamedTuple, Optional, Set, Tuple
+
+from .state_store import REMOVE, RESET, StateStore, StoreChange
+
+# Set up logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+COMPOSE_PROJECT = "com.docker.compose.project"
+
+EQUALS = "="
+NOT_EQUALS = "!="
+IN = "in"
+NOT_IN = "notin"
+EXISTS = "exists"
+NOT_EXISTS = "!exists"
+
+# One requirement of a selector, as in Kubernetes: "key=value", "key==value", "key!=value",
+# "key in (a,b)", "key notin (a,b)", "key" or "!key"
+_REQUIREMENT = re.compile(r"""
+    \s*(?:
+        (?P<absent>!)\s*(?P<absent_key>[^\s,=!()]+)
+      | (?P<key>[^\s,=!()]+)\s*(?:
+            (?P<operator>==|=|!=)\s*(?P<value>[^\s,=!()]*)
+          | \s(?P<set_operator>in|notin)\s*\((?P<values>[^()]*)\)
+        )?
+    )\s*(?:,|$)
+""", re.VERBOSE)
+
+
+class Requirement(NamedTuple):
+    key: str
+    operator: str
+    values: Tuple[str, ...] = ()
+
+
+def parse_selector(selector: str) -> List[Requirement]:
+    """
+    Parse a Kubernetes-style label selector, e.g. "com.docker.compose.project=shop,tier in (web,api),!canary".
+
+    Args:
+        selector (str): The comma-separated requirements; an empty selector matches everything.
+
+    Returns:
+        List[Requirement]: The requirements, all of which must hold.
+
+    Raises:
+        ValueError: If the selector is malformed.
+    """
+    requirements = []
+    position = 0
+    selector = selector.strip()
+    while position < len(selector):
+        match = _REQUIREMENT.match(selector, position)
+        if match is None or match.end() == position:
+            raise ValueError(f"Invalid label selector at position {position}: {selector[position:]!r}")
+        position = match.end()
+        if match.group('absent'):
+            requirements.append(Requirement(match.group('absent_key'), NOT_EXISTS))
+        elif match.group('operator'):
+            operator = NOT_EQUALS if match.group('operator') == "!=" else EQUALS
+            requirements.append(Requirement(match.group('key'), operator, (match.group('value'),)))
+        elif match.group('set_operator'):
+            values = tuple(value.strip() for value in match.group('values').split(",") if value.strip())
+            requirements.append(Requirement(match.group('key'), match.group('set_operator'), values))
+        else:
+            requirements.append(Requirement(match.group('key'), EXISTS))
+    return requirements
+
+
+class LabelIndex:
+    """
+    A reverse index from label keys and (key, value) pairs to the resources carrying them.
+
+    Selecting resources by label, or grouping them by the value of one label (say, the
+    compose project), is a few set operations over the resources that match, instead of a
+    pass over every resource's labels.
+    """
+
+    def __init__(self, labels_of: Callable[[Any], Mapping[str, str]] = lambda resource: resource.label_map):
+        """
+        Args:
+            labels_of (Callable[[Any], Mapping[str, str]]): Gets the labels of a resource.
+        """
+        self.labels_of = labels_of
+        self._labels: Dict[str, Mapping[str, str]] = {}  # key -> labels
+        self._values: Dict[str, Dict[str, Set[str]]] = {}  # label -> value -> keys
+        self._members: Dict[str, Set[str]] = {}  # label -> keys
+        self._store: Optional[StateStore] = None
+        self._kind: Optional[str] = None
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._labels)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._labels
+
+    def add(self, key: str, labels: Mapping[str, str]) -> None:
+        """
+        Index a resource, or replace its labels.
+        """
+        with self._lock:
+            if self._labels.get(key) == labels:
+                return
+            self.remove(key)
+            self._labels[key] = labels
+            for label, value in labels.items():
+                self._values.setdefault(label, {}).setdefault(value, set()).add(key)
+                self._members.setdefault(label, set()).add(key)
+
+    def add_resource(self, key: str, resource: Any) -> None:
+        self.add(key, self.labels_of(resource))
+
+    def remove(self, key: str) -> None:
+        with self._lock:
+            labels = self._labels.pop(key, None)
+            if labels is None:
+                return
+            for label, value in labels.items():
+                values = self._values[label]
+                values[value].discard(key)
+                if not values[value]:
+                    del values[value]
+                self._members[label].discard(key)
+                if not self._members[label]:
+                    del self._members[label]
+                    del self._values[label]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._labels.clear()
+            self._values.clear()
+            self._members.clear()
+
+    def reset(self, resources: Dict[str, Any]) -> None:
+        """
+        Replace every resource, e.g. from a StateStore snapshot.
+        """
+        with self._lock:
+            for stale in [key for key in self._labels if key not in resources]:
+                self.remove(stale)
+            for key, resource in resources.items():
+                self.add_resource(key, resource)
+
+    def attach(self, store: StateStore, kind: str) -> Callable[[], None]:
+        """
+        Index every resource of one kind the store knows and follow its changes.
+
+        Returns:
+            Callable[[], None]: A function that stops following the store.
+        """
+        self._store, self._kind = store, kind
+        unsubscribe = store.subscribe(self.apply)
+        self.reset(store.snapshot(kind))
+        return unsubscribe
+
+    def apply(self, change: StoreChange) -> None:
+        """
+        Apply a StateStore change notification for the attached kind.
+        """
+        if change.kind != self._kind:
+            return
+        if change.action == RESET:
+            self.reset(self._store.snapshot(change.kind))
+        elif change.action == REMOVE:
+            self.remove(change.key)
+        else:
+            self.add_resource(change.key, change.resource)
+
+    def labels(self, key: str) -> Optional[Mapping[str, str]]:
+        return self._labels.get(key)
+
+    def keys(self) -> List[str]:
+        """
+        Get the label keys in use, sorted.
+        """
+        with self._lock:
+            return sorted(self._members)
+
+    def _matching(self, requirement: Requirement) -> Set[str]:
+        values = self._values.get(requirement.key, {})
+        if requirement.operator in (EQUALS, NOT_EQUALS, IN, NOT_IN):
+            return set().union(*(values.get(value, ()) for value in requirement.values))
+        return set(self._members.get(requirement.key, ()))
+
+    def select(self, selector: Iterable[Requirement]) -> Set[str]:
+        """
+        Find the resources matching every requirement of a selector.
+
+        As in Kubernetes, "!=" and "notin" also match resources without the label.
+
+        Args:
+            selector (Iterable[Requirement]): The requirements, e.g. from parse_selector().
+
+        Returns:
+            Set[str]: The keys of the matching resources.
+        """
+        with self._lock:
+            included: List[Set[str]] = []
+            excluded: List[Set[str]] = []
+            for requirement in selector:
+                matching = self._matching(requirement)
+                if requirement.operator in (NOT_EQUALS, NOT_IN, NOT_EXISTS):
+                    excluded.append(matching)
+                else:
+                    included.append(matching)
+            if included:
+                included.sort(key=len)
+                result = included[0].intersection(*included[1:])
+            else:
+                result = set(self._labels)
+            return result.difference(*excluded)
+
+    def group_by(self, label: str) -> Dict[Optional[str], Set[str]]:
+        """
+        Group the resources by the value of one label.
+
+        Returns:
+            Dict[Optional[str], Set[str]]: The keys of the resources per label value, and under None
+            those without the label (if any).
+        """
+        with self._lock:
+            groups: Dict[Optional[str], Set[str]] = {value: set(keys)
+                                                     for value, keys in self._values.get(label, {}).items()}
+            unlabelled = set(self._labels).difference(self._members.get(label, ()))
+            if unlabelled:
+                groups[None] = unlabelled
+            return groups
+
+    def counts(self, label: str) -> Dict[str, int]:
+        """
+        Count the resources per value of one label, without copying any group.
+        """
+        with self._lock:
+            return {value: len(keys) for value, keys in self._values.get(label, {}).items()}
@@ -0,0 +1,181 @@
+# src/core/layer_index.py
+
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from .services import image_service
+
+# Set up logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_WORKERS = 8
+
+Layers = List[Tuple[str, int]]
+
+
+class SpaceReport(NamedTuple):
+    """
+    The disk space of a set of images, with every layer counted once.
+
+    `unique_bytes` is held only by images in the set, so it is what removing them would free;
+    `shared_bytes` is also held by images outside the set.
+    """
+    images: int
+    total_bytes: int
+    unique_bytes: int
+    shared_bytes: int
+
+
+class LayerIndex:
+    """
+    Maps every layer digest to its size and to the images that contain it.
+
+    Image layers never change, so refresh() only fetches the layers of images it has not
+    seen yet (in parallel over the pooled client) and forgets images that are gone; keeping
+    the index current costs nothing when the image list has not changed.
+    """
+
+    def __init__(self, fetch_layers: Callable[[str], Optional[Layers]] = image_service.get_image_layers,
+                 max_workers: int = DEFAULT_MAX_WORKERS):
+        """
+        Args:
+            fetch_layers (Callable[[str], Optional[Layers]]): Gets the (digest, size) layers of an image.
+            max_workers (int): The maximum number of images fetched at once.
+        """
+        self.fetch_layers = fetch_layers
+        self.max_workers = max_workers
+        self.layer_sizes: Dict[str, int] = {}
+        self.layer_images: Dict[str, Set[str]] = {}
+        self.image_layers: Dict[str, Tuple[str, ...]] = {}
+        self._lock = threading.Lock()
+
+    def refresh(self, image_ids: Iterable[str]) -> int:
+        """
+        Bring the index in line with the current set of images.
+
+        Args:
+            image_ids (Iterable[str]): The IDs of every image.
+
+        Returns:
+            int: The number of images whose layers were fetched.
+        """
+        image_ids = set(image_ids)
+        with self._lock:
+            for image_id in [image_id for image_id in self.image_layers if image_id not in image_ids]:
+                self._remove(image_id)
+            missing = [image_id for image_id in image_ids if image_id not in self.image_layers]
+        if not missing:
+            return 0
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(missing))) as executor:
+            fetched = list(executor.map(self.fetch_layers, missing))
+        with self._lock:
+            for image_id, layers in zip(missing, fetched):
+                if layers is not None:
+                    self._add(image_id, layers)
+        return len(missing)
+
+    def add_image(self, image_id: str, layers: Layers) -> None:
+        with self._lock:
+            self._remove(image_id)
+            self._add(image_id, layers)
+
+    def remove_image(self, image_id: str) -> None:
+        with self._lock:
+            self._remove(image_id)
+
+    def _add(self, image_id: str, layers: Layers) -> None:
+        digests = []
+        for digest, size in layers:
+            self.layer_sizes[digest] = size
+            self.layer_images.setdefault(digest, set()).add(image_id)
+            digests.append(digest)
+        # A layer can appear twice in one image (e.g. the empty layer); count it once
+        self.image_layers[image_id] = tuple(dict.fromkeys(digests))
+
+    def _remove(self, image_id: str) -> None:
+        for digest in self.image_layers.pop(image_id, ()):
+            images = self.layer_images[digest]
+            images.discard(image_id)
+            if not images:
+                del self.layer_images[digest]
+                del self.layer_sizes[digest]
+
+    def image_size(self, image_id: str) -> int:
+        return sum(self.layer_sizes[digest] for digest in self.image_layers.get(image_id, ()))
+
+    def total_size(self) -> int:
+        """
+        Get the disk space of all images, with shared layers counted once.
+        """
+        return sum(self.layer_sizes.values())
+
+    def report(self, image_ids: Iterable[str]) -> SpaceReport:
+        """
+        Compute the space held by a set of images and how much of it removing them would free.
+        """
+        selection = LayerSelection(self)
+        for image_id in image_ids:
+            selection.add(image_id)
+        return selection.report()
+
+
+class LayerSelection:
+    """
+    A set of images whose SpaceReport is kept up to date as images are added and removed.
+
+    Each change only touches the layers of the image concerned, so a view can update the
+    reclaimable space of a selection on every click however many images exist. The index
+    must not change while the selection is in use; start a new selection after a refresh.
+    """
+
+    def __init__(self, index: LayerIndex):
+        self.index = index
+        self.image_ids: Set[str] = set()
+        self._selected: Dict[str, int] = {}  # digest -> selected images containing it
+        self.total_bytes = 0
+        self.unique_bytes = 0
+
+    def add(self, image_id: str) -> None:
+        if image_id in self.image_ids or image_id not in self.index.image_layers:
+            return
+        self.image_ids.add(image_id)
+        for digest in self.index.image_layers[image_id]:
+            count = self._selected.get(digest, 0) + 1
+            self._selected[digest] = count
+            size = self.index.layer_sizes[digest]
+            if count == 1:
+                self.total_bytes += size
+            if count == len(self.index.layer_images[digest]):
+                self.unique_bytes += size
+
+    def discard(self, image_id: str) -> None:
+        if image_id not in self.image_ids:
+            return
+        self.image_ids.discard(image_id)
+        for digest in self.index.image_layers[image_id]:
+            count = self._selected[digest]
+            size = self.index.layer_sizes[digest]
+            if count == len(self.index.layer_images[digest]):
+                self.unique_bytes -= size
+            if count == 1:
+                self.total_bytes -= size
+                del self._selected[digest]
+            else:
+                self._selected[digest] = count - 1
+
+    def update(self, image_ids: Iterable[str]) -> None:
+        """
+        Change the selection to exactly `image_ids`, touching only the images that changed.
+        """
+        image_ids = set(image_ids)
+        for image_id in self.image_ids - image_ids:
+            self.discard(image_id)
+        for image_id in image_ids - self.image_ids:
+            self.add(image_id)
+
+    def report(self) -> SpaceReport:
+        return SpaceReport(len(self.image_ids), self.total_bytes, self.unique_bytes,
+                           self.total_bytes - self.unique_bytes)
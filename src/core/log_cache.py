@@ -0,0 +1,493 @@
+# src/core/log_cache.py
+
+import bisect
+import json
+import logging
+import os
+import shutil
+import struct
+import threading
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from .docker_client import DockerClientError
+from .services.container_service import STDERR, STDOUT, LogLine, stream_container_logs
+
+# Set up logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+DEFAULT_SEGMENT_BYTES = 8 * 1024 * 1024
+DEFAULT_MAX_BYTES = 128 * 1024 * 1024
+BLOCK_LINES = 64
+DEFAULT_LIMIT = 1000
+
+# One sparse index entry per block: the block's first timestamp (ns) and its byte offset
+_INDEX_ENTRY = struct.Struct("<qQ")
+_STREAM_CODES = {STDOUT: b"o", STDERR: b"e"}
+_STREAMS = {b"o": STDOUT, b"e": STDERR}
+
+
+def default_cache_root() -> str:
+    """
+    Get the directory the log caches live in, following the XDG base directory spec.
+
+    Returns:
+        str: The path of the cache root.
+    """
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "docky", "logs")
+
+
+def to_ns(timestamp: datetime) -> int:
+    return int(timestamp.timestamp()) * 1_000_000_000 + timestamp.microsecond * 1000
+
+
+def from_ns(ns: int) -> datetime:
+    seconds, rest = divmod(ns, 1_000_000_000)
+    return datetime.fromtimestamp(seconds, timezone.utc).replace(microsecond=rest // 1000).astimezone()
+
+
+def trigrams(text: str) -> Set[str]:
+    """
+    Get the case-folded trigrams of a text.
+
+    Args:
+        text (str): The text.
+
+    Returns:
+        Set[str]: Every run of three characters, lowercased.
+    """
+    text = text.lower()
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def _decode_line(raw: bytes) -> Tuple[int, bytes, str]:
+    stamp, stream, text = raw.rstrip(b"\n").split(b" ", 2)
+    return int(stamp), stream, text.decode("utf-8", errors="replace")
+
+
+def _log_line(ns: int, stream: bytes, text: str) -> LogLine:
+    return LogLine(_STREAMS.get(stream, STDOUT), text, from_ns(ns))
+
+
+class _Segment:
+    """
+    One append-only log file with its sparse timestamp index and trigram index.
+
+    Files: NNNNNNNN.log holds one "<ns> <o|e> <text>" line per log line; NNNNNNNN.idx holds a
+    packed (first ns, offset) entry per block of BLOCK_LINES lines; NNNNNNNN.tri is written when
+    the segment is sealed and holds a metadata line followed by the trigram -> blocks map.
+    """
+
+    def __init__(self, directory: str, number: int):
+        self.number = number
+        base = os.path.join(directory, f"{number:08d}")
+        self.log_path = base + ".log"
+        self.index_path = base + ".idx"
+        self.trigram_path = base + ".tri"
+        self.block_ns: List[int] = []
+        self.block_offsets: List[int] = []
+        self.lines = 0
+        self.size = 0
+        self.last_ns: Optional[int] = None
+        self._trigrams: Optional[Dict[str, Set[int]]] = None
+        # Texts of the newest block, indexed in one go once the block is full
+        self._block_texts: List[str] = []
+        self._log_file = None
+        self._index_file = None
+
+    @property
+    def first_ns(self) -> Optional[int]:
+        return self.block_ns[0] if self.block_ns else None
+
+    def load_sealed(self) -> None:
+        with open(self.index_path, "rb") as f:
+            data = f.read()
+        for ns, offset in _INDEX_ENTRY.iter_unpack(data[:len(data) - len(data) % _INDEX_ENTRY.size]):
+            self.block_ns.append(ns)
+            self.block_offsets.append(offset)
+        with open(self.trigram_path, "r", encoding="utf-8") as f:
+            meta = json.loads(f.readline())
+        self.lines, self.last_ns = meta["lines"], meta["last"]
+        self.size = os.path.getsize(self.log_path)
+
+    def open_active(self) -> None:
+        """
+        Open the segment for appending, rebuilding its indexes from the log file.
+
+        A partial line left by an interrupted write is truncated away.
+        """
+        self._trigrams = {}
+        valid = 0
+        if os.path.exists(self.log_path):
+            with open(self.log_path, "rb") as f:
+                for raw in f:
+                    if not raw.endswith(b"\n"):
+                        break
+                    try:
+                        ns, _, text = _decode_line(raw)
+                    except ValueError:
+                        break
+                    self._index_line(ns, text, valid)
+                    valid += len(raw)
+            with open(self.log_path, "r+b") as f:
+                f.truncate(valid)
+        self.size = valid
+        self._log_file = open(self.log_path, "ab")
+        self._index_file = open(self.index_path, "wb")
+        self._index_file.write(b"".join(_INDEX_ENTRY.pack(ns, offset)
+                                        for ns, offset in zip(self.block_ns, self.block_offsets)))
+        self._index_file.flush()
+
+    def _index_line(self, ns: int, text: str, offset: int) -> bool:
+        new_block = self.lines % BLOCK_LINES == 0
+        if new_block:
+            self._index_block()
+            self.block_ns.append(ns)
+            self.block_offsets.append(offset)
+        self._block_texts.append(text)
+        self.lines += 1
+        self.last_ns = ns
+        return new_block
+
+    def _index_block(self) -> None:
+        if not self._block_texts:
+            return
+        block = len(self.block_ns) - 1
+        # Trigrams spanning two lines only add false candidates, which the scan filters out
+        for trigram in trigrams("\n".join(self._block_texts)):
+            blocks = self._trigrams.get(trigram)
+            if blocks is None:
+                self._trigrams[trigram] = {block}
+            else:
+                blocks.add(block)
+        self._block_texts = []
+
+    def unindexed_block(self) -> Optional[int]:
+        """
+        Get the newest block if its trigrams are not indexed yet, since it is still filling up.
+        """
+        return len(self.block_ns) - 1 if self._block_texts else None
+
+    def append(self, entries: List[Tuple[int, LogLine]]) -> None:
+        chunks = []
+        for ns, line in entries:
+            # Index what is written, so a search finds the line as it is read back
+            text = line.text.replace("\n", " ")
+            raw = b"%d %s %s\n" % (ns, _STREAM_CODES.get(line.stream, b"o"),
+                                   text.encode("utf-8", errors="replace"))
+            if self._index_line(ns, text, self.size):
+                self._index_file.write(_INDEX_ENTRY.pack(ns, self.size))
+            chunks.append(raw)
+            self.size += len(raw)
+        self._log_file.write(b"".join(chunks))
+        self._log_file.flush()
+        self._index_file.flush()
+
+    def seal(self) -> None:
+        """
+        Close the segment for writing and persist its trigram index.
+        """
+        self._index_block()
+        with open(self.trigram_path, "w", encoding="utf-8") as f:
+            f.write(json.dumps({"lines": self.lines, "last": self.last_ns}) + "\n")
+            json.dump({trigram: sorted(blocks) for trigram, blocks in self._trigrams.items()}, f)
+        self.close()
+
+    def close(self) -> None:
+        for handle in (self._log_file, self._index_file):
+            if handle is not None:
+                handle.close()
+        self._log_file = self._index_file = None
+
+    def trigram_index(self) -> Dict[str, Set[int]]:
+        if self._trigrams is None:
+            with open(self.trigram_path, "r", encoding="utf-8") as f:
+                f.readline()
+                self._trigrams = {trigram: set(blocks) for trigram, blocks in json.load(f).items()}
+        return self._trigrams
+
+    def read_blocks(self, blocks: Iterable[int], size: int) -> Iterable[Tuple[int, bytes, str]]:
+        """
+        Read the lines of the given blocks, up to `size` bytes into the file.
+        """
+        with open(self.log_path, "rb") as f:
+            for block in blocks:
+                start = self.block_offsets[block]
+                end = self.block_offsets[block + 1] if block + 1 < len(self.block_offsets) else size
+                # Stop at what had been written when the read started
+                end = min(end, size)
+                if start >= end:
+                    continue
+                f.seek(start)
+                for raw in f.read(end - start).split(b"\n")[:-1]:
+                    yield _decode_line(raw)
+
+    def delete(self) -> None:
+        self.close()
+        for path in (self.log_path, self.index_path, self.trigram_path):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+
+class ContainerLogCache:
+    """
+    An opt-in on-disk cache of one container's logs, indexed for time-range reads and search.
+
+    Lines are appended to size-capped segment files. Every BLOCK_LINES lines a (timestamp,
+    offset) entry goes into a sparse index, so a time range is found by bisecting it and
+    seeking, and each block's trigrams go into an inverted index, so a search only scans the
+    blocks that contain every trigram of the term. Lines are expected in time order, as the
+    daemon sends them. Once the cache outgrows `max_bytes` the oldest segments are deleted.
+    """
+
+    def __init__(self, container_id: str, root: Optional[str] = None,
+                 segment_bytes: int = DEFAULT_SEGMENT_BYTES, max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Args:
+            container_id (str): The ID of the container.
+            root (Optional[str]): The cache root, defaults to default_cache_root().
+            segment_bytes (int): The size at which a segment is sealed and a new one started.
+            max_bytes (int): The size above which the oldest segments are evicted.
+        """
+        self.container_id = container_id
+        self.directory = os.path.join(root or default_cache_root(), container_id)
+        self.segment_bytes = segment_bytes
+        self.max_bytes = max_bytes
+        self._lock = threading.RLock()
+        os.makedirs(self.directory, exist_ok=True)
+
+        numbers = sorted(int(name[:-4]) for name in os.listdir(self.directory)
+                         if name.endswith(".log") and name[:-4].isdigit())
+        self._segments = [_Segment(self.directory, number) for number in numbers]
+        for segment in self._segments:
+            if os.path.exists(segment.trigram_path):
+                segment.load_sealed()
+            elif segment is not self._segments[-1]:
+                # Only a crash leaves an unsealed segment behind a newer one; seal it now
+                segment.open_active()
+                segment.seal()
+        if not self._segments or os.path.exists(self._segments[-1].trigram_path):
+            self._segments.append(_Segment(self.directory, numbers[-1] + 1 if numbers else 0))
+        self._segments[-1].open_active()
+
+    def append(self, lines: Iterable[LogLine]) -> int:
+        """
+        Append log lines to the cache.
+
+        Args:
+            lines (Iterable[LogLine]): Lines with timestamps; lines without one are skipped.
+
+        Returns:
+            int: The number of lines appended.
+        """
+        entries = [(to_ns(line.timestamp), line) for line in lines if line.timestamp is not None]
+        if not entries:
+            return 0
+        with self._lock:
+            start = 0
+            while start < len(entries):
+                active = self._segments[-1]
+                # Roughly fill the active segment, then roll over to a new one
+                end = start
+                room = self.segment_bytes - active.size
+                while end < len(entries) and (room > 0 or end == start):
+                    room -= len(entries[end][1].text) + 24
+                    end += 1
+                active.append(entries[start:end])
+                start = end
+                if active.size >= self.segment_bytes:
+                    self._roll()
+            self._enforce_retention()
+        os.utime(self.directory)
+        return len(entries)
+
+    def _roll(self) -> None:
+        active = self._segments[-1]
+        active.seal()
+        segment = _Segment(self.directory, active.number + 1)
+        segment.open_active()
+        self._segments.append(segment)
+
+    def _enforce_retention(self) -> None:
+        while len(self._segments) > 1 and self.size() > self.max_bytes:
+            segment = self._segments.pop(0)
+            segment.delete()
+            logger.info(f"Evicted log segment {segment.number} of container {self.container_id}")
+
+    def size(self) -> int:
+        """
+        Get the size of the cached log data in bytes.
+        """
+        with self._lock:
+            return sum(segment.size for segment in self._segments)
+
+    def last_timestamp(self) -> Optional[datetime]:
+        """
+        Get the timestamp of the newest cached line, to resume filling from.
+        """
+        with self._lock:
+            for segment in reversed(self._segments):
+                if segment.last_ns is not None:
+                    return from_ns(segment.last_ns)
+        return None
+
+    def sync(self, batch_size: int = 1000) -> int:
+        """
+        Fetch the lines logged since the newest cached line and append them.
+
+        Returns:
+            int: The number of lines appended, or 0 if the logs could not be read.
+        """
+        last = self.last_timestamp()
+        last_ns = to_ns(last) if last is not None else None
+        appended = 0
+        batch = []
+        try:
+            for line in stream_container_logs(self.container_id, timestamps=True, since=last):
+                # `since` has second precision; drop what the cache already has
+                if line.timestamp is None or (last_ns is not None and to_ns(line.timestamp) <= last_ns):
+                    continue
+                batch.append(line)
+                if len(batch) >= batch_size:
+                    appended += self.append(batch)
+                    batch = []
+        except DockerClientError as e:
+            logger.error(f"Failed to sync log cache of container {self.container_id}: {e}")
+        appended += self.append(batch)
+        return appended
+
+    def _snapshot(self) -> List[Tuple[_Segment, int]]:
+        with self._lock:
+            return [(segment, segment.size) for segment in self._segments if segment.block_ns]
+
+    def read_range(self, start: Optional[datetime] = None, end: Optional[datetime] = None,
+                   limit: int = DEFAULT_LIMIT) -> List[LogLine]:
+        """
+        Read the cached lines logged in a time range.
+
+        Args:
+            start (Optional[datetime]): The earliest timestamp, inclusive; None for the oldest line.
+            end (Optional[datetime]): The latest timestamp, inclusive; None for the newest line.
+            limit (int): The maximum number of lines returned.
+
+        Returns:
+            List[LogLine]: The lines in time order.
+        """
+        start_ns = to_ns(start) if start is not None else None
+        end_ns = to_ns(end) if end is not None else None
+        found = []
+        for segment, size in self._snapshot():
+            if (start_ns is not None and segment.last_ns < start_ns) or \
+                    (end_ns is not None and segment.first_ns > end_ns):
+                continue
+            first = 0 if start_ns is None else max(bisect.bisect_left(segment.block_ns, start_ns) - 1, 0)
+            last = len(segment.block_ns) if end_ns is None else bisect.bisect_right(segment.block_ns, end_ns)
+            for ns, stream, text in segment.read_blocks(range(first, last), size):
+                if start_ns is not None and ns < start_ns:
+                    continue
+                if end_ns is not None and ns > end_ns:
+                    return found
+                found.append(_log_line(ns, stream, text))
+                if len(found) >= limit:
+                    return found
+        return found
+
+    def search(self, term: str, start: Optional[datetime] = None, end: Optional[datetime] = None,
+               limit: int = DEFAULT_LIMIT) -> List[LogLine]:
+        """
+        Find the cached lines containing a term, ignoring case.
+
+        Args:
+            term (str): The text to look for.
+            start (Optional[datetime]): The earliest timestamp, inclusive.
+            end (Optional[datetime]): The latest timestamp, inclusive.
+            limit (int): The maximum number of lines returned.
+
+        Returns:
+            List[LogLine]: The matching lines in time order.
+        """
+        needle = term.lower()
+        needle_trigrams = trigrams(needle)
+        start_ns = to_ns(start) if start is not None else None
+        end_ns = to_ns(end) if end is not None else None
+        found = []
+        for segment, size in self._snapshot():
+            if (start_ns is not None and segment.last_ns < start_ns) or \
+                    (end_ns is not None and segment.first_ns > end_ns):
+                continue
+            with self._lock:
+                index = segment.trigram_index()
+                if needle_trigrams:
+                    blocks = set.intersection(*(index.get(trigram, set()) for trigram in needle_trigrams))
+                    unindexed = segment.unindexed_block()
+                    if unindexed is not None:
+                        blocks.add(unindexed)
+                else:
+                    # Terms shorter than a trigram can not use the index
+                    blocks = set(range(len(segment.block_ns)))
+            if start_ns is not None:
+                blocks = {block for block in blocks if block + 1 >= len(segment.block_ns)
+                          or segment.block_ns[block + 1] >= start_ns}
+            if end_ns is not None:
+                blocks = {block for block in blocks if segment.block_ns[block] <= end_ns}
+            for ns, stream, text in segment.read_blocks(sorted(blocks), size):
+                if (start_ns is not None and ns < start_ns) or (end_ns is not None and ns > end_ns):
+                    continue
+                if needle in text.lower():
+                    found.append(_log_line(ns, stream, text))
+                    if len(found) >= limit:
+                        return found
+        return found
+
+    def clear(self) -> None:
+        """
+        Delete every cached line of the container.
+        """
+        with self._lock:
+            for segment in self._segments:
+                segment.delete()
+            self._segments = [_Segment(self.directory, 0)]
+            self._segments[0].open_active()
+
+    def close(self) -> None:
+        with self._lock:
+            for segment in self._segments:
+                segment.close()
+
+
+def prune_log_caches(max_total_bytes: int, root: Optional[str] = None) -> List[str]:
+    """
+    Delete whole container log caches, least recently written first, until the root fits a size budget.
+
+    Caches in use should be closed first.
+
+    Args:
+        max_total_bytes (int): The total size the caches may take up.
+        root (Optional[str]): The cache root, defaults to default_cache_root().
+
+    Returns:
+        List[str]: The IDs of the containers whose caches were deleted.
+    """
+    root = root or default_cache_root()
+    if not os.path.isdir(root):
+        return []
+    caches = []
+    for name in os.listdir(root):
+        path = os.path.join(root, name)
+        if os.path.isdir(path):
+            size = sum(entry.stat().st_size for entry in os.scandir(path) if entry.is_file())
+            caches.append((os.path.getmtime(path), size, name, path))
+    total = sum(size for _, size, _, _ in caches)
+    removed = []
+    for _, size, name, path in sorted(caches):
+        if total <= max_total_bytes:
+            break
+        shutil.rmtree(path, ignore_errors=True)
+        total -= size
+        removed.append(name)
+        logger.info(f"Evicted log cache of container {name}")
+    return removed
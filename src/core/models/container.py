@@ -1,13 +1,22 @@
 # src/models/container.py
 
 from dataclasses import dataclass
-from typing import List, Optional
+from sys import intern
+from typing import List, Optional, Tuple
 from datetime import datetime
+from src.utils.docker_utils import (LabelMap, PortMapping, format_ports, format_since, format_size,
+                                    format_timestamp, lazy_timestamps, parse_ports, parse_size,
+                                    port_mappings_from_api)
 
-@dataclass
+@lazy_timestamps("created")
+@dataclass(frozen=True, slots=True)
 class Container:
     """
     Represents a Docker container.
+
+    Instances are immutable and slotted, and the strings that repeat across a listing
+    (image, state, status, ...) are interned, so large inventories stay compact. Sizes,
+    ports and the creation time are kept typed; the display strings are derived from them.
     """
     id: str
     name: str
@@ -15,14 +24,12 @@ class Container:
     status: str
     state: str
     created: datetime
-    ports: str
+    port_mappings: Tuple[PortMapping, ...]
     command: str
-    labels: str
+    label_map: LabelMap
     networks: str
     mounts: str
-    size: str
-    created_at: str
-    running_for: str
+    size_bytes: int  # -1 if unknown
 
     @classmethod
     def from_dict(cls, data: dict) -> 'Container':
@@ -38,20 +45,72 @@ class Container:
         return cls(
             id=data['ID'],
             name=data['Names'],
-            image=data['Image'],
-            status=data['Status'],
-            state=data['State'],
-            created=datetime.strptime(data['CreatedAt'], "%Y-%m-%d %H:%M:%S %z %Z"),
-            ports=data['Ports'],
-            command=data['Command'],
-            labels=data['Labels'],
-            networks=data['Networks'],
+            image=intern(data['Image']),
+            status=intern(data['Status']),
+            state=intern(data['State']),
+            created=data['CreatedAt'],  # Parsed on first access
+            port_mappings=parse_ports(data['Ports']),
+            command=intern(data['Command']),
+            label_map=LabelMap.parse(data['Labels']),
+            networks=intern(data['Networks']),
             mounts=data['Mounts'],
-            size=data['Size'],
-            created_at=data['CreatedAt'],
-            running_for=data['RunningFor']
+            size_bytes=parse_size(data['Size'])
+        )
+
+    @classmethod
+    def from_api(cls, data: dict) -> 'Container':
+        """
+        Create a Container instance from an Engine API container summary (`GET /containers/json`).
+
+        Args:
+            data (dict): Dictionary containing the container summary.
+
+        Returns:
+            Container: A new Container instance.
+        """
+        # Names of linked containers contain a second slash; `docker ps` hides them
+        names = [name[1:] for name in data.get('Names') or [] if name.count('/') == 1]
+        networks = (data.get('NetworkSettings') or {}).get('Networks') or {}
+        mounts = [mount.get('Name') or mount.get('Source', '') for mount in data.get('Mounts') or []]
+        return cls(
+            id=data['Id'],
+            name=",".join(names),
+            image=intern(data['Image']),
+            status=intern(data['Status']),
+            state=intern(data['State']),
+            created=data['Created'],  # Epoch seconds, converted on first access
+            port_mappings=port_mappings_from_api(data.get('Ports')),
+            command=intern(f'"{data.get("Command", "")}"'),
+            label_map=LabelMap(data.get('Labels')),
+            networks=intern(",".join(networks)),
+            mounts=",".join(mounts),
+            size_bytes=data.get('SizeRw', -1)  # Only listed with size=true
         )
 
+    @property
+    def created_epoch(self) -> float:
+        return Container.created.epoch(self)
+
+    @property
+    def ports(self) -> str:
+        return format_ports(self.port_mappings)
+
+    @property
+    def labels(self) -> str:
+        return str(self.label_map)
+
+    @property
+    def size(self) -> str:
+        return format_size(self.size_bytes)
+
+    @property
+    def created_at(self) -> str:
+        return format_timestamp(self.created)
+
+    @property
+    def running_for(self) -> str:
+        return format_since(self.created)
+
     def __str__(self) -> str:
         """
         Return a string representation of the Container.
@@ -70,3 +129,15 @@ class Container:
         """
         return (self.name, self.image, self.state, self.ports, self.running_for)
 
+    def sort_tuple(self) -> tuple:
+        """
+        Get the typed sort keys of the to_tuple() columns.
+
+        Returns:
+            tuple: The name, image and state, the first host (or container) port and the creation time.
+        """
+        first = self.port_mappings[0] if self.port_mappings else None
+        port = (first.public_port or first.private_port) if first else -1
+        # Newer containers have run for less time
+        return (self.name, self.image, self.state, port, -self.created_epoch)
+
@@ -1,24 +1,28 @@
 # src/models/image.py
 
 from dataclasses import dataclass
+from sys import intern
 from typing import Optional
 from datetime import datetime
+from src.utils.docker_utils import format_since, format_size, lazy_timestamps, parse_size
 
-@dataclass
+@lazy_timestamps("created_at")
+@dataclass(frozen=True, slots=True)
 class Image:
     """
     Represents a Docker image.
+
+    Instances are immutable and slotted, with the repeated strings interned. Sizes and
+    counts are kept as integers (-1 if unknown); the display strings are derived from them.
     """
     id: str
     repository: str
     tag: str
     created_at: datetime
-    created_since: str
-    size: str
-    virtual_size: str
-    shared_size: str
-    unique_size: str
-    containers: str
+    size_bytes: int
+    virtual_size_bytes: int
+    shared_size_bytes: int
+    containers_count: int
     digest: str
 
     @classmethod
@@ -34,18 +38,89 @@ class Image:
         """
         return cls(
             id=data['ID'],
-            repository=data['Repository'],
-            tag=data['Tag'],
-            created_at=datetime.strptime(data['CreatedAt'], "%Y-%m-%d %H:%M:%S %z %Z"),
-            created_since=data['CreatedSince'],
-            size=data['Size'],
-            virtual_size=data['VirtualSize'],
-            shared_size=data['SharedSize'],
-            unique_size=data['UniqueSize'],
-            containers=data['Containers'],
+            repository=intern(data['Repository']),
+            tag=intern(data['Tag']),
+            created_at=data['CreatedAt'],  # Parsed on first access
+            size_bytes=parse_size(data['Size']),
+            virtual_size_bytes=parse_size(data['VirtualSize']),
+            shared_size_bytes=parse_size(data['SharedSize']),
+            containers_count=int(data['Containers']) if data['Containers'].isdigit() else -1,
             digest=data['Digest']
         )
 
+    @classmethod
+    def from_api(cls, data: dict, reference: Optional[str] = None) -> 'Image':
+        """
+        Create an Image instance from an Engine API image summary (`GET /images/json`)
+        or image inspect (`GET /images/{id}/json`) payload.
+
+        Args:
+            data (dict): Dictionary containing the image data.
+            reference (Optional[str]): The "repository:tag" this row stands for, defaults to the first tag.
+
+        Returns:
+            Image: A new Image instance.
+        """
+        if reference is None:
+            reference = next(iter(data.get('RepoTags') or []), "<none>:<none>")
+        repository, _, tag = reference.rpartition(':')
+        if not repository or '/' in tag:
+            repository, tag = reference, "<none>"
+        digest = "<none>"
+        for repo_digest in data.get('RepoDigests') or []:
+            name, _, value = repo_digest.partition('@')
+            if name == repository or repository == "<none>":
+                digest = value
+                break
+
+        size = data.get('Size', -1)
+        return cls(
+            id=data['Id'].split(':', 1)[-1],
+            repository=intern(repository),
+            tag=intern(tag),
+            # Summaries carry an epoch, inspect payloads an RFC 3339 string; both are converted on first access
+            created_at=data['Created'],
+            size_bytes=size,
+            virtual_size_bytes=data.get('VirtualSize', size),
+            shared_size_bytes=data.get('SharedSize', -1),
+            containers_count=data.get('Containers', -1),
+            digest=digest
+        )
+
+    @property
+    def created_epoch(self) -> float:
+        return Image.created_at.epoch(self)
+
+    @property
+    def created_since(self) -> str:
+        return format_since(self.created_at)
+
+    @property
+    def size(self) -> str:
+        return format_size(self.size_bytes)
+
+    @property
+    def virtual_size(self) -> str:
+        return format_size(self.virtual_size_bytes)
+
+    @property
+    def shared_size(self) -> str:
+        return format_size(self.shared_size_bytes)
+
+    @property
+    def unique_size_bytes(self) -> int:
+        if self.size_bytes < 0 or self.shared_size_bytes < 0:
+            return -1
+        return self.size_bytes - self.shared_size_bytes
+
+    @property
+    def unique_size(self) -> str:
+        return format_size(self.unique_size_bytes)
+
+    @property
+    def containers(self) -> str:
+        return str(self.containers_count) if self.containers_count >= 0 else "N/A"
+
     def __str__(self) -> str:
         """
         Return a string representation of the Image.
@@ -53,4 +128,23 @@ class Image:
         Returns:
             str: A string representation of the Image.
         """
-        return f"Image(id={self.id[:12]}, repository={self.repository}, tag={self.tag})"
\ No newline at end of file
+        return f"Image(id={self.id[:12]}, repository={self.repository}, tag={self.tag})"
+
+    def to_tuple(self) -> tuple:
+        """
+        Convert the Image instance to a display row.
+
+        Returns:
+            tuple: A tuple containing the repository, tag, short ID, age and size.
+        """
+        return (self.repository, self.tag, self.id[:12], self.created_since, self.size)
+
+    def sort_tuple(self) -> tuple:
+        """
+        Get the typed sort keys of the to_tuple() columns.
+
+        Returns:
+            tuple: The repository, tag and ID, the creation time and the size in bytes.
+        """
+        # Newer images are younger
+        return (self.repository, self.tag, self.id, -self.created_epoch, self.size_bytes)
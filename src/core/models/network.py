@@ -2,12 +2,16 @@
 
 from dataclasses import dataclass
 from datetime import datetime
-import re
+from sys import intern
+from src.utils.docker_utils import LabelMap, lazy_timestamps, parse_rfc3339
 
-@dataclass
+@lazy_timestamps("created_at", parser=parse_rfc3339)
+@dataclass(frozen=True, slots=True)
 class Network:
     """
     Represents a Docker network.
+
+    Instances are immutable and slotted, with the repeated strings interned.
     """
     id: str
     name: str
@@ -15,7 +19,7 @@ class Network:
     scope: str
     ipv6: str
     internal: str
-    labels: str
+    label_map: LabelMap
     created_at: datetime
 
     @classmethod
@@ -29,21 +33,43 @@ class Network:
         Returns:
             Network: A new Network instance.
         """
-        # Parse the CreatedAt string to remove the nanoseconds
-        created_at_str = re.sub(r'(\.\d{6})\d+', r'\1', data['CreatedAt'])
-        created_at = datetime.strptime(created_at_str, "%Y-%m-%d %H:%M:%S.%f %z %Z")
-
         return cls(
             id=data['ID'],
             name=data['Name'],
-            driver=data['Driver'],
-            scope=data['Scope'],
-            ipv6=data['IPv6'],
-            internal=data['Internal'],
-            labels=data['Labels'],
-            created_at=created_at
+            driver=intern(data['Driver']),
+            scope=intern(data['Scope']),
+            ipv6=intern(data['IPv6']),
+            internal=intern(data['Internal']),
+            label_map=LabelMap.parse(data['Labels']),
+            created_at=data['CreatedAt']  # Parsed on first access
+        )
+
+    @classmethod
+    def from_api(cls, data: dict) -> 'Network':
+        """
+        Create a Network instance from an Engine API network payload (`GET /networks`).
+
+        Args:
+            data (dict): Dictionary containing network data.
+
+        Returns:
+            Network: A new Network instance.
+        """
+        return cls(
+            id=data['Id'],
+            name=data['Name'],
+            driver=intern(data['Driver']),
+            scope=intern(data['Scope']),
+            ipv6=intern(str(bool(data.get('EnableIPv6'))).lower()),
+            internal=intern(str(bool(data.get('Internal'))).lower()),
+            label_map=LabelMap(data.get('Labels')),
+            created_at=data['Created']
         )
 
+    @property
+    def labels(self) -> str:
+        return str(self.label_map)
+
     def __str__(self) -> str:
         """
         Return a string representation of the Network.
@@ -0,0 +1,207 @@
+# src/core/models/snapshot.py
+
+from array import array
+from dataclasses import fields
+from datetime import datetime
+from typing import (Any, Dict, Generic, Hashable, Iterable, Iterator, List, Optional, Sequence, Set, Tuple, Type,
+                    TypeVar)
+from src.utils.docker_utils import LazyTimestamp
+
+T = TypeVar("T")
+
+
+class StringTable:
+    """
+    Maps each distinct value (usually a string) to a small integer reference.
+
+    Snapshots that share a table store equal values under equal references, so rows of
+    different snapshots can be compared reference by reference. A table only grows, so long
+    running callers should start a fresh one now and then.
+    """
+
+    def __init__(self):
+        self._values: List[Hashable] = []
+        self._refs: Dict[Hashable, int] = {}
+
+    def ref(self, value: Hashable) -> int:
+        """
+        Get the reference of a value, adding it to the table if it is new.
+
+        Args:
+            value (Hashable): The value.
+
+        Returns:
+            int: The reference.
+        """
+        ref = self._refs.get(value)
+        if ref is None:
+            ref = self._refs[value] = len(self._values)
+            self._values.append(value)
+        return ref
+
+    def find(self, value: Hashable) -> Optional[int]:
+        """
+        Get the reference of a value without adding it.
+        """
+        return self._refs.get(value)
+
+    def value(self, ref: int) -> Any:
+        return self._values[ref]
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+
+class ColumnarSnapshot(Generic[T]):
+    """
+    A compact, column-oriented copy of a list of models.
+
+    Integer fields (sizes, counts) are stored as arrays of 64-bit integers, so sorting and
+    totalling them never touches a model. Every other field is stored as an array of 32-bit
+    references into a StringTable, so a snapshot of n models costs about 4 bytes per field per
+    model plus one copy of every distinct value. Timestamp fields keep whatever the model
+    holds (a datetime or the raw, still unparsed timestamp), so materialized models stay
+    lazy; diff() compares them as epoch seconds, so a parsed and an unparsed copy of the
+    same timestamp are equal. Models are rebuilt on access.
+    """
+
+    def __init__(self, model: Type[T], items: Iterable[T] = (), key: str = "id",
+                 table: Optional[StringTable] = None):
+        """
+        Args:
+            model (Type[T]): The model dataclass, e.g. Container.
+            items (Iterable[T]): The models to store.
+            key (str): The field that identifies a model, used by diff() and find().
+            table (Optional[StringTable]): The table to store values in; share one between snapshots to diff them cheaply.
+        """
+        self.model = model
+        self.key = key
+        self.table = table if table is not None else StringTable()
+        self.field_names = [field.name for field in fields(model)]
+        self.numeric = {field.name for field in fields(model) if field.type is int}
+        self._timestamps: Dict[str, LazyTimestamp] = {
+            name: model.__dict__[name] for name in self.field_names
+            if isinstance(model.__dict__.get(name), LazyTimestamp)}
+        self.columns: Dict[str, array] = {name: array("q" if name in self.numeric else "I")
+                                          for name in self.field_names}
+        self._positions: Optional[Dict[int, int]] = None
+        self.extend(items)
+
+    def append(self, item: T) -> None:
+        ref = self.table.ref
+        for name in self.field_names:
+            if name in self.numeric:
+                self.columns[name].append(getattr(item, name))
+                continue
+            timestamp = self._timestamps.get(name)
+            self.columns[name].append(ref(timestamp.raw(item) if timestamp is not None else getattr(item, name)))
+        self._positions = None
+
+    def extend(self, items: Iterable[T]) -> None:
+        for item in items:
+            self.append(item)
+
+    def __len__(self) -> int:
+        return len(self.columns[self.field_names[0]]) if self.field_names else 0
+
+    def _cell(self, name: str, index: int) -> Any:
+        cell = self.columns[name][index]
+        return cell if name in self.numeric else self.table.value(cell)
+
+    def __getitem__(self, index: int) -> T:
+        return self.model(**{name: self._cell(name, index) for name in self.field_names})
+
+    def __iter__(self) -> Iterator[T]:
+        for index in range(len(self)):
+            yield self[index]
+
+    def column(self, name: str) -> Sequence[Any]:
+        """
+        Get every value of one field, in row order, without building any model.
+
+        Integer fields are returned as the underlying array itself.
+        """
+        if name in self.numeric:
+            return self.columns[name]
+        value = self.table.value
+        return [value(ref) for ref in self.columns[name]]
+
+    def total(self, name: str) -> int:
+        """
+        Sum an integer field, skipping unknown (negative) values.
+        """
+        return sum(value for value in self.columns[name] if value > 0)
+
+    def sort_order(self, name: str, reverse: bool = False) -> List[int]:
+        """
+        Get the row indexes ordered by one field, e.g. to list the largest images first.
+
+        Args:
+            name (str): The field to sort by.
+            reverse (bool): If True, sort in descending order.
+
+        Returns:
+            List[int]: The row indexes in sorted order.
+        """
+        keys = self.column(name)
+        return sorted(range(len(keys)), key=keys.__getitem__, reverse=reverse)
+
+    def row_refs(self, index: int) -> Tuple[int, ...]:
+        # References for string-table fields, the values themselves for integer fields
+        return tuple(self.columns[name][index] for name in self.field_names)
+
+    def _key_positions(self) -> Dict[int, int]:
+        if self._positions is None:
+            self._positions = {ref: index for index, ref in enumerate(self.columns[self.key])}
+        return self._positions
+
+    def find(self, key: Any) -> Optional[T]:
+        """
+        Get the model with the given key, or None.
+        """
+        ref = self.table.find(key)
+        index = None if ref is None else self._key_positions().get(ref)
+        return None if index is None else self[index]
+
+    def diff(self, newer: "ColumnarSnapshot[T]") -> Tuple[Set[Any], Set[Any], Set[Any]]:
+        """
+        Compare this snapshot with a newer one of the same model.
+
+        When both snapshots share a StringTable, rows are compared reference by reference,
+        and only rows whose references differ are compared value by value, with timestamps
+        in epoch seconds.
+
+        Args:
+            newer (ColumnarSnapshot[T]): The newer snapshot.
+
+        Returns:
+            Tuple[Set[Any], Set[Any], Set[Any]]: The keys that were added, removed and changed.
+        """
+        old_positions = self._key_positions()
+        new_positions = newer._key_positions()
+        if newer.table is self.table:
+            old_keys, new_keys = set(old_positions), set(new_positions)
+            changed = {ref for ref in old_keys & new_keys
+                       if self.row_refs(old_positions[ref]) != newer.row_refs(new_positions[ref])
+                       and self._values(old_positions[ref]) != newer._values(new_positions[ref])}
+            value = self.table.value
+            return ({value(ref) for ref in new_keys - old_keys}, {value(ref) for ref in old_keys - new_keys},
+                    {value(ref) for ref in changed})
+
+        old_rows = {self.table.value(ref): index for ref, index in old_positions.items()}
+        new_rows = {newer.table.value(ref): index for ref, index in new_positions.items()}
+        changed = {key for key in old_rows.keys() & new_rows.keys()
+                   if self._values(old_rows[key]) != newer._values(new_rows[key])}
+        return set(new_rows.keys() - old_rows.keys()), set(old_rows.keys() - new_rows.keys()), changed
+
+    def _values(self, index: int) -> Tuple[Any, ...]:
+        # Timestamps in a canonical form, since a slot may hold a datetime, the raw string or epoch seconds
+        return tuple(self._epoch(name, self._cell(name, index)) if name in self._timestamps
+                     else self._cell(name, index) for name in self.field_names)
+
+    def _epoch(self, name: str, value: Any) -> Any:
+        if isinstance(value, str):
+            value = self._timestamps[name].parser(value)
+        if isinstance(value, datetime):
+            return value.timestamp()
+        return float(value) if isinstance(value, (int, float)) else value
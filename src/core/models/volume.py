@@ -1,20 +1,25 @@
 from dataclasses import dataclass
+from sys import intern
 from typing import Optional
+from src.utils.docker_utils import LabelMap, format_size, parse_size
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Volume:
     """
     Represents a Docker volume.
+
+    Instances are immutable and slotted, with the repeated strings interned. The size and
+    reference count are kept as integers (-1 if unknown); the display strings are derived from them.
     """
     name: str
     driver: str
     mountpoint: str
-    labels: str
+    label_map: LabelMap
     scope: str
     availability: str
     group: str
-    links: str
-    size: str
+    links_count: int
+    size_bytes: int
     status: str
 
     @classmethod
@@ -30,17 +35,54 @@ class Volume:
         """
         return cls(
             name=data['Name'],
-            driver=data['Driver'],
+            driver=intern(data['Driver']),
+            mountpoint=data['Mountpoint'],
+            label_map=LabelMap.parse(data['Labels']),
+            scope=intern(data['Scope']),
+            availability=intern(data['Availability']),
+            group=intern(data['Group']),
+            links_count=int(data['Links']) if data['Links'].isdigit() else -1,
+            size_bytes=parse_size(data['Size']),
+            status=intern(data['Status'])
+        )
+
+    @classmethod
+    def from_api(cls, data: dict) -> 'Volume':
+        """
+        Create a Volume instance from an Engine API volume payload (`GET /volumes`).
+
+        Args:
+            data (dict): Dictionary containing volume data.
+
+        Returns:
+            Volume: A new Volume instance.
+        """
+        usage = data.get('UsageData') or {}
+        return cls(
+            name=data['Name'],
+            driver=intern(data['Driver']),
             mountpoint=data['Mountpoint'],
-            labels=data['Labels'],
-            scope=data['Scope'],
-            availability=data['Availability'],
-            group=data['Group'],
-            links=data['Links'],
-            size=data['Size'],
-            status=data['Status']
+            label_map=LabelMap(data.get('Labels')),
+            scope=intern(data['Scope']),
+            availability="N/A",
+            group="N/A",
+            links_count=usage.get('RefCount', -1),
+            size_bytes=usage.get('Size', -1),
+            status="N/A"
         )
 
+    @property
+    def labels(self) -> str:
+        return str(self.label_map)
+
+    @property
+    def links(self) -> str:
+        return str(self.links_count) if self.links_count >= 0 else "N/A"
+
+    @property
+    def size(self) -> str:
+        return format_size(self.size_bytes)
+
     def __str__(self) -> str:
         """
         Return a string representation of the Volume.
@@ -48,4 +90,22 @@ class Volume:
         Returns:
             str: A string representation of the Volume.
         """
-        return f"Volume(name={self.name}, driver={self.driver}, scope={self.scope})"
\ No newline at end of file
+        return f"Volume(name={self.name}, driver={self.driver}, scope={self.scope})"
+
+    def to_tuple(self) -> tuple:
+        """
+        Convert the Volume instance to a display row.
+
+        Returns:
+            tuple: A tuple containing the volume name, driver, size, link count and mountpoint.
+        """
+        return (self.name, self.driver, self.size, self.links, self.mountpoint)
+
+    def sort_tuple(self) -> tuple:
+        """
+        Get the typed sort keys of the to_tuple() columns.
+
+        Returns:
+            tuple: The name and driver, the size and link count (-1 if unknown) and the mountpoint.
+        """
+        return (self.name, self.driver, self.size_bytes, self.links_count, self.mountpoint)
@@ -0,0 +1,367 @@
+# src/core/network_topology.py
+
+import ipaddress
+import logging
+import threading
+from typing import Collection, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple, Union
+
+from .docker_client import api_request, get_client, quote_path
+from .services import network_service
+from .services.batch import DEFAULT_MAX_WORKERS, BulkResult
+
+# Set up logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+Address = Union[ipaddress.IPv4Address, ipaddress.IPv6Address]
+Subnet = Union[ipaddress.IPv4Network, ipaddress.IPv6Network]
+
+# Drivers whose members cannot talk to each other over the network
+ISOLATED_DRIVERS = {"null"}
+
+
+def _address(value: Optional[str]) -> Optional[Address]:
+    """
+    Parse an address such as "172.18.0.2" or "172.18.0.2/16"; None if empty or malformed.
+    """
+    if not value:
+        return None
+    try:
+        return ipaddress.ip_address(value.split('/', 1)[0])
+    except ValueError:
+        return None
+
+
+class Pool(NamedTuple):
+    """
+    One IPAM configuration of a network: a subnet and the range containers get addresses from.
+    """
+    subnet: Subnet
+    ip_range: Subnet
+    reserved: frozenset  # The gateway and auxiliary addresses
+
+    @classmethod
+    def from_api(cls, config: dict) -> 'Pool':
+        subnet = ipaddress.ip_network(config['Subnet'], strict=False)
+        ip_range = ipaddress.ip_network(config['IPRange'], strict=False) if config.get('IPRange') else subnet
+        reserved = {_address(config.get('Gateway'))}
+        reserved.update(_address(value) for value in (config.get('AuxiliaryAddresses') or {}).values())
+        reserved.discard(None)
+        if subnet.version == 4 and subnet.prefixlen < 31:
+            reserved.update((subnet.network_address, subnet.broadcast_address))
+        return cls(subnet, ip_range, frozenset(address for address in reserved if address in ip_range))
+
+
+class NetworkNode(NamedTuple):
+    id: str
+    name: str
+    driver: str
+    internal: bool
+    pools: Tuple[Pool, ...]
+
+
+class Endpoint(NamedTuple):
+    """
+    The attachment of a container to a network.
+    """
+    container_id: str
+    network_id: str
+    ipv4: Optional[Address]
+    ipv6: Optional[Address]
+    mac_address: str
+    aliases: Tuple[str, ...]
+
+
+class TopologyIndex:
+    """
+    The bipartite graph of containers and the networks they are attached to, with addresses.
+
+    Built from one network listing and one container listing, whatever the number of
+    networks and containers. Both sides of every edge are indexed, so the members of a
+    network, the networks of a container, what a container can reach and the addresses left
+    in a subnet are answered from memory. connect_many() and disconnect_many() update the
+    edges they change instead of rebuilding the graph.
+    """
+
+    def __init__(self):
+        self.networks: Dict[str, NetworkNode] = {}
+        self.container_names: Dict[str, str] = {}
+        self.endpoints: Dict[Tuple[str, str], Endpoint] = {}
+        self.container_networks: Dict[str, Set[str]] = {}
+        self.network_containers: Dict[str, Set[str]] = {}
+        self._network_ids: Dict[str, str] = {}  # name -> ID
+        self._container_ids: Dict[str, str] = {}  # name -> ID
+        self._lock = threading.RLock()
+
+    @classmethod
+    def from_api(cls, networks: List[dict], containers: List[dict]) -> 'TopologyIndex':
+        """
+        Build the index from `GET /networks` and `GET /containers/json?all=1` payloads.
+        """
+        index = cls()
+        for data in networks:
+            try:
+                index.add_network(data)
+            except (KeyError, ValueError) as e:
+                logger.error(f"Invalid network data for {data.get('Name')}: {e}")
+        for data in containers:
+            names = [name[1:] for name in data.get('Names') or [] if name.count('/') == 1]
+            index.set_container(data['Id'], names[0] if names else data['Id'][:12],
+                                (data.get('NetworkSettings') or {}).get('Networks') or {})
+        return index
+
+    @classmethod
+    def fetch(cls) -> 'TopologyIndex':
+        """
+        List the networks and containers from the daemon and build the index.
+
+        Raises:
+            DockerClientError: If the daemon cannot be reached or answers with an error.
+        """
+        client = get_client()
+        networks = client.request_json("GET", "/networks")
+        containers = client.request_json("GET", "/containers/json", params={"all": True})
+        return cls.from_api(networks, containers)
+
+    def add_network(self, data: dict) -> None:
+        """
+        Add or replace a network from its API payload, keeping its known members.
+        """
+        pools = tuple(Pool.from_api(config) for config in (data.get('IPAM') or {}).get('Config') or ()
+                      if config.get('Subnet'))
+        network = NetworkNode(data['Id'], data['Name'], data.get('Driver', ""), bool(data.get('Internal')), pools)
+        with self._lock:
+            self.networks[network.id] = network
+            self._network_ids[network.name] = network.id
+            self.network_containers.setdefault(network.id, set())
+
+    def remove_network(self, network: str) -> None:
+        with self._lock:
+            network_id = self.network_id(network)
+            if network_id is None:
+                return
+            for container_id in list(self.network_containers.get(network_id, ())):
+                self._disconnect(container_id, network_id)
+            node = self.networks.pop(network_id)
+            self._network_ids.pop(node.name, None)
+            del self.network_containers[network_id]
+
+    def set_container(self, container_id: str, name: str, networks: Dict[str, dict]) -> None:
+        """
+        Add or replace a container and its endpoints.
+
+        Args:
+            container_id (str): The ID of the container.
+            name (str): The name of the container.
+            networks (Dict[str, dict]): The endpoint settings keyed by network name, as in
+                `NetworkSettings.Networks` of a container summary or inspect payload.
+        """
+        with self._lock:
+            # By exact ID: resolving a prefix would scan every container, once per container when building
+            if container_id in self.container_names:
+                self._drop_container(container_id)
+            self.container_names[container_id] = name
+            self._container_ids[name] = container_id
+            self.container_networks[container_id] = set()
+            for network_name, settings in networks.items():
+                network_id = settings.get('NetworkID') or self._network_ids.get(network_name)
+                if network_id not in self.networks:
+                    continue
+                self._connect(Endpoint(
+                    container_id=container_id,
+                    network_id=network_id,
+                    ipv4=_address(settings.get('IPAddress')),
+                    ipv6=_address(settings.get('GlobalIPv6Address')),
+                    mac_address=settings.get('MacAddress') or "",
+                    aliases=tuple(settings.get('Aliases') or settings.get('DNSNames') or ()),
+                ))
+
+    def remove_container(self, container: str) -> None:
+        with self._lock:
+            container_id = self.container_id(container)
+            if container_id is not None:
+                self._drop_container(container_id)
+
+    def _drop_container(self, container_id: str) -> None:
+        for network_id in list(self.container_networks.get(container_id, ())):
+            self._disconnect(container_id, network_id)
+        name = self.container_names.pop(container_id)
+        self._container_ids.pop(name, None)
+        del self.container_networks[container_id]
+
+    def _connect(self, endpoint: Endpoint) -> None:
+        self.endpoints[endpoint.container_id, endpoint.network_id] = endpoint
+        self.container_networks[endpoint.container_id].add(endpoint.network_id)
+        self.network_containers[endpoint.network_id].add(endpoint.container_id)
+
+    def _disconnect(self, container_id: str, network_id: str) -> None:
+        self.endpoints.pop((container_id, network_id), None)
+        self.container_networks.get(container_id, set()).discard(network_id)
+        self.network_containers.get(network_id, set()).discard(container_id)
+
+    @staticmethod
+    def _resolve(key: str, ids: Collection[str], names: Dict[str, str]) -> Optional[str]:
+        if key in ids:
+            return key
+        if key in names:
+            return names[key]
+        matches = [object_id for object_id in ids if object_id.startswith(key)]
+        return matches[0] if len(matches) == 1 else None
+
+    def network_id(self, network: str) -> Optional[str]:
+        """
+        Get the ID of a network from its ID, a unique prefix of it or its name.
+        """
+        if network in self.networks:
+            return network
+        return self._resolve(network, self.networks, self._network_ids)
+
+    def container_id(self, container: str) -> Optional[str]:
+        """
+        Get the ID of a container from its ID, a unique prefix of it or its name.
+        """
+        if container in self.container_names:
+            return container
+        return self._resolve(container, self.container_names, self._container_ids)
+
+    def members(self, network: str) -> List[Endpoint]:
+        """
+        Get the endpoints of the containers attached to a network.
+        """
+        with self._lock:
+            network_id = self.network_id(network)
+            return [self.endpoints[container_id, network_id]
+                    for container_id in self.network_containers.get(network_id, ())]
+
+    def attachments(self, container: str) -> List[Endpoint]:
+        """
+        Get the endpoints of a container on each network it is attached to.
+        """
+        with self._lock:
+            container_id = self.container_id(container)
+            return [self.endpoints[container_id, network_id]
+                    for network_id in self.container_networks.get(container_id, ())]
+
+    def reachable_from(self, container: str) -> Dict[str, Set[str]]:
+        """
+        Find the containers that share a network with a container.
+
+        Reachability is symmetric, so this also tells what can reach the container.
+
+        Returns:
+            Dict[str, Set[str]]: The IDs of the networks shared, keyed by container ID.
+        """
+        with self._lock:
+            container_id = self.container_id(container)
+            peers: Dict[str, Set[str]] = {}
+            for network_id in self.container_networks.get(container_id, ()):
+                if self.networks[network_id].driver in ISOLATED_DRIVERS:
+                    continue
+                for peer_id in self.network_containers[network_id]:
+                    if peer_id != container_id:
+                        peers.setdefault(peer_id, set()).add(network_id)
+            return peers
+
+    def used_addresses(self, network: str) -> Set[Address]:
+        with self._lock:
+            used = set()
+            for endpoint in self.members(network):
+                used.update(address for address in (endpoint.ipv4, endpoint.ipv6) if address is not None)
+            return used
+
+    def free_addresses(self, network: str) -> Dict[str, int]:
+        """
+        Count the addresses still free for containers in each subnet of a network.
+
+        Only the addresses in use are looked at, so the count costs the same for a /8 as for a /28.
+
+        Returns:
+            Dict[str, int]: The number of free addresses, keyed by subnet (e.g. "172.18.0.0/16").
+        """
+        with self._lock:
+            network_id = self.network_id(network)
+            if network_id is None:
+                return {}
+            used = self.used_addresses(network_id)
+            free = {}
+            for pool in self.networks[network_id].pools:
+                taken = len(pool.reserved) + sum(
+                    1 for address in used if address in pool.ip_range and address not in pool.reserved)
+                free[str(pool.subnet)] = max(pool.ip_range.num_addresses - taken, 0)
+            return free
+
+    def refresh_network(self, network: str) -> bool:
+        """
+        Update the addresses of a network's members from `GET /networks/{id}`, e.g. after containers joined it.
+
+        Aliases are not part of that payload; those already known are kept.
+
+        Returns:
+            bool: True if the network was fetched, False otherwise.
+        """
+        network_id = self.network_id(network) or network
+        success, output = api_request("GET", f"/networks/{quote_path(network_id)}")
+        if not success:
+            logger.error(f"Failed to refresh network {network}")
+            return False
+        self.add_network(output)
+        with self._lock:
+            members = output.get('Containers') or {}
+            for container_id in list(self.network_containers[output['Id']]):
+                if container_id not in members:
+                    self._disconnect(container_id, output['Id'])
+            for container_id, settings in members.items():
+                if container_id not in self.container_names:
+                    self.container_names[container_id] = settings.get('Name') or container_id[:12]
+                    self._container_ids[self.container_names[container_id]] = container_id
+                    self.container_networks[container_id] = set()
+                known = self.endpoints.get((container_id, output['Id']))
+                self._connect(Endpoint(
+                    container_id=container_id,
+                    network_id=output['Id'],
+                    ipv4=_address(settings.get('IPv4Address')),
+                    ipv6=_address(settings.get('IPv6Address')),
+                    mac_address=settings.get('MacAddress') or "",
+                    aliases=known.aliases if known is not None else (),
+                ))
+        return True
+
+    def connect_many(self, pairs: Iterable[Tuple[str, str]], aliases: Optional[List[str]] = None,
+                     max_workers: int = DEFAULT_MAX_WORKERS,
+                     on_progress: Optional[network_service.ProgressCallback] = None) -> BulkResult:
+        """
+        Connect many containers to networks with network_service.connect_many() and add the new edges.
+
+        The addresses the daemon assigned are read back with one request per network concerned.
+        """
+        result = network_service.connect_many(pairs, aliases, max_workers, on_progress)
+        networks = set()
+        for key in result.succeeded:
+            container, network = network_service.split_pair_key(key)
+            networks.add(self.network_id(network) or network)
+        for network in networks:
+            self.refresh_network(network)
+        if aliases:
+            with self._lock:
+                for key in result.succeeded:
+                    container, network = network_service.split_pair_key(key)
+                    endpoint = self.endpoints.get((self.container_id(container), self.network_id(network)))
+                    if endpoint is not None:
+                        self.endpoints[endpoint.container_id, endpoint.network_id] = endpoint._replace(
+                            aliases=tuple(dict.fromkeys(endpoint.aliases + tuple(aliases))))
+        return result
+
+    def disconnect_many(self, pairs: Iterable[Tuple[str, str]], force: bool = False,
+                        max_workers: int = DEFAULT_MAX_WORKERS,
+                        on_progress: Optional[network_service.ProgressCallback] = None) -> BulkResult:
+        """
+        Disconnect many containers from networks with network_service.disconnect_many() and drop their edges.
+        """
+        result = network_service.disconnect_many(pairs, force, max_workers, on_progress)
+        with self._lock:
+            for key in result.succeeded:
+                container, network = network_service.split_pair_key(key)
+                container_id, network_id = self.container_id(container), self.network_id(network)
+                if container_id is not None and network_id is not None:
+                    self._disconnect(container_id, network_id)
+        return result
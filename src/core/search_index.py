@@ -0,0 +1,353 @@
+# src/core/search_index.py
+
+import bisect
+import itertools
+import logging
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Mapping, NamedTuple, Optional, Set, Tuple
+
+from .state_store import CONTAINER, IMAGE, NETWORK, RESET, REMOVE, VOLUME, StateStore, StoreChange
+
+# Set up logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+DEFAULT_LIMIT = 50
+SHORT_ID_LENGTH = 12
+SEPARATOR = "\x00"  # Between the fields of a document's text, so no match spans two fields
+
+# Ranks of a hit, best first
+EXACT = 0  # The name is the query
+PREFIX = 1  # The name or ID starts with the query
+NAME = 2  # The name contains the query
+OTHER = 3  # Another field (image reference, short ID, ...) contains the query
+
+
+class SearchDocument(NamedTuple):
+    """
+    What a resource is searchable by.
+    """
+    name: str
+    aliases: Tuple[str, ...]  # Other names: image references, the image of a container, ...
+    id: str
+    labels: Mapping[str, str]
+
+
+class SearchHit(NamedTuple):
+    kind: str
+    key: str
+    name: str
+    rank: int
+
+
+class _Entry(NamedTuple):
+    kind: str
+    key: str
+    name: str
+    id: str
+    text: str
+    prefixes: Tuple[str, ...]
+    labels: Tuple[Tuple[str, str], ...]
+
+
+def _image_document(rows) -> SearchDocument:
+    references = [f"{row.repository}:{row.tag}" for row in rows if row.repository != "<none>"]
+    image_id = rows[0].id
+    return SearchDocument(references[0] if references else image_id[:SHORT_ID_LENGTH],
+                          tuple(references[1:]), image_id, {})
+
+
+# How each kind of StateStore resource is turned into a SearchDocument
+DOCUMENT_BUILDERS: Dict[str, Callable[[Any], SearchDocument]] = {
+    CONTAINER: lambda container: SearchDocument(container.name.split(",", 1)[0], (container.image,),
+                                                container.id, container.label_map),
+    IMAGE: _image_document,
+    VOLUME: lambda volume: SearchDocument(volume.name, (), "", volume.label_map),
+    NETWORK: lambda network: SearchDocument(network.name, (), network.id, network.label_map),
+}
+
+
+def trigrams(text: str) -> Set[str]:
+    return {text[i:i + 3] for i in range(len(text) - 2) if SEPARATOR not in text[i:i + 3]}
+
+
+class _GramIndex:
+    """
+    Trigram postings, plus the trigrams containing each one- and two-character string.
+
+    A term shorter than a trigram is found through the trigrams that contain it, so it
+    never needs a scan of every document; only fields shorter than three characters are
+    missed, which the prefix lookup covers for names.
+    """
+
+    def __init__(self):
+        self.postings: Dict[str, Set[int]] = {}
+        self.fragments: Dict[str, Set[str]] = {}
+
+    def add(self, text: str, doc_id: int) -> None:
+        for trigram in trigrams(text):
+            documents = self.postings.get(trigram)
+            if documents is None:
+                documents = self.postings[trigram] = set()
+                for fragment in {trigram[0], trigram[1], trigram[2], trigram[:2], trigram[1:]}:
+                    self.fragments.setdefault(fragment, set()).add(trigram)
+            documents.add(doc_id)
+
+    def remove(self, text: str, doc_id: int) -> None:
+        for trigram in trigrams(text):
+            documents = self.postings[trigram]
+            documents.discard(doc_id)
+            if not documents:
+                del self.postings[trigram]
+                for fragment in {trigram[0], trigram[1], trigram[2], trigram[:2], trigram[1:]}:
+                    self.fragments[fragment].discard(trigram)
+                    if not self.fragments[fragment]:
+                        del self.fragments[fragment]
+
+    def candidates(self, term: str) -> Tuple[int, Iterable[int]]:
+        """
+        Get the documents that may contain a term, and how many there are at most.
+        """
+        if len(term) >= 3:
+            documents = min((self.postings.get(trigram, set()) for trigram in trigrams(term)), key=len)
+            return len(documents), documents
+        postings = [self.postings[trigram] for trigram in self.fragments.get(term, ())]
+        # A document with the term in several trigrams comes up more than once
+        return sum(map(len, postings)), itertools.chain.from_iterable(postings)
+
+
+class SearchIndex:
+    """
+    A trigram index over the names, image references, IDs and labels of every resource.
+
+    Every three-character substring of a document's searchable text, and separately of its
+    name, maps to the documents containing it; names and IDs are kept in one sorted list for
+    prefix lookups, and labels map to their documents. Each rank is looked for among the
+    documents behind the rarest trigram or label of the query only, and the search stops
+    as soon as it has `limit` hits, so a keystroke costs in proportion to the hits and to
+    the documents sharing the query's rarest trigram, not to the size of the inventory.
+
+    Query syntax: whitespace-separated terms, all of which must match. "key=value" matches
+    a label exactly and "key=" any value of the label; other terms match case-insensitively
+    anywhere in a name, image reference or short ID, and at the start of a full ID.
+    """
+
+    def __init__(self, builders: Optional[Dict[str, Callable[[Any], SearchDocument]]] = None):
+        """
+        Args:
+            builders (Optional[Dict[str, Callable[[Any], SearchDocument]]]): How each kind of resource is
+                indexed, defaults to DOCUMENT_BUILDERS.
+        """
+        self.builders = builders or DOCUMENT_BUILDERS
+        self._entries: Dict[int, _Entry] = {}
+        self._doc_ids: Dict[Tuple[str, str], int] = {}
+        self._next_id = 0
+        self._text = _GramIndex()
+        self._names = _GramIndex()
+        self._labels: Dict[Tuple[str, str], Set[int]] = {}
+        self._label_keys: Dict[str, Set[int]] = {}
+        self._prefixes: List[Tuple[str, int]] = []  # Sorted (lower-cased name or ID, document)
+        self._store: Optional[StateStore] = None
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(self, kind: str, key: str, document: SearchDocument) -> None:
+        """
+        Add a resource, or replace what it was indexed by.
+        """
+        with self._lock:
+            entry = self._entry(kind, key, document)
+            if not self._unchanged(entry):
+                self.remove(kind, key)
+                self._insert(entry, sort=True)
+
+    @staticmethod
+    def _entry(kind: str, key: str, document: SearchDocument) -> _Entry:
+        name = document.name.lower()
+        full_id = document.id.split(":", 1)[-1].lower()
+        fields = [name, *(alias.lower() for alias in document.aliases)]
+        if full_id:
+            fields.append(full_id[:SHORT_ID_LENGTH])
+        prefixes = tuple(dict.fromkeys(value for value in (name, full_id) if value))
+        labels = tuple((label.lower(), value.lower()) for label, value in document.labels.items())
+        return _Entry(kind, key, document.name, full_id, SEPARATOR.join(fields), prefixes, labels)
+
+    def _unchanged(self, entry: _Entry) -> bool:
+        doc_id = self._doc_ids.get((entry.kind, entry.key))
+        return doc_id is not None and self._entries[doc_id] == entry
+
+    def _insert(self, entry: _Entry, sort: bool) -> None:
+        kind, key, labels, prefixes = entry.kind, entry.key, entry.labels, entry.prefixes
+        doc_id = self._next_id
+        self._next_id += 1
+        self._doc_ids[kind, key] = doc_id
+        self._entries[doc_id] = entry
+        self._text.add(entry.text, doc_id)
+        self._names.add(entry.name.lower(), doc_id)
+        for label in labels:
+            self._labels.setdefault(label, set()).add(doc_id)
+            self._label_keys.setdefault(label[0], set()).add(doc_id)
+        for prefix in prefixes:
+            if sort:
+                bisect.insort(self._prefixes, (prefix, doc_id))
+            else:
+                self._prefixes.append((prefix, doc_id))
+
+    def add_resource(self, kind: str, key: str, resource: Any) -> None:
+        self.add(kind, key, self.builders[kind](resource))
+
+    def remove(self, kind: str, key: str) -> None:
+        with self._lock:
+            doc_id = self._doc_ids.pop((kind, key), None)
+            if doc_id is None:
+                return
+            entry = self._entries.pop(doc_id)
+            self._text.remove(entry.text, doc_id)
+            self._names.remove(entry.name.lower(), doc_id)
+            for label in entry.labels:
+                self._discard(self._labels, label, doc_id)
+                self._discard(self._label_keys, label[0], doc_id)
+            for prefix in entry.prefixes:
+                position = bisect.bisect_left(self._prefixes, (prefix, doc_id))
+                del self._prefixes[position]
+
+    @staticmethod
+    def _discard(postings: Dict[Any, Set[int]], key: Any, doc_id: int) -> None:
+        documents = postings[key]
+        documents.discard(doc_id)
+        if not documents:
+            del postings[key]
+
+    def reset(self, kind: str, resources: Dict[str, Any]) -> None:
+        """
+        Replace every resource of a kind, e.g. from a StateStore snapshot.
+        """
+        with self._lock:
+            entries = [self._entry(kind, key, self.builders[kind](resource)) for key, resource in resources.items()]
+            entries = [entry for entry in entries if not self._unchanged(entry)]
+            # Every removal bisects the sorted prefixes, so all of them go before any append
+            for stale in [key for indexed_kind, key in self._doc_ids if indexed_kind == kind and key not in resources]:
+                self.remove(kind, stale)
+            for entry in entries:
+                self.remove(kind, entry.key)
+            # Appending and sorting once beats inserting every name in order
+            for entry in entries:
+                self._insert(entry, sort=False)
+            self._prefixes.sort()
+
+    def apply(self, change: StoreChange) -> None:
+        """
+        Apply a StateStore change notification.
+        """
+        if change.kind not in self.builders:
+            return
+        if change.action == RESET:
+            if self._store is not None:
+                self.reset(change.kind, self._store.snapshot(change.kind))
+        elif change.action == REMOVE:
+            self.remove(change.kind, change.key)
+        else:
+            self.add_resource(change.kind, change.key, change.resource)
+
+    def attach(self, store: StateStore) -> Callable[[], None]:
+        """
+        Index everything the store knows and follow its changes.
+
+        Returns:
+            Callable[[], None]: A function that stops following the store.
+        """
+        self._store = store
+        unsubscribe = store.subscribe(self.apply)
+        for kind in self.builders:
+            if kind in store.sources:
+                self.reset(kind, store.snapshot(kind))
+        return unsubscribe
+
+    def search(self, query: str, limit: int = DEFAULT_LIMIT, kinds: Optional[Iterable[str]] = None) -> List[SearchHit]:
+        """
+        Find the resources matching a query, best first.
+
+        Hits rank by EXACT name, then PREFIX of the name or ID (alphabetically), then a
+        substring of the NAME, then a substring of any OTHER field.
+
+        Args:
+            query (str): The query, see the class documentation.
+            limit (int): The maximum number of hits.
+            kinds (Optional[Iterable[str]]): The kinds of resources to search, defaults to all.
+
+        Returns:
+            List[SearchHit]: At most `limit` hits.
+        """
+        terms = query.lower().split()
+        if not terms or limit <= 0:
+            return []
+        kinds = set(kinds) if kinds is not None else None
+        texts = [term for term in terms if "=" not in term]
+        labels = [term.partition("=")[::2] for term in terms if "=" in term]
+
+        with self._lock:
+            label_sets = sorted((self._labels.get((label, value)) if value else self._label_keys.get(label)
+                                 for label, value in labels), key=lambda documents: len(documents or ()))
+            if not all(label_sets):
+                return []
+            labelled = label_sets[0].intersection(*label_sets[1:]) if label_sets else None
+
+            def accepts(doc_id: int) -> bool:
+                entry = self._entries[doc_id]
+                # Full IDs are only indexed for prefix lookups; the text holds the short ID
+                return ((labelled is None or doc_id in labelled)
+                        and (kinds is None or entry.kind in kinds)
+                        and all(term in entry.text or entry.id.startswith(term) for term in texts))
+
+            hits: List[SearchHit] = []
+            seen: Set[int] = set()
+            primary = max(texts, key=len) if texts else None
+            if primary is not None:
+                position = bisect.bisect_left(self._prefixes, (primary, -1))
+                while position < len(self._prefixes) and len(hits) < limit:
+                    prefix, doc_id = self._prefixes[position]
+                    if not prefix.startswith(primary):
+                        break
+                    position += 1
+                    if doc_id in seen or not accepts(doc_id):
+                        continue
+                    seen.add(doc_id)
+                    entry = self._entries[doc_id]
+                    hits.append(SearchHit(entry.kind, entry.key, entry.name,
+                                          EXACT if prefix == primary == entry.name.lower() else PREFIX))
+                hits.sort(key=lambda hit: hit.rank)  # Stable, so prefixes stay alphabetical
+            if len(hits) >= limit:
+                return hits[:limit]
+
+            # Documents with the query in their name rank first, so they are looked for first,
+            # among those sharing the rarest trigram of the name (or the labels, if rarer)
+            sources = [] if labelled is None else [(len(labelled), labelled)]
+            if primary is not None:
+                hits.extend(self._scan(min(sources + [self._names.candidates(primary)], key=lambda source: source[0]),
+                                       lambda doc_id: primary in self._entries[doc_id].name.lower() and accepts(doc_id),
+                                       seen, limit - len(hits), NAME))
+                if len(hits) >= limit:
+                    return hits
+                sources.extend(self._text.candidates(term) for term in texts)
+            if not sources:
+                return hits
+            # Every remaining match is in another field, or anywhere if there is no text term
+            rank = OTHER if primary is not None else NAME
+            hits.extend(self._scan(min(sources, key=lambda source: source[0]), accepts, seen,
+                                   limit - len(hits), rank))
+            return hits
+
+    def _scan(self, source: Tuple[int, Iterable[int]], accepts: Callable[[int], bool], seen: Set[int],
+              limit: int, rank: int) -> List[SearchHit]:
+        hits: List[SearchHit] = []
+        for doc_id in source[1]:
+            if len(hits) >= limit:
+                break
+            if doc_id in seen or not accepts(doc_id):
+                continue
+            seen.add(doc_id)
+            entry = self._entries[doc_id]
+            hits.append(SearchHit(entry.kind, entry.key, entry.name, rank))
+        return hits
@@ -3,4 +3,5 @@
 from . import container_service
 from . import image_service
 from . import network_service
-from . import volume_service
\ No newline at end of file
+from . import volume_service
+from . import system_service
\ No newline at end of file
@@ -0,0 +1,158 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple, TypeVar, Union
+from ..inspect_cache import inspect_cache
+
+# Set up logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+DEFAULT_CHUNK_SIZE = 100
+DEFAULT_MAX_WORKERS = 8
+
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+TIMED_OUT = "timed out"
+
+class BatchInspectResult(NamedTuple):
+    """
+    The outcome of a batched inspect: the objects found and the error for every other ID, both keyed by the requested ID.
+    """
+    found: Dict[str, Any]
+    errors: Dict[str, str]
+
+class BulkResult(NamedTuple):
+    """
+    The outcome of a bulk operation, per object ID.
+    """
+    succeeded: List[str]
+    failed: Dict[str, str]
+    timed_out: List[str]
+
+def chunked(items: List[T], size: int) -> Iterator[List[T]]:
+    """
+    Split a list into consecutive chunks.
+
+    Args:
+        items (List[T]): The items to split.
+        size (int): The maximum chunk size.
+
+    Yields:
+        List[T]: Each chunk, in order.
+    """
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+def match_id(requested: str, full_id: str) -> bool:
+    """
+    Check whether a requested ID (full, short or "sha256:"-prefixed) refers to a full object ID.
+
+    Args:
+        requested (str): The ID as the caller gave it.
+        full_id (str): The object's full ID.
+
+    Returns:
+        bool: True if the requested ID is the full ID or a prefix of it.
+    """
+    requested = requested.split(':', 1)[-1]
+    # An empty prefix would match everything
+    return bool(requested) and full_id.split(':', 1)[-1].startswith(requested)
+
+def batch_inspect(kind: str, keys: Iterable[str],
+                  fetch_chunk: Callable[[List[str]], Tuple[bool, Union[Dict[str, dict], str]]],
+                  build: Callable[[dict], Any], chunk_size: int = DEFAULT_CHUNK_SIZE,
+                  cache_kind: Optional[str] = None) -> BatchInspectResult:
+    """
+    Inspect many objects of one kind with as few requests as possible.
+
+    Payloads already in the inspect cache are used as-is; the rest are fetched `chunk_size` at a
+    time and primed into the cache. A failed chunk only fails the IDs it contains.
+
+    Args:
+        kind (str): The resource kind, e.g. "container".
+        keys (Iterable[str]): The IDs or names to inspect.
+        fetch_chunk (Callable): Fetches a chunk of keys; returns (True, payloads keyed by the requested key)
+            or (False, error message). A key may map to an error message instead of a payload.
+        build (Callable[[dict], Any]): Builds a model from a payload.
+        chunk_size (int): The maximum number of keys per request.
+        cache_kind (Optional[str]): The inspect cache kind the payloads are kept under, defaults to `kind`.
+            Payloads taken from a listing rather than an inspect call must not share the inspect key space.
+
+    Returns:
+        BatchInspectResult: The models found and the per-ID errors.
+    """
+    found: Dict[str, Any] = {}
+    errors: Dict[str, str] = {}
+    payloads: Dict[str, dict] = {}
+    missing = []
+    cache_kind = cache_kind or kind
+    for key in dict.fromkeys(keys):
+        cached = inspect_cache.get(cache_kind, key)
+        if cached is None:
+            missing.append(key)
+        else:
+            payloads[key] = cached
+
+    for chunk in chunked(missing, chunk_size):
+        success, output = fetch_chunk(chunk)
+        if not success:
+            errors.update((key, output) for key in chunk)
+            continue
+        for key in chunk:
+            if isinstance(output.get(key), str):
+                errors[key] = output[key]
+            elif key in output:
+                payloads[key] = output[key]
+                inspect_cache.put(cache_kind, key, output[key])
+            else:
+                errors[key] = f"No such {kind}: {key}"
+
+    for key, payload in payloads.items():
+        try:
+            found[key] = build(payload)
+        except KeyError as e:
+            errors[key] = f"Missing key in {kind} data: {e}"
+    if errors:
+        logger.error(f"Failed to inspect {len(errors)} of {len(found) + len(errors)} {kind}s")
+    return BatchInspectResult(found, errors)
+
+def run_bulk(keys: Iterable[str], operation: Callable[[str], Tuple[str, str]],
+             max_workers: int = DEFAULT_MAX_WORKERS,
+             on_progress: Optional[Callable[[str, str, str], None]] = None) -> BulkResult:
+    """
+    Run an operation on many objects with bounded parallelism.
+
+    Args:
+        keys (Iterable[str]): The IDs or names to operate on.
+        operation (Callable[[str], Tuple[str, str]]): Runs the operation on one key and returns its outcome
+            (SUCCEEDED, FAILED or TIMED_OUT) and an error message.
+        max_workers (int): The maximum number of operations in flight at once.
+        on_progress (Optional[Callable[[str, str, str], None]]): Called with (key, outcome, message) as each
+            operation completes, from a worker thread.
+
+    Returns:
+        BulkResult: The keys that succeeded, failed (with their errors) and timed out.
+    """
+    result = BulkResult([], {}, [])
+    keys = list(dict.fromkeys(keys))
+    if not keys:
+        return result
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(keys))) as executor:
+        futures = {executor.submit(operation, key): key for key in keys}
+        for future in as_completed(futures):
+            key = futures[future]
+            try:
+                outcome, message = future.result()
+            except Exception as e:
+                outcome, message = FAILED, str(e)
+            if outcome == SUCCEEDED:
+                result.succeeded.append(key)
+            elif outcome == TIMED_OUT:
+                result.timed_out.append(key)
+            else:
+                result.failed[key] = message
+            if on_progress is not None:
+                on_progress(key, outcome, message)
+    return result
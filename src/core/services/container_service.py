@@ -1,54 +1,67 @@
-import subprocess
-import json
+import asyncio
 import logging
-from typing import List, Tuple, Optional
+import re
+import struct
+from datetime import datetime
+from typing import Callable, Iterator, List, NamedTuple, Tuple, Optional, Union
 from src.core.models.container import Container
+from src.core.docker_client import (DEFAULT_TIMEOUT, DockerAPIError, DockerClientError, DockerStream, api_request,
+                                    get_client, quote_path)
+from src.core.inspect_cache import inspect_cache
+from src.utils.docker_utils import parse_rfc3339
+from src.core.services.batch import (DEFAULT_CHUNK_SIZE, DEFAULT_MAX_WORKERS, FAILED, SUCCEEDED, TIMED_OUT,
+                                     BatchInspectResult, BulkResult, batch_inspect, match_id, run_bulk)
+
+ProgressCallback = Callable[[str, str, str], None]
+
+STDOUT = "stdout"
+STDERR = "stderr"
+RAW_STREAM = "application/vnd.docker.raw-stream"
+LOG_READ_SIZE = 64 * 1024
+DEFAULT_STOP_GRACE_PERIOD = 10  # The daemon's own default, for containers without a StopTimeout
+MAX_STOP_WORKERS = 64
+
+class LogLine(NamedTuple):
+    """
+    One line of container output.
+    """
+    stream: str                    # STDOUT or STDERR
+    text: str
+    timestamp: Optional[datetime]  # Only set when the logs were requested with timestamps
 
 # Set up logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-def run_docker_command(command: List[str]) -> Tuple[bool, str]:
+def get_containers() -> List[Container]:
     """
-    Execute a Docker command using subprocess.
-
-    Args:
-        command (List[str]): The Docker command to execute.
+    Get a list of all Docker containers.
 
     Returns:
-        Tuple[bool, str]: A tuple containing a boolean indicating success and the output string.
+        List[Container]: A list of Container objects.
     """
-    try:
-        result = subprocess.run(["docker"] + command, capture_output=True, text=True, check=True)
-        return True, result.stdout.strip()
-    except subprocess.CalledProcessError as e:
-        error_message = f"Error executing Docker command: {e.stderr.strip()}"
-        logger.error(error_message)
-        return False, error_message
+    return list(iter_containers())
 
-def get_containers() -> List[Container]:
+def iter_containers() -> Iterator[Container]:
     """
-    Get a list of all Docker containers.
+    Iterate over all Docker containers, building each Container as it is consumed.
 
-    Returns:
-        List[Container]: A list of Container objects.
+    The listing is fetched in one request, but the per-row parsing is spread over the
+    iteration so callers can hand out results in batches as they go.
+
+    Yields:
+        Container: Each container.
     """
-    success, output = run_docker_command(["ps", "-a", "--format", "{{json .}}"])
+    success, output = api_request("GET", "/containers/json", params={"all": True})
     if not success:
         logger.error("Failed to get containers")
-        return []
-
-    containers = []
-    for line in output.split('\n'):
-        if line:
-            try:
-                container_data = json.loads(line)
-                containers.append(Container.from_dict(container_data))
-            except json.JSONDecodeError as e:
-                logger.error(f"Failed to parse container data: {e}")
-            except KeyError as e:
-                logger.error(f"Missing key in container data: {e}")
-    return containers
+        return
+
+    for container_data in output:
+        try:
+            yield Container.from_api(container_data)
+        except KeyError as e:
+            logger.error(f"Missing key in container data: {e}")
 
 def get_container_by_id(container_id: str) -> Optional[Container]:
     """
@@ -60,20 +73,85 @@ def get_container_by_id(container_id: str) -> Optional[Container]:
     Returns:
         Optional[Container]: The Container object if found, None otherwise.
     """
-    success, output = run_docker_command(["inspect", "--format", "{{json .}}", container_id])
-    if not success:
-        logger.error(f"Failed to get container with ID {container_id}")
+    container_data = inspect_cache.get_or_fetch("container", container_id, lambda: _inspect_container(container_id))
+    if container_data is None:
         return None
 
     try:
-        container_data = json.loads(output)
-        return Container.from_dict(container_data)
-    except json.JSONDecodeError as e:
-        logger.error(f"Failed to parse container data: {e}")
+        return Container.from_api(container_data)
     except KeyError as e:
         logger.error(f"Missing key in container data: {e}")
     return None
 
+def _inspect_container(container_id: str) -> Optional[dict]:
+    """
+    Fetch the API summary of a specific container, bypassing the inspect cache.
+
+    Args:
+        container_id (str): The ID (or a prefix of it) or name of the container.
+
+    Returns:
+        Optional[dict]: The container summary if found, None otherwise.
+    """
+    # The list endpoint returns the summary shape Container is built from; the id filter matches prefixes
+    success, output = api_request("GET", "/containers/json", params={"all": True, "filters": {"id": [container_id]}})
+    if success and not output:
+        success, output = api_request("GET", "/containers/json",
+                                      params={"all": True, "filters": {"name": [f"^/{re.escape(container_id)}$"]}})
+    if not success:
+        logger.error(f"Failed to get container with ID {container_id}")
+        return None
+    if not output:
+        logger.error(f"No container data returned for ID {container_id}")
+        return None
+    return output[0]
+
+def inspect_containers(container_ids: List[str], chunk_size: int = DEFAULT_CHUNK_SIZE) -> BatchInspectResult:
+    """
+    Get many containers at once, with one request per chunk of IDs.
+
+    Args:
+        container_ids (List[str]): The IDs (or prefixes of them) or names of the containers.
+        chunk_size (int): The maximum number of IDs per request.
+
+    Returns:
+        BatchInspectResult: The Container objects keyed by requested ID, and an error for every ID that could not be retrieved.
+    """
+    return batch_inspect("container", container_ids, _inspect_container_chunk, Container.from_api, chunk_size)
+
+def _inspect_container_chunk(container_ids: List[str]) -> Tuple[bool, object]:
+    """
+    Fetch the API summaries of a chunk of containers, matching IDs first and names second.
+
+    Args:
+        container_ids (List[str]): The IDs (or prefixes of them) or names of the containers.
+
+    Returns:
+        Tuple[bool, object]: A tuple containing a boolean indicating success and either the summaries keyed by
+        requested ID or the error message.
+    """
+    success, output = api_request("GET", "/containers/json", params={"all": True, "filters": {"id": container_ids}})
+    if not success:
+        return False, output
+    summaries = {}
+    for container_id in container_ids:
+        for container_data in output:
+            if match_id(container_id, container_data['Id']):
+                summaries[container_id] = container_data
+                break
+
+    names = [container_id for container_id in container_ids if container_id not in summaries]
+    if names:
+        pattern = "^/(" + "|".join(re.escape(name) for name in names) + ")$"
+        success, output = api_request("GET", "/containers/json", params={"all": True, "filters": {"name": [pattern]}})
+        if not success:
+            return False, output
+        for container_data in output:
+            for name in container_data.get('Names') or []:
+                if name[1:] in names:
+                    summaries[name[1:]] = container_data
+    return True, summaries
+
 def start_container(container_id: str) -> bool:
     """
     Start a Docker container.
@@ -84,7 +162,8 @@ def start_container(container_id: str) -> bool:
     Returns:
         bool: True if the container was successfully started, False otherwise.
     """
-    success, output = run_docker_command(["start", container_id])
+    success, output = api_request("POST", f"/containers/{quote_path(container_id)}/start")
+    inspect_cache.invalidate("container", container_id)
     if success:
         logger.info(f"Container {container_id} started successfully")
     else:
@@ -101,7 +180,9 @@ def stop_container(container_id: str) -> bool:
     Returns:
         bool: True if the container was successfully stopped, False otherwise.
     """
-    success, output = run_docker_command(["stop", container_id])
+    # The daemon waits out the grace period before answering, so allow for more than the default timeout
+    success, output = api_request("POST", f"/containers/{quote_path(container_id)}/stop", timeout=None)
+    inspect_cache.invalidate("container", container_id)
     if success:
         logger.info(f"Container {container_id} stopped successfully")
     else:
@@ -119,17 +200,109 @@ def remove_container(container_id: str, force: bool = False) -> bool:
     Returns:
         bool: True if the container was successfully removed, False otherwise.
     """
-    command = ["rm", container_id]
-    if force:
-        command.insert(1, "-f")
-    
-    success, output = run_docker_command(command)
+    success, output = api_request("DELETE", f"/containers/{quote_path(container_id)}", params={"force": force})
+    inspect_cache.invalidate("container", container_id)
     if success:
         logger.info(f"Container {container_id} removed successfully")
     else:
         logger.error(f"Failed to remove container {container_id}")
     return success
 
+def _container_operation(container_id: str, method: str, path: str, params: Optional[dict] = None,
+                         timeout: Optional[float] = DEFAULT_TIMEOUT) -> Tuple[str, str]:
+    """
+    Run one container operation for a bulk action and classify its outcome.
+
+    Returns:
+        Tuple[str, str]: The outcome (SUCCEEDED, FAILED or TIMED_OUT) and the error message, if any.
+    """
+    try:
+        get_client().request_json(method, path.format(quote_path(container_id)), params=params, timeout=timeout)
+        return SUCCEEDED, ""
+    except DockerAPIError as e:
+        return FAILED, e.message
+    except DockerClientError as e:
+        if isinstance(e.__cause__, TimeoutError):
+            return TIMED_OUT, str(e)
+        return FAILED, str(e)
+    finally:
+        inspect_cache.invalidate("container", container_id)
+
+def _log_bulk_result(action: str, result: BulkResult) -> None:
+    logger.info(f"{action} {len(result.succeeded)} containers, {len(result.failed)} failed, "
+                f"{len(result.timed_out)} timed out")
+
+def start_containers(container_ids: List[str], max_workers: int = DEFAULT_MAX_WORKERS,
+                     on_progress: Optional[ProgressCallback] = None) -> BulkResult:
+    """
+    Start many Docker containers in parallel.
+
+    Args:
+        container_ids (List[str]): The IDs of the containers to start.
+        max_workers (int): The maximum number of containers being started at once.
+        on_progress (Optional[ProgressCallback]): Called with (container ID, outcome, error message) as each
+            container is done, from a worker thread.
+
+    Returns:
+        BulkResult: The containers that started, failed to start (with the error) and timed out.
+    """
+    result = run_bulk(container_ids, lambda container_id: _container_operation(
+        container_id, "POST", "/containers/{}/start"), max_workers, on_progress)
+    _log_bulk_result("Started", result)
+    return result
+
+def stop_containers(container_ids: List[str], grace_period: Optional[int] = None,
+                    max_workers: Optional[int] = None,
+                    on_progress: Optional[ProgressCallback] = None) -> BulkResult:
+    """
+    Stop many Docker containers in parallel.
+
+    The containers wait out their grace periods concurrently, up to MAX_STOP_WORKERS at a time,
+    so stopping a batch takes about one grace period rather than one per container. A stop
+    that gets no answer within the grace period plus DEFAULT_TIMEOUT is reported as timed out;
+    without a `grace_period`, the daemon's default of DEFAULT_STOP_GRACE_PERIOD seconds is
+    assumed, so containers configured with a longer stop timeout need an explicit one.
+
+    Args:
+        container_ids (List[str]): The IDs of the containers to stop.
+        grace_period (Optional[int]): Seconds to wait before killing each container, defaults to the container's own setting.
+        max_workers (Optional[int]): The maximum number of containers being stopped at once, defaults to all of
+            them up to MAX_STOP_WORKERS.
+        on_progress (Optional[ProgressCallback]): Called with (container ID, outcome, error message) as each
+            container is done, from a worker thread.
+
+    Returns:
+        BulkResult: The containers that stopped, failed to stop (with the error) and timed out.
+    """
+    # Leave the daemon time to kill the container once the grace period is over
+    timeout = (DEFAULT_STOP_GRACE_PERIOD if grace_period is None else grace_period) + DEFAULT_TIMEOUT
+    # Stopping is waiting, not work, so the batch is not throttled to the usual worker count
+    max_workers = max_workers or min(len(container_ids), MAX_STOP_WORKERS) or 1
+    result = run_bulk(container_ids, lambda container_id: _container_operation(
+        container_id, "POST", "/containers/{}/stop", {"t": grace_period}, timeout), max_workers, on_progress)
+    _log_bulk_result("Stopped", result)
+    return result
+
+def remove_containers(container_ids: List[str], force: bool = False, max_workers: int = DEFAULT_MAX_WORKERS,
+                      on_progress: Optional[ProgressCallback] = None) -> BulkResult:
+    """
+    Remove many Docker containers in parallel.
+
+    Args:
+        container_ids (List[str]): The IDs of the containers to remove.
+        force (bool): If True, force the removal of running containers.
+        max_workers (int): The maximum number of containers being removed at once.
+        on_progress (Optional[ProgressCallback]): Called with (container ID, outcome, error message) as each
+            container is done, from a worker thread.
+
+    Returns:
+        BulkResult: The containers that were removed, failed to be removed (with the error) and timed out.
+    """
+    result = run_bulk(container_ids, lambda container_id: _container_operation(
+        container_id, "DELETE", "/containers/{}", {"force": force}), max_workers, on_progress)
+    _log_bulk_result("Removed", result)
+    return result
+
 def get_container_logs(container_id: str, tail: Optional[int] = None) -> Optional[str]:
     """
     Get the logs of a Docker container.
@@ -141,16 +314,151 @@ def get_container_logs(container_id: str, tail: Optional[int] = None) -> Optiona
     Returns:
         Optional[str]: The container logs if successful, None otherwise.
     """
-    command = ["logs", container_id]
-    if tail is not None:
-        command.extend(["--tail", str(tail)])
-    
-    success, output = run_docker_command(command)
-    if success:
-        return output
-    else:
-        logger.error(f"Failed to get logs for container {container_id}")
+    try:
+        lines = [line.text for line in stream_container_logs(container_id, tail=tail)]
+    except DockerClientError as e:
+        logger.error(f"Failed to get logs for container {container_id}: {e}")
         return None
+    return "\n".join(lines).strip()
+
+def _to_epoch(value: Union[datetime, float, int]) -> float:
+    return value.timestamp() if isinstance(value, datetime) else value
+
+def stream_container_logs(container_id: str, follow: bool = False, timestamps: bool = False,
+                          since: Optional[Union[datetime, float]] = None,
+                          until: Optional[Union[datetime, float]] = None, tail: Optional[int] = None,
+                          on_open: Optional[Callable[[DockerStream], None]] = None) -> Iterator[LogLine]:
+    """
+    Stream the logs of a Docker container line by line as the daemon sends them.
+
+    Nothing is buffered beyond the current line, so memory use does not depend on the size of
+    the log. With `follow`, the generator keeps waiting for new output until the container
+    stops, the generator is closed, or the stream is interrupted from another thread.
+
+    Args:
+        container_id (str): The ID of the container to get logs from.
+        follow (bool): If True, keep streaming new output.
+        timestamps (bool): If True, have the daemon timestamp every line.
+        since (Optional[Union[datetime, float]]): Only return lines from this time on (datetime or epoch seconds).
+        until (Optional[Union[datetime, float]]): Only return lines before this time (datetime or epoch seconds).
+        tail (Optional[int]): If provided, start with only this number of lines from the end of the logs.
+        on_open (Optional[Callable[[DockerStream], None]]): Called with the open stream, e.g. to keep it
+            for DockerStream.interrupt().
+
+    Yields:
+        LogLine: Each line with its stream and, if requested, its timestamp.
+
+    Raises:
+        DockerAPIError: If the container does not exist.
+        DockerClientError: If the daemon cannot be reached or the stream breaks.
+    """
+    params = {
+        "stdout": True, "stderr": True, "follow": follow, "timestamps": timestamps,
+        "since": None if since is None else _to_epoch(since),
+        "until": None if until is None else _to_epoch(until),
+        "tail": tail if tail is not None else "all",
+    }
+    # Follow mode may sit idle for as long as the container is quiet
+    timeout = None if follow else DEFAULT_TIMEOUT
+    with get_client().stream("GET", f"/containers/{quote_path(container_id)}/logs",
+                             params=params, timeout=timeout) as stream:
+        if on_open is not None:
+            on_open(stream)
+        pending = {STDOUT: b"", STDERR: b""}
+        for stream_name, chunk in _iter_log_chunks(stream):
+            data = pending[stream_name] + chunk
+            *complete, pending[stream_name] = data.split(b"\n")
+            for raw in complete:
+                yield _log_line(stream_name, raw, timestamps)
+        for stream_name, raw in pending.items():
+            if raw:
+                yield _log_line(stream_name, raw, timestamps)
+
+def _iter_log_chunks(stream: DockerStream) -> Iterator[Tuple[str, bytes]]:
+    # TTY containers send plain bytes; all others send 8-byte framed stdout/stderr payloads
+    if stream.headers.get("Content-Type") == RAW_STREAM:
+        while chunk := stream.read(LOG_READ_SIZE):
+            yield STDOUT, chunk
+        return
+    while len(header := stream.read_exactly(8)) == 8:
+        stream_type, length = struct.unpack(">BxxxL", header)
+        if stream_type not in (0, 1, 2):
+            # Not a multiplexed stream after all
+            yield STDOUT, header
+            while chunk := stream.read(LOG_READ_SIZE):
+                yield STDOUT, chunk
+            return
+        yield (STDERR if stream_type == 2 else STDOUT), stream.read_exactly(length)
+
+def _log_line(stream_name: str, raw: bytes, timestamps: bool) -> LogLine:
+    text = raw.decode("utf-8", errors="replace").rstrip("\r")
+    timestamp = None
+    if timestamps:
+        stamp, _, rest = text.partition(" ")
+        try:
+            timestamp = parse_rfc3339(stamp)
+            text = rest
+        except ValueError:
+            pass
+    return LogLine(stream_name, text, timestamp)
+
+async def get_containers_async() -> List[Container]:
+    """
+    Async variant of get_containers().
+
+    Returns:
+        List[Container]: A list of Container objects.
+    """
+    return await asyncio.to_thread(get_containers)
+
+async def get_container_by_id_async(container_id: str) -> Optional[Container]:
+    """
+    Async variant of get_container_by_id().
+
+    Args:
+        container_id (str): The ID of the container to retrieve.
+
+    Returns:
+        Optional[Container]: The Container object if found, None otherwise.
+    """
+    return await asyncio.to_thread(get_container_by_id, container_id)
+
+async def start_container_async(container_id: str) -> bool:
+    """
+    Async variant of start_container().
+
+    Args:
+        container_id (str): The ID of the container to start.
+
+    Returns:
+        bool: True if the container was successfully started, False otherwise.
+    """
+    return await asyncio.to_thread(start_container, container_id)
+
+async def stop_container_async(container_id: str) -> bool:
+    """
+    Async variant of stop_container().
+
+    Args:
+        container_id (str): The ID of the container to stop.
+
+    Returns:
+        bool: True if the container was successfully stopped, False otherwise.
+    """
+    return await asyncio.to_thread(stop_container, container_id)
+
+async def remove_container_async(container_id: str, force: bool = False) -> bool:
+    """
+    Async variant of remove_container().
+
+    Args:
+        container_id (str): The ID of the container to remove.
+        force (bool): If True, force the removal of the container.
+
+    Returns:
+        bool: True if the container was successfully removed, False otherwise.
+    """
+    return await asyncio.to_thread(remove_container, container_id, force)
 
 # Example usage
 if __name__ == "__main__":
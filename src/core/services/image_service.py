@@ -1,30 +1,217 @@
-import subprocess
+import asyncio
+import base64
+import bisect
 import json
 import logging
-from typing import List, Tuple, Optional
+import os
+import subprocess
+import threading
+from typing import Callable, Dict, Iterable, List, NamedTuple, Set, Tuple, Optional, Union
 from ..models.image import Image
+from ..docker_client import DockerClientError, api_request, get_client, quote_path
+from ..inspect_cache import IMAGE_SUMMARY, inspect_cache
+from .batch import DEFAULT_CHUNK_SIZE, FAILED, SUCCEEDED, BatchInspectResult, BulkResult, batch_inspect, run_bulk
 
 # Set up logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-def run_docker_command(command: List[str]) -> Tuple[bool, str]:
+DEFAULT_REGISTRY = "https://index.docker.io/v1/"
+DEFAULT_MAX_TRANSFERS = 3
+# The digest of a layer without any files, which history reports with a size of 0
+EMPTY_LAYER = "sha256:5f70bf18a086007016e948b04aed3b82103a36bea41755b6cddfaf10ace3c6ef"
+# Dockerfile instructions that only change the image config, so their history entries have no layer
+CONFIG_INSTRUCTIONS = {"ARG", "CMD", "ENTRYPOINT", "ENV", "EXPOSE", "HEALTHCHECK", "LABEL", "MAINTAINER",
+                       "ONBUILD", "SHELL", "STOPSIGNAL", "USER", "VOLUME"}
+
+ProgressCallback = Callable[[str, str, str], None]
+
+# Progress statuses with byte counts, and those after which a layer needs nothing more
+TRANSFER_STATUSES = {"Downloading", "Pushing"}
+DONE_STATUSES = {"Pull complete", "Already exists", "Pushed", "Layer already exists"}
+
+def split_reference(image_name: str) -> Tuple[str, Optional[str]]:
+    """
+    Split an image reference into its repository and tag (or digest).
+
+    Args:
+        image_name (str): The image reference, e.g. "localhost:5000/app:1.0".
+
+    Returns:
+        Tuple[str, Optional[str]]: The repository and the tag or digest, None if the reference has neither.
+    """
+    if '@' in image_name:
+        repository, _, digest = image_name.partition('@')
+        return repository, digest
+    repository, _, tag = image_name.rpartition(':')
+    if not repository or '/' in tag:
+        return image_name, None
+    return repository, tag
+
+def registry_for(image_name: str) -> str:
+    """
+    Get the registry an image reference resolves to, as keyed in the docker config file.
+
+    Args:
+        image_name (str): The image reference.
+
+    Returns:
+        str: The registry host, or the Docker Hub index address.
+    """
+    first, _, rest = image_name.partition('/')
+    if rest and ('.' in first or ':' in first or first == "localhost"):
+        return first
+    return DEFAULT_REGISTRY
+
+def registry_auth_header(image_name: str) -> str:
     """
-    Execute a Docker command using subprocess.
+    Build the X-Registry-Auth header value for an image's registry from the docker config file
+    (inline `auths` entries and credential helpers), falling back to anonymous access.
 
     Args:
-        command (List[str]): The Docker command to execute.
+        image_name (str): The image reference.
 
     Returns:
-        Tuple[bool, str]: A tuple containing a boolean indicating success and the output string.
+        str: The base64url-encoded auth configuration.
     """
+    registry = registry_for(image_name)
+    auth = {}
+    config_path = os.path.join(os.environ.get("DOCKER_CONFIG", os.path.expanduser("~/.docker")), "config.json")
     try:
-        result = subprocess.run(["docker"] + command, capture_output=True, text=True, check=True)
-        return True, result.stdout.strip()
-    except subprocess.CalledProcessError as e:
-        error_message = f"Error executing Docker command: {e.stderr.strip()}"
-        logger.error(error_message)
-        return False, error_message
+        with open(config_path) as config_file:
+            config = json.load(config_file)
+    except (OSError, ValueError):
+        config = {}
+
+    helper = (config.get("credHelpers") or {}).get(registry) or config.get("credsStore")
+    entry = (config.get("auths") or {}).get(registry) or {}
+    if entry.get("auth"):
+        username, _, password = base64.b64decode(entry["auth"]).decode("utf-8").partition(':')
+        auth = {"username": username, "password": password, "serveraddress": registry}
+    elif helper:
+        try:
+            result = subprocess.run([f"docker-credential-{helper}", "get"], input=registry,
+                                    capture_output=True, text=True, check=True)
+            credentials = json.loads(result.stdout)
+            auth = {"username": credentials["Username"], "password": credentials["Secret"],
+                    "serveraddress": registry}
+        except (OSError, subprocess.CalledProcessError, ValueError, KeyError) as e:
+            logger.warning(f"No credentials for {registry} from helper {helper}: {e}")
+    return base64.urlsafe_b64encode(json.dumps(auth).encode("utf-8")).decode("ascii")
+
+class LayerProgress(NamedTuple):
+    """
+    One progress message of a pull or push. Messages about the image as a whole have no layer.
+    """
+    image: str
+    layer: str
+    status: str
+    current: int
+    total: int
+
+class TransferTotals(NamedTuple):
+    """
+    The aggregate progress of the pulls or pushes a LayerTracker has seen, with shared layers counted once.
+    """
+    layers_done: int
+    layers_total: int
+    bytes_done: int
+    bytes_total: int
+
+class _LayerState:
+    __slots__ = ("status", "current", "total", "images")
+
+    def __init__(self):
+        self.status = ""
+        self.current = 0
+        self.total = 0
+        self.images: Set[str] = set()
+
+class LayerTracker:
+    """
+    Folds the progress messages of concurrent pulls or pushes into one state per layer.
+
+    Images that share a layer report it under the same ID; the daemon transfers it only once
+    (the other images show it as waiting or already present), so the tracker keeps a single
+    state for it and counts its bytes once in totals(). Thread-safe.
+    """
+
+    def __init__(self):
+        self._layers: Dict[str, _LayerState] = {}
+        self._lock = threading.Lock()
+
+    def update(self, event: LayerProgress) -> None:
+        if not event.layer:
+            return
+        with self._lock:
+            layer = self._layers.get(event.layer)
+            if layer is None:
+                layer = self._layers[event.layer] = _LayerState()
+            layer.images.add(event.image)
+            if layer.status in DONE_STATUSES or layer.status.startswith("Mounted from"):
+                # Another image finished this layer first; later "waiting" messages change nothing
+                return
+            layer.status = event.status
+            if event.status in TRANSFER_STATUSES and event.total:
+                layer.current, layer.total = event.current, event.total
+            elif event.status in DONE_STATUSES:
+                layer.current = layer.total
+
+    def layer(self, layer_id: str) -> Optional[Tuple[str, int, int]]:
+        """
+        Get the status, bytes done and byte total of a layer, or None if it has not been seen.
+        """
+        with self._lock:
+            layer = self._layers.get(layer_id)
+            return None if layer is None else (layer.status, layer.current, layer.total)
+
+    def shared_layers(self) -> Dict[str, Set[str]]:
+        """
+        Get the layers that more than one image has reported, with the images that share them.
+        """
+        with self._lock:
+            return {layer_id: set(layer.images) for layer_id, layer in self._layers.items() if len(layer.images) > 1}
+
+    def totals(self) -> TransferTotals:
+        with self._lock:
+            layers = list(self._layers.values())
+        done = [layer for layer in layers if layer.status in DONE_STATUSES or layer.status.startswith("Mounted from")]
+        return TransferTotals(len(done), len(layers), sum(layer.current for layer in layers),
+                              sum(layer.total for layer in layers))
+
+def stream_progress(path: str, params: dict, image_name: str,
+                    on_progress: Optional[Callable[[LayerProgress], None]] = None) -> Tuple[bool, str]:
+    """
+    Run a pull or push request, handing on its progress messages as they arrive.
+
+    Args:
+        path (str): The API path.
+        params (dict): The query parameters.
+        image_name (str): The image reference, used for registry auth and in the progress events.
+        on_progress (Optional[Callable[[LayerProgress], None]]): Called with every progress message.
+
+    Returns:
+        Tuple[bool, str]: A tuple containing a boolean indicating success and an error message (empty on success).
+    """
+    headers = {"X-Registry-Auth": registry_auth_header(image_name)}
+    try:
+        with get_client().stream("POST", path, params=params, headers=headers) as stream:
+            for message in stream.iter_json():
+                if not isinstance(message, dict):
+                    continue
+                # The daemon reports failures inside the stream, with a 200 status
+                if message.get("error"):
+                    return False, message["error"]
+                status = message.get("status")
+                if on_progress is not None and status:
+                    detail = message.get("progressDetail") or {}
+                    # "Pulling from <repository>" carries the tag as its ID
+                    layer = "" if status.startswith("Pulling from") else message.get("id", "")
+                    on_progress(LayerProgress(image_name, layer, status, detail.get("current", 0),
+                                              detail.get("total", 0)))
+    except DockerClientError as e:
+        return False, str(e)
+    return True, ""
 
 def get_images() -> List[Image]:
     """
@@ -33,21 +220,19 @@ def get_images() -> List[Image]:
     Returns:
         List[Image]: A list of Image objects.
     """
-    success, output = run_docker_command(["images", "--format", "{{json .}}"])
+    success, output = api_request("GET", "/images/json")
     if not success:
         logger.error("Failed to get images")
         return []
 
     images = []
-    for line in output.split('\n'):
-        if line:
-            try:
-                image_data = json.loads(line)
-                images.append(Image.from_dict(image_data))
-            except json.JSONDecodeError as e:
-                logger.error(f"Failed to parse image data: {e}")
-            except KeyError as e:
-                logger.error(f"Missing key in image data: {e}")
+    for image_data in output:
+        try:
+            # Like `docker images`, list one row per tag
+            for reference in image_data.get('RepoTags') or ["<none>:<none>"]:
+                images.append(Image.from_api(image_data, reference))
+        except KeyError as e:
+            logger.error(f"Missing key in image data: {e}")
     return images
 
 def get_image_by_id(image_id: str) -> Optional[Image]:
@@ -60,37 +245,230 @@ def get_image_by_id(image_id: str) -> Optional[Image]:
     Returns:
         Optional[Image]: The Image object if found, None otherwise.
     """
-    success, output = run_docker_command(["inspect", "--format", "{{json .}}", image_id])
-    if not success:
-        logger.error(f"Failed to get image with ID {image_id}")
+    image_data = _inspect_image(image_id)
+    if image_data is None:
         return None
 
     try:
-        image_data = json.loads(output)
-        return Image.from_dict(image_data)
-    except json.JSONDecodeError as e:
-        logger.error(f"Failed to parse image data: {e}")
+        return Image.from_api(image_data)
     except KeyError as e:
         logger.error(f"Missing key in image data: {e}")
     return None
 
-def pull_image(image_name: str) -> bool:
+def get_image_rows(image_id: str) -> Optional[List[Image]]:
+    """
+    Get one Image per tag of a specific image, the way get_images() lists it.
+
+    Args:
+        image_id (str): The ID or reference of the image to retrieve.
+
+    Returns:
+        Optional[List[Image]]: The image's rows if found, None otherwise.
+    """
+    image_data = _inspect_image(image_id)
+    if image_data is None:
+        return None
+
+    try:
+        return [Image.from_api(image_data, reference) for reference in image_data.get('RepoTags') or ["<none>:<none>"]]
+    except KeyError as e:
+        logger.error(f"Missing key in image data: {e}")
+    return None
+
+def _inspect_image(image_id: str) -> Optional[dict]:
+    """
+    Get the inspect payload of an image through the inspect cache.
+
+    Args:
+        image_id (str): The ID or reference of the image.
+
+    Returns:
+        Optional[dict]: The inspect payload if found, None otherwise.
+    """
+    def fetch() -> Optional[dict]:
+        success, output = api_request("GET", f"/images/{quote_path(image_id)}/json")
+        if not success:
+            logger.error(f"Failed to get image with ID {image_id}")
+            return None
+        return output
+
+    return inspect_cache.get_or_fetch("image", image_id, fetch)
+
+def get_image_layers(image_id: str) -> Optional[List[Tuple[str, int]]]:
+    """
+    Get the layers of an image, base layer first, with their sizes.
+
+    The layer digests come from the image's inspect payload (`RootFS.Layers`) and the sizes
+    from its history, whose entries that added a layer match the layers one for one, oldest
+    first. An entry added a layer unless it only changed the config (ENV, CMD, ...), so a layer
+    of 0 bytes still takes its place.
+
+    Args:
+        image_id (str): The ID or reference of the image.
+
+    Returns:
+        Optional[List[Tuple[str, int]]]: The (layer digest, size in bytes) pairs if found, None otherwise.
+    """
+    image_data = _inspect_image(image_id)
+    if image_data is None:
+        return None
+    success, history = api_request("GET", f"/images/{quote_path(image_id)}/history")
+    if not success:
+        logger.error(f"Failed to get history of image {image_id}")
+        return None
+
+    digests = (image_data.get('RootFS') or {}).get('Layers') or []
+    # History is newest first
+    sizes = [entry.get('Size', 0) for entry in reversed(history) if _adds_layer(entry)]
+    if len(sizes) != len(digests):
+        logger.warning(f"History of image {image_id} has {len(sizes)} layers but the image has {len(digests)}; "
+                       "layer sizes may be off")
+    sizes += [0] * (len(digests) - len(sizes))
+    return [(digest, 0 if digest == EMPTY_LAYER else size) for digest, size in zip(digests, sizes)]
+
+def _adds_layer(entry: dict) -> bool:
+    """
+    Tell whether a history entry added a layer to the image.
+    """
+    if entry.get('Size', 0) > 0:
+        return True
+    # "/bin/sh -c #(nop)  ENV ..." from the classic builder, "ENV ..." from BuildKit
+    created_by = (entry.get('CreatedBy') or '').rsplit('#(nop)', 1)[-1].split()
+    return bool(created_by) and created_by[0].upper() not in CONFIG_INSTRUCTIONS
+
+def inspect_images(image_ids: List[str], chunk_size: int = DEFAULT_CHUNK_SIZE) -> BatchInspectResult:
+    """
+    Get many images at once.
+
+    The image list endpoint cannot filter by ID, so every image is listed once and the IDs,
+    ID prefixes, tags and digests are looked up in that listing. Only references it does not
+    cover (e.g. spelled with the registry name) are inspected one by one. As with the daemon,
+    an empty or ambiguous ID prefix is an error.
+
+    Args:
+        image_ids (List[str]): The IDs (or prefixes of them) or references of the images.
+        chunk_size (int): The maximum number of IDs per chunk.
+
+    Returns:
+        BatchInspectResult: The Image objects keyed by requested ID, and an error for every ID that could not be retrieved.
+    """
+    listing: List[_ImageListing] = []
+
+    def fetch_chunk(chunk: List[str]) -> Tuple[bool, object]:
+        if not listing:
+            success, output = api_request("GET", "/images/json", params={"all": True})
+            if not success:
+                return False, output
+            listing.append(_ImageListing(output))
+        return _inspect_image_chunk(chunk, listing[0])
+
+    # The listing's summaries lack what the inspect payload has (RootFS, ...), so they are cached apart
+    return batch_inspect("image", image_ids, fetch_chunk, Image.from_api, chunk_size, cache_kind=IMAGE_SUMMARY)
+
+class _ImageListing:
+    """
+    The image summaries of one `GET /images/json?all=1`, looked up by ID, ID prefix, tag or digest.
+    """
+
+    def __init__(self, images: List[dict]):
+        self.by_reference: Dict[str, dict] = {}
+        self.by_id: Dict[str, dict] = {}
+        for image_data in images:
+            self.by_id[image_data['Id'].split(':', 1)[-1]] = image_data
+            for reference in (image_data.get('RepoTags') or []) + (image_data.get('RepoDigests') or []):
+                self.by_reference[reference] = image_data
+        self.ids = sorted(self.by_id)
+
+    def find(self, key: str) -> Union[dict, str, None]:
+        """
+        Find an image.
+
+        Returns:
+            Union[dict, str, None]: The summary, an error message if the key is empty or an ambiguous
+            prefix, or None if the listing does not know the key.
+        """
+        image_id = key.split(':', 1)[-1] if key.startswith("sha256:") else key
+        if not image_id:
+            return f"Invalid image ID: {key!r}"
+        if image_id in self.by_id:
+            return self.by_id[image_id]
+        reference = key if ":" in key.rsplit("/", 1)[-1] or "@" in key else f"{key}:latest"
+        if reference in self.by_reference:
+            return self.by_reference[reference]
+        position = bisect.bisect_left(self.ids, image_id)
+        # The IDs are sorted, so any IDs the prefix matches come right there; two are enough to tell
+        matches = [candidate for candidate in self.ids[position:position + 2] if candidate.startswith(image_id)]
+        if len(matches) > 1:
+            return f"Ambiguous image ID prefix {key}: it matches more than one image"
+        return self.by_id[matches[0]] if matches else None
+
+def _inspect_image_chunk(image_ids: List[str], listing: _ImageListing) -> Tuple[bool, object]:
+    """
+    Fetch the payloads of a chunk of images.
+
+    Args:
+        image_ids (List[str]): The IDs (or prefixes of them) or references of the images.
+        listing (_ImageListing): Every image, listed once for the whole batch.
+
+    Returns:
+        Tuple[bool, object]: A tuple containing a boolean indicating success and either the payloads (or an
+        error message) keyed by requested ID or the error message.
+    """
+    payloads = {}
+    for image_id in image_ids:
+        found = listing.find(image_id)
+        if found is None:
+            success, found = api_request("GET", f"/images/{quote_path(image_id)}/json")
+            if not success:
+                continue
+        payloads[image_id] = found
+    return True, payloads
+
+def pull_image(image_name: str, on_progress: Optional[Callable[[LayerProgress], None]] = None) -> bool:
     """
     Pull a Docker image from a registry.
 
     Args:
         image_name (str): The name of the image to pull.
+        on_progress (Optional[Callable[[LayerProgress], None]]): Called with every progress message as it arrives.
 
     Returns:
         bool: True if the image was successfully pulled, False otherwise.
     """
-    success, output = run_docker_command(["pull", image_name])
+    success, error = _pull(image_name, on_progress)
     if success:
         logger.info(f"Image {image_name} pulled successfully")
     else:
-        logger.error(f"Failed to pull image {image_name}")
+        logger.error(f"Failed to pull image {image_name}: {error}")
     return success
 
+def pull_images(image_names: Iterable[str], max_workers: int = DEFAULT_MAX_TRANSFERS,
+                on_progress: Optional[Callable[[LayerProgress], None]] = None,
+                on_done: Optional[ProgressCallback] = None) -> BulkResult:
+    """
+    Pull many images, `max_workers` at a time.
+
+    Layers shared between the images are downloaded once by the daemon; feed the progress
+    events into a LayerTracker to follow them without counting shared layers twice.
+
+    Args:
+        image_names (Iterable[str]): The images to pull; duplicates are pulled once.
+        max_workers (int): The maximum number of pulls in flight at once.
+        on_progress (Optional[Callable[[LayerProgress], None]]): Called with every progress message, from worker threads.
+        on_done (Optional[ProgressCallback]): Called with (image, outcome, error message) as each pull completes.
+
+    Returns:
+        BulkResult: The images that were pulled and those that failed, with their errors.
+    """
+    return _transfer_images(image_names, _pull, "pull", max_workers, on_progress, on_done)
+
+def _pull(image_name: str, on_progress: Optional[Callable[[LayerProgress], None]]) -> Tuple[bool, str]:
+    repository, tag = split_reference(image_name)
+    result = stream_progress("/images/create", {"fromImage": repository, "tag": tag or "latest"},
+                             image_name, on_progress)
+    inspect_cache.invalidate("image", image_name)
+    return result
+
 def remove_image(image_id: str, force: bool = False) -> bool:
     """
     Remove a Docker image.
@@ -102,11 +480,8 @@ def remove_image(image_id: str, force: bool = False) -> bool:
     Returns:
         bool: True if the image was successfully removed, False otherwise.
     """
-    command = ["rmi", image_id]
-    if force:
-        command.insert(1, "-f")
-    
-    success, output = run_docker_command(command)
+    success, output = api_request("DELETE", f"/images/{quote_path(image_id)}", params={"force": force})
+    inspect_cache.invalidate("image", image_id)
     if success:
         logger.info(f"Image {image_id} removed successfully")
     else:
@@ -124,28 +499,101 @@ def tag_image(image_id: str, new_tag: str) -> bool:
     Returns:
         bool: True if the image was successfully tagged, False otherwise.
     """
-    success, output = run_docker_command(["tag", image_id, new_tag])
+    repository, tag = split_reference(new_tag)
+    success, output = api_request("POST", f"/images/{quote_path(image_id)}/tag",
+                                  params={"repo": repository, "tag": tag or "latest"})
+    inspect_cache.invalidate("image", image_id)
+    inspect_cache.invalidate("image", new_tag)
     if success:
         logger.info(f"Image {image_id} tagged as {new_tag} successfully")
     else:
         logger.error(f"Failed to tag image {image_id} as {new_tag}")
     return success
 
-def push_image(image_name: str) -> bool:
+def push_image(image_name: str, on_progress: Optional[Callable[[LayerProgress], None]] = None) -> bool:
     """
     Push a Docker image to a registry.
 
     Args:
         image_name (str): The name of the image to push.
+        on_progress (Optional[Callable[[LayerProgress], None]]): Called with every progress message as it arrives.
 
     Returns:
         bool: True if the image was successfully pushed, False otherwise.
     """
-    success, output = run_docker_command(["push", image_name])
+    success, error = _push(image_name, on_progress)
     if success:
         logger.info(f"Image {image_name} pushed successfully")
     else:
-        logger.error(f"Failed to push image {image_name}")
+        logger.error(f"Failed to push image {image_name}: {error}")
     return success
 
+def push_images(image_names: Iterable[str], max_workers: int = DEFAULT_MAX_TRANSFERS,
+                on_progress: Optional[Callable[[LayerProgress], None]] = None,
+                on_done: Optional[ProgressCallback] = None) -> BulkResult:
+    """
+    Push many images, `max_workers` at a time.
+
+    Args:
+        image_names (Iterable[str]): The images to push; duplicates are pushed once.
+        max_workers (int): The maximum number of pushes in flight at once.
+        on_progress (Optional[Callable[[LayerProgress], None]]): Called with every progress message, from worker threads.
+        on_done (Optional[ProgressCallback]): Called with (image, outcome, error message) as each push completes.
+
+    Returns:
+        BulkResult: The images that were pushed and those that failed, with their errors.
+    """
+    return _transfer_images(image_names, _push, "push", max_workers, on_progress, on_done)
+
+def _push(image_name: str, on_progress: Optional[Callable[[LayerProgress], None]]) -> Tuple[bool, str]:
+    repository, tag = split_reference(image_name)
+    return stream_progress(f"/images/{quote_path(repository)}/push", {"tag": tag}, image_name, on_progress)
+
+def _transfer_images(image_names: Iterable[str],
+                     transfer: Callable[[str, Optional[Callable[[LayerProgress], None]]], Tuple[bool, str]],
+                     verb: str, max_workers: int, on_progress: Optional[Callable[[LayerProgress], None]],
+                     on_done: Optional[ProgressCallback]) -> BulkResult:
+    def operation(image_name: str) -> Tuple[str, str]:
+        success, error = transfer(image_name, on_progress)
+        return (SUCCEEDED, "") if success else (FAILED, error)
+
+    result = run_bulk(image_names, operation, max_workers=max_workers, on_progress=on_done)
+    if result.failed:
+        logger.error(f"Failed to {verb} {len(result.failed)} of {len(result.succeeded) + len(result.failed)} images")
+    return result
+
+async def get_images_async() -> List[Image]:
+    """
+    Async variant of get_images().
+
+    Returns:
+        List[Image]: A list of Image objects.
+    """
+    return await asyncio.to_thread(get_images)
+
+async def get_image_by_id_async(image_id: str) -> Optional[Image]:
+    """
+    Async variant of get_image_by_id().
+
+    Args:
+        image_id (str): The ID of the image to retrieve.
+
+    Returns:
+        Optional[Image]: The Image object if found, None otherwise.
+    """
+    return await asyncio.to_thread(get_image_by_id, image_id)
+
+async def remove_image_async(image_id: str, force: bool = False) -> bool:
+    """
+    Async variant of remove_image().
+
+    Args:
+        image_id (str): The ID of the image to remove.
+        force (bool): If True, force the removal of the image.
+
+    Returns:
+        bool: True if the image was successfully removed, False otherwise.
+    """
+    return await asyncio.to_thread(remove_image, image_id, force)
+
 # Add more image-related functions as needed
\ No newline at end of file
@@ -1,30 +1,17 @@
-import subprocess
-import json
+import asyncio
 import logging
-from typing import List, Tuple, Optional
+from typing import Callable, Iterable, List, Tuple, Optional
 from ..models.network import Network
+from ..docker_client import DockerAPIError, DockerClientError, api_request, get_client, quote_path
+from ..inspect_cache import NETWORK_SUMMARY, inspect_cache
+from .batch import (DEFAULT_CHUNK_SIZE, DEFAULT_MAX_WORKERS, FAILED, SUCCEEDED, BatchInspectResult, BulkResult,
+                    batch_inspect, match_id, run_bulk)
 
 # Set up logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-def run_docker_command(command: List[str]) -> Tuple[bool, str]:
-    """
-    Execute a Docker command using subprocess.
-
-    Args:
-        command (List[str]): The Docker command to execute.
-
-    Returns:
-        Tuple[bool, str]: A tuple containing a boolean indicating success and the output string.
-    """
-    try:
-        result = subprocess.run(["docker"] + command, capture_output=True, text=True, check=True)
-        return True, result.stdout.strip()
-    except subprocess.CalledProcessError as e:
-        error_message = f"Error executing Docker command: {e.stderr.strip()}"
-        logger.error(error_message)
-        return False, error_message
+ProgressCallback = Callable[[str, str, str], None]
 
 def get_networks() -> List[Network]:
     """
@@ -33,21 +20,17 @@ def get_networks() -> List[Network]:
     Returns:
         List[Network]: A list of Network objects.
     """
-    success, output = run_docker_command(["network", "ls", "--format", "{{json .}}"])
+    success, output = api_request("GET", "/networks")
     if not success:
         logger.error("Failed to get networks")
         return []
 
     networks = []
-    for line in output.split('\n'):
-        if line:
-            try:
-                network_data = json.loads(line)
-                networks.append(Network.from_dict(network_data))
-            except json.JSONDecodeError as e:
-                logger.error(f"Failed to parse network data: {e}")
-            except KeyError as e:
-                logger.error(f"Missing key in network data: {e}")
+    for network_data in output:
+        try:
+            networks.append(Network.from_api(network_data))
+        except KeyError as e:
+            logger.error(f"Missing key in network data: {e}")
     return networks
 
 def get_network_by_id(network_id: str) -> Optional[Network]:
@@ -60,22 +43,69 @@ def get_network_by_id(network_id: str) -> Optional[Network]:
     Returns:
         Optional[Network]: The Network object if found, None otherwise.
     """
-    success, output = run_docker_command(["network", "inspect", "--format", "{{json .}}", network_id])
-    if not success:
-        logger.error(f"Failed to get network with ID {network_id}")
+    def fetch() -> Optional[dict]:
+        success, output = api_request("GET", f"/networks/{quote_path(network_id)}")
+        if not success:
+            logger.error(f"Failed to get network with ID {network_id}")
+            return None
+        return output
+
+    network_data = inspect_cache.get_or_fetch("network", network_id, fetch)
+    if network_data is None:
         return None
 
     try:
-        network_data = json.loads(output)
-        return Network.from_dict(network_data[0])  # network inspect returns a list
-    except json.JSONDecodeError as e:
-        logger.error(f"Failed to parse network data: {e}")
+        return Network.from_api(network_data)
     except KeyError as e:
         logger.error(f"Missing key in network data: {e}")
-    except IndexError:
-        logger.error(f"No network data returned for ID {network_id}")
     return None
 
+def inspect_networks(network_ids: List[str], chunk_size: int = DEFAULT_CHUNK_SIZE) -> BatchInspectResult:
+    """
+    Get many networks at once, with one request per chunk of IDs.
+
+    Args:
+        network_ids (List[str]): The IDs (or prefixes of them) or names of the networks.
+        chunk_size (int): The maximum number of IDs per request.
+
+    Returns:
+        BatchInspectResult: The Network objects keyed by requested ID, and an error for every ID that could not be retrieved.
+    """
+    # Listed networks lack their Containers, so they are cached apart from inspect payloads
+    return batch_inspect("network", network_ids, _inspect_network_chunk, Network.from_api, chunk_size,
+                         cache_kind=NETWORK_SUMMARY)
+
+def _inspect_network_chunk(network_ids: List[str]) -> Tuple[bool, object]:
+    """
+    Fetch the payloads of a chunk of networks, matching IDs first and names second.
+
+    Args:
+        network_ids (List[str]): The IDs (or prefixes of them) or names of the networks.
+
+    Returns:
+        Tuple[bool, object]: A tuple containing a boolean indicating success and either the payloads keyed by
+        requested ID or the error message.
+    """
+    success, output = api_request("GET", "/networks", params={"filters": {"id": network_ids}})
+    if not success:
+        return False, output
+    payloads = {}
+    for network_id in network_ids:
+        for network_data in output:
+            if match_id(network_id, network_data['Id']):
+                payloads[network_id] = network_data
+                break
+
+    names = [network_id for network_id in network_ids if network_id not in payloads]
+    if names:
+        # The name filter matches substrings, so keep exact matches only
+        success, output = api_request("GET", "/networks", params={"filters": {"name": names}})
+        if not success:
+            return False, output
+        payloads.update((network_data['Name'], network_data) for network_data in output
+                        if network_data.get('Name') in names)
+    return True, payloads
+
 def create_network(name: str, driver: str = "bridge", options: Optional[dict] = None) -> bool:
     """
     Create a new Docker network.
@@ -88,13 +118,8 @@ def create_network(name: str, driver: str = "bridge", options: Optional[dict] =
     Returns:
         bool: True if the network was successfully created, False otherwise.
     """
-    command = ["network", "create", "--driver", driver]
-    if options:
-        for key, value in options.items():
-            command.extend(["--opt", f"{key}={value}"])
-    command.append(name)
-
-    success, output = run_docker_command(command)
+    body = {"Name": name, "Driver": driver, "Options": {key: str(value) for key, value in (options or {}).items()}}
+    success, output = api_request("POST", "/networks/create", body=body)
     if success:
         logger.info(f"Network {name} created successfully")
     else:
@@ -111,7 +136,8 @@ def remove_network(network_id: str) -> bool:
     Returns:
         bool: True if the network was successfully removed, False otherwise.
     """
-    success, output = run_docker_command(["network", "rm", network_id])
+    success, output = api_request("DELETE", f"/networks/{quote_path(network_id)}")
+    inspect_cache.invalidate("network", network_id)
     if success:
         logger.info(f"Network {network_id} removed successfully")
     else:
@@ -129,7 +155,10 @@ def connect_container_to_network(container_id: str, network_id: str) -> bool:
     Returns:
         bool: True if the container was successfully connected, False otherwise.
     """
-    success, output = run_docker_command(["network", "connect", network_id, container_id])
+    success, output = api_request("POST", f"/networks/{quote_path(network_id)}/connect",
+                                  body={"Container": container_id})
+    inspect_cache.invalidate("network", network_id)
+    inspect_cache.invalidate("container", container_id)
     if success:
         logger.info(f"Container {container_id} connected to network {network_id} successfully")
     else:
@@ -147,13 +176,93 @@ def disconnect_container_from_network(container_id: str, network_id: str) -> boo
     Returns:
         bool: True if the container was successfully disconnected, False otherwise.
     """
-    success, output = run_docker_command(["network", "disconnect", network_id, container_id])
+    success, output = api_request("POST", f"/networks/{quote_path(network_id)}/disconnect",
+                                  body={"Container": container_id})
+    inspect_cache.invalidate("network", network_id)
+    inspect_cache.invalidate("container", container_id)
     if success:
         logger.info(f"Container {container_id} disconnected from network {network_id} successfully")
     else:
         logger.error(f"Failed to disconnect container {container_id} from network {network_id}")
     return success
 
+def pair_key(container_id: str, network_id: str) -> str:
+    """
+    Get the key of a (container, network) pair in the results of connect_many() and disconnect_many().
+    """
+    # Neither container nor network names may contain a slash
+    return f"{container_id}/{network_id}"
+
+def split_pair_key(key: str) -> Tuple[str, str]:
+    """
+    Get the container and network of a pair_key().
+    """
+    container_id, _, network_id = key.partition("/")
+    return container_id, network_id
+
+def _endpoint_operation(key: str, action: str, body: dict) -> Tuple[str, str]:
+    """
+    Connect or disconnect one container for a bulk action and classify its outcome.
+
+    Returns:
+        Tuple[str, str]: The outcome (SUCCEEDED or FAILED) and the error message, if any.
+    """
+    container_id, network_id = split_pair_key(key)
+    try:
+        get_client().request_json("POST", f"/networks/{quote_path(network_id)}/{action}",
+                                  body=dict(body, Container=container_id))
+        return SUCCEEDED, ""
+    except DockerAPIError as e:
+        return FAILED, e.message
+    except DockerClientError as e:
+        return FAILED, str(e)
+    finally:
+        inspect_cache.invalidate("network", network_id)
+        inspect_cache.invalidate("container", container_id)
+
+def connect_many(pairs: Iterable[Tuple[str, str]], aliases: Optional[List[str]] = None,
+                 max_workers: int = DEFAULT_MAX_WORKERS,
+                 on_progress: Optional[ProgressCallback] = None) -> BulkResult:
+    """
+    Connect many containers to networks in parallel.
+
+    Args:
+        pairs (Iterable[Tuple[str, str]]): The (container, network) pairs to connect, by ID or name.
+        aliases (Optional[List[str]]): Extra DNS names of every container on the network it is connected to.
+        max_workers (int): The maximum number of connections in flight at once.
+        on_progress (Optional[ProgressCallback]): Called with (pair key, outcome, error message) as each
+            pair is done, from a worker thread.
+
+    Returns:
+        BulkResult: The pairs, by pair_key(), that were connected and those that failed, with their errors.
+    """
+    body = {"EndpointConfig": {"Aliases": aliases}} if aliases else {}
+    result = run_bulk([pair_key(*pair) for pair in pairs],
+                      lambda key: _endpoint_operation(key, "connect", body), max_workers, on_progress)
+    logger.info(f"Connected {len(result.succeeded)} containers to networks, {len(result.failed)} failed")
+    return result
+
+def disconnect_many(pairs: Iterable[Tuple[str, str]], force: bool = False,
+                    max_workers: int = DEFAULT_MAX_WORKERS,
+                    on_progress: Optional[ProgressCallback] = None) -> BulkResult:
+    """
+    Disconnect many containers from networks in parallel.
+
+    Args:
+        pairs (Iterable[Tuple[str, str]]): The (container, network) pairs to disconnect, by ID or name.
+        force (bool): If True, disconnect containers even if the daemon cannot reach them.
+        max_workers (int): The maximum number of disconnections in flight at once.
+        on_progress (Optional[ProgressCallback]): Called with (pair key, outcome, error message) as each
+            pair is done, from a worker thread.
+
+    Returns:
+        BulkResult: The pairs, by pair_key(), that were disconnected and those that failed, with their errors.
+    """
+    result = run_bulk([pair_key(*pair) for pair in pairs],
+                      lambda key: _endpoint_operation(key, "disconnect", {"Force": force}), max_workers, on_progress)
+    logger.info(f"Disconnected {len(result.succeeded)} containers from networks, {len(result.failed)} failed")
+    return result
+
 def prune_networks() -> bool:
     """
     Remove all unused networks.
@@ -161,11 +270,45 @@ def prune_networks() -> bool:
     Returns:
         bool: True if unused networks were successfully removed, False otherwise.
     """
-    success, output = run_docker_command(["network", "prune", "-f"])
+    success, output = api_request("POST", "/networks/prune")
+    inspect_cache.invalidate("network")
     if success:
         logger.info("Unused networks pruned successfully")
     else:
         logger.error("Failed to prune unused networks")
     return success
 
+async def get_networks_async() -> List[Network]:
+    """
+    Async variant of get_networks().
+
+    Returns:
+        List[Network]: A list of Network objects.
+    """
+    return await asyncio.to_thread(get_networks)
+
+async def get_network_by_id_async(network_id: str) -> Optional[Network]:
+    """
+    Async variant of get_network_by_id().
+
+    Args:
+        network_id (str): The ID of the network to retrieve.
+
+    Returns:
+        Optional[Network]: The Network object if found, None otherwise.
+    """
+    return await asyncio.to_thread(get_network_by_id, network_id)
+
+async def remove_network_async(network_id: str) -> bool:
+    """
+    Async variant of remove_network().
+
+    Args:
+        network_id (str): The ID of the network to remove.
+
+    Returns:
+        bool: True if the network was successfully removed, False otherwise.
+    """
+    return await asyncio.to_thread(remove_network, network_id)
+
 # Add more network-related functions as needed
\ No newline at end of file
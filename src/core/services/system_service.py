@@ -0,0 +1,85 @@
+import asyncio
+import logging
+from typing import Awaitable, List, NamedTuple, Optional, TypeVar
+from ..disk_usage import DiskUsage, disk_usage_index
+from ..models.container import Container
+from ..models.image import Image
+from ..models.network import Network
+from ..models.volume import Volume
+from .container_service import get_containers_async
+from .image_service import get_images_async
+from .network_service import get_networks_async
+from .volume_service import get_volumes_async
+
+# Set up logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+DEFAULT_MAX_CONCURRENCY = 4
+
+class SystemSnapshot(NamedTuple):
+    """
+    Every container, image, volume and network, fetched together.
+    """
+    containers: List[Container]
+    images: List[Image]
+    volumes: List[Volume]
+    networks: List[Network]
+
+async def _bounded(semaphore: asyncio.Semaphore, awaitable: Awaitable[T]) -> T:
+    async with semaphore:
+        return await awaitable
+
+async def fetch_all(max_concurrency: int = DEFAULT_MAX_CONCURRENCY) -> SystemSnapshot:
+    """
+    Fetch all four resource kinds concurrently.
+
+    The async service functions run their blocking requests on worker threads over the pooled
+    client, so the snapshot costs about as much as the slowest single listing rather than the
+    sum of all four.
+
+    Args:
+        max_concurrency (int): The maximum number of requests in flight at once.
+
+    Returns:
+        SystemSnapshot: The containers, images, volumes and networks.
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+    containers, images, volumes, networks = await asyncio.gather(
+        _bounded(semaphore, get_containers_async()),
+        _bounded(semaphore, get_images_async()),
+        _bounded(semaphore, get_volumes_async()),
+        _bounded(semaphore, get_networks_async()),
+    )
+    return SystemSnapshot(containers, images, volumes, networks)
+
+def get_system_snapshot(max_concurrency: int = DEFAULT_MAX_CONCURRENCY) -> SystemSnapshot:
+    """
+    Blocking wrapper around fetch_all() for callers without an event loop.
+
+    Args:
+        max_concurrency (int): The maximum number of requests in flight at once.
+
+    Returns:
+        SystemSnapshot: The containers, images, volumes and networks.
+    """
+    return asyncio.run(fetch_all(max_concurrency))
+
+def get_disk_usage(max_age: Optional[float] = None) -> Optional[DiskUsage]:
+    """
+    Get the disk usage of volumes, images, containers and the build cache, like `docker system df -v`.
+
+    The report comes from the shared index and is only taken again once it is older than
+    `max_age` (by default the index's refresh interval).
+
+    Args:
+        max_age (Optional[float]): The oldest acceptable report in seconds; 0 forces a new report.
+
+    Returns:
+        Optional[DiskUsage]: The indexed report, or None if none could be taken.
+    """
+    return disk_usage_index.get(max_age)
+
+# Add more system-wide functions as needed
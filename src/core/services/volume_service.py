@@ -1,30 +1,33 @@
-import subprocess
+import asyncio
+import hashlib
 import json
 import logging
-from typing import List, Tuple, Optional
+import os
+import tarfile
+import threading
+import time
+from typing import BinaryIO, Callable, Dict, Iterator, List, NamedTuple, Tuple, Optional
 from ..models.volume import Volume
+from ..disk_usage import disk_usage_index
+from ..docker_client import DockerClientError, DockerStream, api_request, get_client, quote_path
+from ..inspect_cache import inspect_cache
+from .batch import DEFAULT_CHUNK_SIZE, BatchInspectResult, batch_inspect
+from .container_service import stream_container_logs
+from .image_service import pull_image
+from src.utils.compression import BackgroundReader, compress_blocks, decompress_stream, detect_codec, get_codec
+from src.utils.docker_utils import format_size
+from src.utils.tar_stream import END_OF_ARCHIVE, TarCancelled, repack_tar, tar_file
 
 # Set up logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-def run_docker_command(command: List[str]) -> Tuple[bool, str]:
-    """
-    Execute a Docker command using subprocess.
-
-    Args:
-        command (List[str]): The Docker command to execute.
-
-    Returns:
-        Tuple[bool, str]: A tuple containing a boolean indicating success and the output string.
-    """
-    try:
-        result = subprocess.run(["docker"] + command, capture_output=True, text=True, check=True)
-        return True, result.stdout.strip()
-    except subprocess.CalledProcessError as e:
-        error_message = f"Error executing Docker command: {e.stderr.strip()}"
-        logger.error(error_message)
-        return False, error_message
+HELPER_IMAGE = "alpine"
+# Present in a copy destination until the copy has finished
+COPY_MARKER = ".docky-copy-incomplete"
+# The last member of a backup archive
+BACKUP_MANIFEST = ".docky-backup.json"
+BACKUP_FORMAT = 1
 
 def get_volumes() -> List[Volume]:
     """
@@ -33,21 +36,17 @@ def get_volumes() -> List[Volume]:
     Returns:
         List[Volume]: A list of Volume objects.
     """
-    success, output = run_docker_command(["volume", "ls", "--format", "{{json .}}"])
+    success, output = api_request("GET", "/volumes")
     if not success:
         logger.error("Failed to get volumes")
         return []
 
     volumes = []
-    for line in output.split('\n'):
-        if line:
-            try:
-                volume_data = json.loads(line)
-                volumes.append(Volume.from_dict(volume_data))
-            except json.JSONDecodeError as e:
-                logger.error(f"Failed to parse volume data: {e}")
-            except KeyError as e:
-                logger.error(f"Missing key in volume data: {e}")
+    for volume_data in output.get('Volumes') or []:
+        try:
+            volumes.append(Volume.from_api(volume_data))
+        except KeyError as e:
+            logger.error(f"Missing key in volume data: {e}")
     return volumes
 
 def get_volume_by_name(volume_name: str) -> Optional[Volume]:
@@ -60,22 +59,55 @@ def get_volume_by_name(volume_name: str) -> Optional[Volume]:
     Returns:
         Optional[Volume]: The Volume object if found, None otherwise.
     """
-    success, output = run_docker_command(["volume", "inspect", "--format", "{{json .}}", volume_name])
-    if not success:
-        logger.error(f"Failed to get volume with name {volume_name}")
+    def fetch() -> Optional[dict]:
+        success, output = api_request("GET", f"/volumes/{quote_path(volume_name)}")
+        if not success:
+            logger.error(f"Failed to get volume with name {volume_name}")
+            return None
+        return output
+
+    volume_data = inspect_cache.get_or_fetch("volume", volume_name, fetch)
+    if volume_data is None:
         return None
 
     try:
-        volume_data = json.loads(output)
-        return Volume.from_dict(volume_data[0])  # volume inspect returns a list
-    except json.JSONDecodeError as e:
-        logger.error(f"Failed to parse volume data: {e}")
+        return Volume.from_api(volume_data)
     except KeyError as e:
         logger.error(f"Missing key in volume data: {e}")
-    except IndexError:
-        logger.error(f"No volume data returned for name {volume_name}")
     return None
 
+def inspect_volumes(volume_names: List[str], chunk_size: int = DEFAULT_CHUNK_SIZE) -> BatchInspectResult:
+    """
+    Get many volumes at once, with one request per chunk of names.
+
+    Args:
+        volume_names (List[str]): The names of the volumes.
+        chunk_size (int): The maximum number of names per request.
+
+    Returns:
+        BatchInspectResult: The Volume objects keyed by name, and an error for every name that could not be retrieved.
+    """
+    return batch_inspect("volume", volume_names, _inspect_volume_chunk, Volume.from_api, chunk_size)
+
+def _inspect_volume_chunk(volume_names: List[str]) -> Tuple[bool, object]:
+    """
+    Fetch the payloads of a chunk of volumes.
+
+    Args:
+        volume_names (List[str]): The names of the volumes.
+
+    Returns:
+        Tuple[bool, object]: A tuple containing a boolean indicating success and either the payloads keyed by
+        name or the error message.
+    """
+    # The name filter matches substrings, so keep exact matches only
+    success, output = api_request("GET", "/volumes", params={"filters": {"name": volume_names}})
+    if not success:
+        return False, output
+    wanted = set(volume_names)
+    return True, {volume_data['Name']: volume_data for volume_data in output.get('Volumes') or []
+                  if volume_data.get('Name') in wanted}
+
 def create_volume(name: str, driver: str = "local", options: Optional[dict] = None) -> bool:
     """
     Create a new Docker volume.
@@ -88,13 +120,8 @@ def create_volume(name: str, driver: str = "local", options: Optional[dict] = No
     Returns:
         bool: True if the volume was successfully created, False otherwise.
     """
-    command = ["volume", "create", "--driver", driver]
-    if options:
-        for key, value in options.items():
-            command.extend(["--opt", f"{key}={value}"])
-    command.append(name)
-
-    success, output = run_docker_command(command)
+    body = {"Name": name, "Driver": driver, "DriverOpts": {key: str(value) for key, value in (options or {}).items()}}
+    success, output = api_request("POST", "/volumes/create", body=body)
     if success:
         logger.info(f"Volume {name} created successfully")
     else:
@@ -112,13 +139,10 @@ def remove_volume(volume_name: str, force: bool = False) -> bool:
     Returns:
         bool: True if the volume was successfully removed, False otherwise.
     """
-    command = ["volume", "rm"]
-    if force:
-        command.append("-f")
-    command.append(volume_name)
-
-    success, output = run_docker_command(command)
+    success, output = api_request("DELETE", f"/volumes/{quote_path(volume_name)}", params={"force": force})
+    inspect_cache.invalidate("volume", volume_name)
     if success:
+        disk_usage_index.invalidate()
         logger.info(f"Volume {volume_name} removed successfully")
     else:
         logger.error(f"Failed to remove volume {volume_name}")
@@ -131,8 +155,10 @@ def prune_volumes() -> bool:
     Returns:
         bool: True if unused volumes were successfully removed, False otherwise.
     """
-    success, output = run_docker_command(["volume", "prune", "-f"])
+    success, output = api_request("POST", "/volumes/prune")
+    inspect_cache.invalidate("volume")
     if success:
+        disk_usage_index.invalidate()
         logger.info("Unused volumes pruned successfully")
     else:
         logger.error("Failed to prune unused volumes")
@@ -142,54 +168,434 @@ def get_volume_usage(volume_name: str) -> Optional[str]:
     """
     Get the disk usage of a specific volume.
 
+    Sizes come from the shared `system df` index, so asking for many volumes costs one disk
+    usage report per refresh interval rather than one per volume.
+
     Args:
         volume_name (str): The name of the volume to check.
 
     Returns:
         Optional[str]: The disk usage of the volume if successful, None otherwise.
     """
-    success, output = run_docker_command(["system", "df", "-v", "--format", "{{json .}}", "--filter", f"type=volume"])
-    if not success:
+    usage = disk_usage_index.get()
+    if usage is None:
         logger.error(f"Failed to get volume usage for {volume_name}")
         return None
 
-    try:
-        for line in output.split('\n'):
-            data = json.loads(line)
-            if data.get('Name') == volume_name:
-                return data.get('Size')
-    except json.JSONDecodeError as e:
-        logger.error(f"Failed to parse volume usage data: {e}")
-    except KeyError as e:
-        logger.error(f"Missing key in volume usage data: {e}")
+    volume = usage.volumes.get(volume_name)
+    if volume is None:
+        logger.error(f"Volume {volume_name} not found in usage data")
+        return None
+    return volume.size
 
-    logger.error(f"Volume {volume_name} not found in usage data")
-    return None
+class CopyProgress(NamedTuple):
+    """
+    How far a volume copy has got. The totals only count the files that need copying.
+    """
+    files_done: int
+    files_total: int
+    bytes_done: int
+    bytes_total: int
+
+class _ProgressCounter:
+    """
+    Counts the files and bytes passed on by repack_tar() and reports them as CopyProgress.
+    """
 
-def copy_volume(source_volume: str, destination_volume: str) -> bool:
+    def __init__(self, files_total: int = 0, bytes_total: int = 0,
+                 on_progress: Optional[Callable[[CopyProgress], None]] = None):
+        self.files_done = 0
+        self.files_total = files_total
+        self.bytes_done = 0
+        self.bytes_total = bytes_total
+        self.on_progress = on_progress
+        self._written: Dict[str, int] = {}
+
+    def __call__(self, member: tarfile.TarInfo, size: int) -> None:
+        if not member.isreg():
+            return
+        done = self._written[member.name] = self._written.get(member.name, 0) + size
+        self.bytes_done += size
+        if done == member.size:
+            self.files_done += 1
+        if self.on_progress is not None:
+            self.on_progress(CopyProgress(self.files_done, self.files_total, self.bytes_done, self.bytes_total))
+
+class FileStat(NamedTuple):
+    size: int
+    mtime: int
+
+class VolumeManifest(NamedTuple):
+    """
+    The regular files of a source and a destination volume, keyed by path relative to the volume root.
+    """
+    source: Dict[str, FileStat]
+    destination: Dict[str, FileStat]
+
+    @property
+    def interrupted(self) -> bool:
+        # An earlier copy into the destination did not finish
+        return COPY_MARKER in self.destination
+
+def copy_volume(source_volume: str, destination_volume: str, incremental: bool = False,
+                on_progress: Optional[Callable[[CopyProgress], None]] = None,
+                cancel: Optional[threading.Event] = None) -> bool:
     """
     Copy the contents of one volume to another.
 
+    The source is streamed out of the daemon as a tar archive and straight back into the
+    destination, without running a copy inside a container or holding more than one chunk in
+    memory. With `incremental`, files whose size and modification time already match in the
+    destination are left out of the stream, so re-syncing only transfers what changed.
+
+    The destination holds a marker file while the copy is in progress; it is removed only once
+    everything has been written, so an interrupted or cancelled copy is reported as such by
+    the next copy into the same volume (an incremental copy then picks up where it stopped).
+
     Args:
         source_volume (str): The name of the source volume.
         destination_volume (str): The name of the destination volume.
+        incremental (bool): If True, skip files whose size and modification time match.
+        on_progress (Optional[Callable[[CopyProgress], None]]): Called as data is written.
+        cancel (Optional[threading.Event]): Set from another thread to stop the copy.
 
     Returns:
         bool: True if the volume was successfully copied, False otherwise.
     """
-    # This operation requires creating a temporary container
-    command = [
-        "run", "--rm", 
-        "-v", f"{source_volume}:/from", 
-        "-v", f"{destination_volume}:/to", 
-        "alpine", "ash", "-c", "cp -av /from/. /to"
-    ]
-    
-    success, output = run_docker_command(command)
+    success, manifest = get_volume_manifest(source_volume, destination_volume)
+    if not success:
+        logger.error(f"Failed to copy volume {source_volume} to {destination_volume}: {manifest}")
+        return False
+    if manifest.interrupted:
+        logger.warning(f"An earlier copy into volume {destination_volume} did not finish")
+
+    skipped = set()
+    if incremental:
+        skipped = {name for name, stat in manifest.source.items() if manifest.destination.get(name) == stat}
+    pending = {name: stat for name, stat in manifest.source.items() if name not in skipped}
+    if incremental and not pending and not manifest.interrupted:
+        logger.info(f"Volume {destination_volume} is already up to date with {source_volume}")
+        return True
+
+    progress = _ProgressCounter(len(pending), sum(stat.size for stat in pending.values()), on_progress)
+
+    def keep(member: tarfile.TarInfo) -> bool:
+        return not ((member.isreg() or member.islnk()) and member.name in skipped)
+
+    binds = [f"{source_volume}:/from:ro", f"{destination_volume}:/to"]
+    # Never started until the data is in place; its only job is to drop the marker afterwards
+    success, container_id = create_helper_container(["rm", "-f", f"/to/{COPY_MARKER}"], binds)
+    if not success:
+        logger.error(f"Failed to copy volume {source_volume} to {destination_volume}: {container_id}")
+        return False
+    try:
+        client = get_client()
+        archive_path = f"/containers/{container_id}/archive"
+        with client.stream("GET", archive_path, params={"path": "/from"}) as source:
+            body = repack_tar(source, keep, root="from", prefix=tar_file(COPY_MARKER, b"", time.time()),
+                              on_data=progress, cancelled=cancel.is_set if cancel is not None else None)
+            with client.stream("PUT", archive_path, params={"path": "/to"}, body=body,
+                               headers={"Content-Type": "application/x-tar"}):
+                pass
+        success, output = run_to_completion(container_id)
+    except TarCancelled:
+        logger.warning(f"Copy of volume {source_volume} to {destination_volume} cancelled after "
+                       f"{progress.files_done}/{progress.files_total} files; the destination is incomplete")
+        return False
+    except (DockerClientError, tarfile.TarError) as e:
+        success, output = False, str(e)
+    finally:
+        api_request("DELETE", f"/containers/{container_id}", params={"force": True})
+
     if success:
-        logger.info(f"Volume {source_volume} copied to {destination_volume} successfully")
+        logger.info(f"Volume {source_volume} copied to {destination_volume} successfully "
+                    f"({progress.files_done} files, {len(skipped)} unchanged)")
     else:
-        logger.error(f"Failed to copy volume {source_volume} to {destination_volume}")
+        logger.error(f"Failed to copy volume {source_volume} to {destination_volume}: {output}")
     return success
 
+def backup_volume(volume_name: str, path: str, compression: str = "gzip",
+                  on_progress: Optional[Callable[[CopyProgress], None]] = None,
+                  cancel: Optional[threading.Event] = None, max_workers: Optional[int] = None) -> bool:
+    """
+    Back up the contents of a volume to a compressed tar archive on the local disk.
+
+    The volume is streamed out of the daemon and compressed block by block on a pool of
+    threads while the next blocks are still being read, then written straight to the file;
+    nothing is staged on disk first. The archive ends with a manifest member holding the
+    volume name, file and byte counts and a SHA-256 checksum of the archived contents, which
+    restore_volume() verifies. The archive is written under a temporary name and only moved
+    into place once it is complete.
+
+    Args:
+        volume_name (str): The name of the volume to back up.
+        path (str): The archive to write.
+        compression (str): The name of a registered codec, e.g. "gzip", "bz2", "xz" or "none".
+        on_progress (Optional[Callable[[CopyProgress], None]]): Called as data is archived; the totals are 0.
+        cancel (Optional[threading.Event]): Set from another thread to stop the backup.
+        max_workers (Optional[int]): The number of compression threads, defaults to the CPU count.
+
+    Returns:
+        bool: True if the volume was successfully backed up, False otherwise.
+    """
+    try:
+        codec = get_codec(compression)
+    except ValueError as e:
+        logger.error(f"Failed to back up volume {volume_name}: {e}")
+        return False
+
+    success, container_id = create_helper_container(["true"], [f"{volume_name}:/from:ro"])
+    if not success:
+        logger.error(f"Failed to back up volume {volume_name}: {container_id}")
+        return False
+
+    progress = _ProgressCounter(on_progress=on_progress)
+    digest = hashlib.sha256()
+
+    def archive(source: DockerStream) -> Iterator[bytes]:
+        for chunk in repack_tar(source, root="from", on_data=progress, terminate=False,
+                                cancelled=cancel.is_set if cancel is not None else None):
+            digest.update(chunk)
+            yield chunk
+        manifest = {
+            "format": BACKUP_FORMAT,
+            "volume": volume_name,
+            "created_at": time.time(),
+            "compression": codec.name,
+            "files": progress.files_done,
+            "bytes": progress.bytes_done,
+            "sha256": digest.hexdigest(),
+        }
+        yield tar_file(BACKUP_MANIFEST, json.dumps(manifest, indent=2).encode(), manifest["created_at"])
+        yield END_OF_ARCHIVE
+
+    partial_path = f"{path}.partial"
+    try:
+        with get_client().stream("GET", f"/containers/{container_id}/archive", params={"path": "/from"}) as source, \
+                open(partial_path, "wb") as output:
+            for block in compress_blocks(archive(source), codec, max_workers=max_workers):
+                output.write(block)
+        os.replace(partial_path, path)
+    except TarCancelled:
+        logger.warning(f"Backup of volume {volume_name} cancelled")
+        return False
+    except (DockerClientError, tarfile.TarError, OSError) as e:
+        logger.error(f"Failed to back up volume {volume_name}: {e}")
+        return False
+    finally:
+        if os.path.exists(partial_path):
+            os.remove(partial_path)
+        api_request("DELETE", f"/containers/{container_id}", params={"force": True})
+
+    logger.info(f"Volume {volume_name} backed up to {path} ({progress.files_done} files, "
+                f"{format_size(progress.bytes_done)})")
+    return True
+
+def restore_volume(path: str, volume_name: str, on_progress: Optional[Callable[[CopyProgress], None]] = None,
+                   cancel: Optional[threading.Event] = None) -> bool:
+    """
+    Restore a volume from an archive written by backup_volume().
+
+    The compression is detected from the file. The file is read and decompressed on a
+    background thread while the contents are streamed into the volume, and the checksum is
+    computed on the way. Like copy_volume(), the volume holds a marker file until the
+    restore is complete and the checksum has matched; a failed or corrupt restore leaves it
+    in place.
+
+    Args:
+        path (str): The archive to restore from.
+        volume_name (str): The name of the volume to restore into; it is created if it does not exist.
+        on_progress (Optional[Callable[[CopyProgress], None]]): Called as data is restored.
+        cancel (Optional[threading.Event]): Set from another thread to stop the restore.
+
+    Returns:
+        bool: True if the volume was successfully restored, False otherwise.
+    """
+    try:
+        file = open(path, "rb")
+    except OSError as e:
+        logger.error(f"Failed to restore volume {volume_name}: {e}")
+        return False
+
+    manifest: Dict[str, object] = {}
+    progress = _ProgressCounter(on_progress=on_progress)
+    digest = hashlib.sha256()
+
+    def keep(member: tarfile.TarInfo) -> bool:
+        return member.name != BACKUP_MANIFEST
+
+    def on_dropped(member: tarfile.TarInfo, data: Optional[BinaryIO]) -> None:
+        if member.name == BACKUP_MANIFEST and data is not None:
+            manifest.update(json.load(data))
+
+    def contents(source: BackgroundReader) -> Iterator[bytes]:
+        yield tar_file(COPY_MARKER, b"", time.time())
+        for chunk in repack_tar(source, keep, on_data=progress, on_dropped=on_dropped, terminate=False,
+                                cancelled=cancel.is_set if cancel is not None else None):
+            digest.update(chunk)
+            yield chunk
+        yield END_OF_ARCHIVE
+
+    with file:
+        codec = detect_codec(file.peek(16)[:16])
+        success, container_id = create_helper_container(["rm", "-f", f"/to/{COPY_MARKER}"],
+                                                        [f"{volume_name}:/to"])
+        if not success:
+            logger.error(f"Failed to restore volume {volume_name}: {container_id}")
+            return False
+        source = BackgroundReader(decompress_stream(file.read, codec))
+        try:
+            with get_client().stream("PUT", f"/containers/{container_id}/archive", params={"path": "/to"},
+                                     body=contents(source), headers={"Content-Type": "application/x-tar"}):
+                pass
+            if manifest.get("format") != BACKUP_FORMAT:
+                success, output = False, f"{path} has no backup manifest"
+            elif manifest.get("sha256") != digest.hexdigest():
+                success, output = False, f"Checksum mismatch, {path} is corrupt"
+            else:
+                success, output = run_to_completion(container_id)
+        except TarCancelled:
+            logger.warning(f"Restore of volume {volume_name} cancelled; the volume is incomplete")
+            return False
+        except (DockerClientError, tarfile.TarError, EOFError, OSError, ValueError) as e:
+            success, output = False, str(e)
+        finally:
+            source.close()
+            api_request("DELETE", f"/containers/{container_id}", params={"force": True})
+
+    if success:
+        logger.info(f"Volume {volume_name} restored from {path} ({progress.files_done} files)")
+    else:
+        logger.error(f"Failed to restore volume {volume_name} from {path}: {output}")
+    return success
+
+def get_volume_manifest(source_volume: str, destination_volume: str) -> Tuple[bool, object]:
+    """
+    List the regular files of two volumes with their sizes and modification times.
+
+    Both volumes are listed by one short-lived helper container.
+
+    Args:
+        source_volume (str): The name of the source volume.
+        destination_volume (str): The name of the destination volume.
+
+    Returns:
+        Tuple[bool, object]: A tuple containing a boolean indicating success and either the VolumeManifest
+        or the error message.
+    """
+    command = ["find", "/from", "/to", "-type", "f", "-exec", "stat", "-c", "%s %Y %n", "{}", "+"]
+    success, container_id = create_helper_container(command, [f"{source_volume}:/from:ro",
+                                                              f"{destination_volume}:/to:ro"])
+    if not success:
+        return False, container_id
+    try:
+        success, output = run_to_completion(container_id)
+        if not success:
+            return False, output
+        manifest = VolumeManifest({}, {})
+        for line in stream_container_logs(container_id):
+            size, mtime, path = line.text.split(" ", 2)
+            side, _, name = path[1:].partition("/")
+            files = manifest.source if side == "from" else manifest.destination
+            files[name] = FileStat(int(size), int(mtime))
+        return True, manifest
+    except (DockerClientError, ValueError) as e:
+        return False, f"Failed to list volume files: {e}"
+    finally:
+        api_request("DELETE", f"/containers/{container_id}", params={"force": True})
+
+def create_helper_container(command: List[str], binds: List[str]) -> Tuple[bool, str]:
+    """
+    Create (but do not start) a helper container, pulling the helper image if needed.
+
+    Args:
+        command (List[str]): The command to run in the helper image.
+        binds (List[str]): The volume binds, e.g. ["data:/from"].
+
+    Returns:
+        Tuple[bool, str]: A tuple containing a boolean indicating success and the container ID or error message.
+    """
+    config = {"Image": HELPER_IMAGE, "Cmd": command, "HostConfig": {"Binds": binds}}
+    success, output = api_request("POST", "/containers/create", body=config)
+    if not success and "No such image" in output and pull_image(HELPER_IMAGE):
+        success, output = api_request("POST", "/containers/create", body=config)
+    if not success:
+        return False, output
+    return True, output['Id']
+
+def run_to_completion(container_id: str) -> Tuple[bool, str]:
+    """
+    Start a created container and wait for it to exit successfully.
+
+    Args:
+        container_id (str): The ID of the container.
+
+    Returns:
+        Tuple[bool, str]: A tuple containing a boolean indicating success and the container ID or error message.
+    """
+    success, output = api_request("POST", f"/containers/{container_id}/start")
+    if not success:
+        return False, output
+    success, output = api_request("POST", f"/containers/{container_id}/wait", timeout=None)
+    if not success:
+        return False, output
+    if output.get('StatusCode') != 0:
+        error_message = f"Helper container exited with status {output.get('StatusCode')}"
+        logger.error(error_message)
+        return False, error_message
+    return True, container_id
+
+def run_helper_container(command: List[str], binds: List[str]) -> Tuple[bool, str]:
+    """
+    Run a throwaway helper container to completion and remove it, like `docker run --rm`.
+
+    Args:
+        command (List[str]): The command to run in the helper image.
+        binds (List[str]): The volume binds, e.g. ["data:/from"].
+
+    Returns:
+        Tuple[bool, str]: A tuple containing a boolean indicating success and the container ID or error message.
+    """
+    success, container_id = create_helper_container(command, binds)
+    if not success:
+        return False, container_id
+    try:
+        return run_to_completion(container_id)
+    finally:
+        api_request("DELETE", f"/containers/{container_id}", params={"force": True})
+
+async def get_volumes_async() -> List[Volume]:
+    """
+    Async variant of get_volumes().
+
+    Returns:
+        List[Volume]: A list of Volume objects.
+    """
+    return await asyncio.to_thread(get_volumes)
+
+async def get_volume_by_name_async(volume_name: str) -> Optional[Volume]:
+    """
+    Async variant of get_volume_by_name().
+
+    Args:
+        volume_name (str): The name of the volume to retrieve.
+
+    Returns:
+        Optional[Volume]: The Volume object if found, None otherwise.
+    """
+    return await asyncio.to_thread(get_volume_by_name, volume_name)
+
+async def remove_volume_async(volume_name: str, force: bool = False) -> bool:
+    """
+    Async variant of remove_volume().
+
+    Args:
+        volume_name (str): The name of the volume to remove.
+        force (bool): If True, force the removal of the volume.
+
+    Returns:
+        bool: True if the volume was successfully removed, False otherwise.
+    """
+    return await asyncio.to_thread(remove_volume, volume_name, force)
+
 # Add more volume-related functions as needed
\ No newline at end of file
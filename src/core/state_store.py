@@ -0,0 +1,409 @@
+# src/core/state_store.py
+
+import logging
+import threading
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional
+
+from .docker_client import DockerAPIError, DockerClient, DockerClientError, get_client, quote_path
+from .inspect_cache import inspect_cache
+from .models.container import Container
+from .models.image import Image
+from .models.network import Network
+from .models.volume import Volume
+
+# Set up logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+CONTAINER = "container"
+IMAGE = "image"
+VOLUME = "volume"
+NETWORK = "network"
+KINDS = (CONTAINER, IMAGE, VOLUME, NETWORK)
+
+UPSERT = "upsert"
+REMOVE = "remove"
+RESET = "reset"
+
+# Events after which the object is gone for good
+REMOVE_ACTIONS = {
+    CONTAINER: {"destroy"},
+    IMAGE: {"delete"},
+    VOLUME: {"destroy"},
+    NETWORK: {"destroy"},
+}
+
+# Events that do not change anything the list views show
+IGNORED_ACTIONS = {
+    CONTAINER: {"attach", "detach", "resize", "top", "exec_create", "exec_start", "exec_detach", "exec_die",
+                "archive-path", "extract-to-dir", "copy", "export", "commit"},
+    IMAGE: {"save", "push"},
+    VOLUME: {"mount", "unmount"},
+}
+
+# Network events that change a container's networks rather than the network itself
+ENDPOINT_ACTIONS = {"connect", "disconnect"}
+
+
+class StoreChange(NamedTuple):
+    """
+    A change notification published by the StateStore.
+
+    `action` is UPSERT (the resource was added or updated), REMOVE (the resource is gone)
+    or RESET (the whole kind was reloaded; `key` and `resource` are None).
+    """
+    kind: str
+    action: str
+    key: Optional[str]
+    resource: Any
+
+
+class ResourceSource(NamedTuple):
+    """
+    How the StateStore loads one kind of resource.
+
+    `snapshot` returns every resource keyed by ID (or name for volumes), `fetch` reloads a
+    single resource by key and returns None if it no longer exists, and `key` gives the key
+    of a fetched resource. Both raise DockerClientError if the daemon cannot tell, so that a
+    failed request is never mistaken for an empty inventory or a removed object.
+    """
+    snapshot: Callable[[], Dict[str, Any]]
+    fetch: Callable[[str], Any]
+    key: Callable[[Any], str]
+
+
+def _get(path: str, params: Optional[Dict[str, Any]] = None) -> Any:
+    """
+    Fetch a payload, or None if the daemon answers that it does not exist.
+
+    Raises:
+        DockerClientError: If the daemon cannot be reached or answers with another error.
+    """
+    try:
+        return get_client().request_json("GET", path, params=params)
+    except DockerAPIError as e:
+        if e.status == 404:
+            return None
+        raise
+
+
+def _build(kind: str, build: Callable[[dict], Any], data: dict) -> Any:
+    try:
+        return build(data)
+    except KeyError as e:
+        logger.error(f"Missing key in {kind} data: {e}")
+        return None
+
+
+def _image_rows(data: dict) -> List[Image]:
+    # Like `docker images`, one row per tag
+    return [Image.from_api(data, reference) for reference in data.get('RepoTags') or ["<none>:<none>"]]
+
+
+def _snapshot(kind: str, path: str, build: Callable[[dict], Any], key: Callable[[Any], str],
+              params: Optional[Dict[str, Any]] = None,
+              items: Callable[[Any], List[dict]] = lambda output: output) -> Dict[str, Any]:
+    resources = {}
+    for data in items(_get(path, params) or []):
+        resource = _build(kind, build, data)
+        if resource:
+            resources[key(resource)] = resource
+    return resources
+
+
+def _fetch_container(key: str) -> Optional[Container]:
+    # The list endpoint returns the summary shape Container is built from; the id filter matches prefixes
+    output = _get("/containers/json", {"all": True, "filters": {"id": [key]}})
+    return _build(CONTAINER, Container.from_api, output[0]) if output else None
+
+
+def _fetch(kind: str, path: str, build: Callable[[dict], Any]) -> Callable[[str], Any]:
+    def fetch(key: str) -> Any:
+        data = _get(path.format(quote_path(key)))
+        return None if data is None else _build(kind, build, data)
+    return fetch
+
+
+# The sources talk to the client directly rather than through the service layer, whose
+# functions log failures and return nothing
+DEFAULT_SOURCES = {
+    CONTAINER: ResourceSource(
+        snapshot=lambda: _snapshot(CONTAINER, "/containers/json", Container.from_api,
+                                   lambda container: container.id, params={"all": True}),
+        fetch=_fetch_container,
+        key=lambda container: container.id,
+    ),
+    IMAGE: ResourceSource(
+        # Listed one row per tag; the store keys the rows by image ID
+        snapshot=lambda: _snapshot(IMAGE, "/images/json", _image_rows, lambda rows: rows[0].id),
+        fetch=_fetch(IMAGE, "/images/{}/json", _image_rows),
+        key=lambda rows: rows[0].id,
+    ),
+    VOLUME: ResourceSource(
+        snapshot=lambda: _snapshot(VOLUME, "/volumes", Volume.from_api, lambda volume: volume.name,
+                                   items=lambda output: output.get('Volumes') or []),
+        fetch=_fetch(VOLUME, "/volumes/{}", Volume.from_api),
+        key=lambda volume: volume.name,
+    ),
+    NETWORK: ResourceSource(
+        snapshot=lambda: _snapshot(NETWORK, "/networks", Network.from_api, lambda network: network.id),
+        fetch=_fetch(NETWORK, "/networks/{}", Network.from_api),
+        key=lambda network: network.id,
+    ),
+}
+
+
+class StateStore:
+    """
+    An in-memory mirror of the daemon's containers, images, volumes and networks.
+
+    The store takes one snapshot of every kind, then keeps it current by applying the daemon's
+    `/events` stream: each event reloads or drops just the object it names. Subscribers are
+    told about every change, so views never need to poll. If the event stream drops, the
+    store reconnects with exponential backoff and takes a fresh snapshot, since events may
+    have been missed in between.
+
+    Subscriber callbacks run on the store's background thread.
+    """
+
+    def __init__(self, client: Optional[DockerClient] = None,
+                 sources: Optional[Dict[str, ResourceSource]] = None,
+                 min_backoff: float = 1.0, max_backoff: float = 30.0):
+        """
+        Args:
+            client (Optional[DockerClient]): The client used for the event stream, defaults to the shared client.
+            sources (Optional[Dict[str, ResourceSource]]): How each kind is loaded, defaults to the service layer.
+            min_backoff (float): The first reconnect delay in seconds.
+            max_backoff (float): The longest reconnect delay in seconds.
+        """
+        self.client = client
+        self.sources = sources or DEFAULT_SOURCES
+        self.min_backoff = min_backoff
+        self.max_backoff = max_backoff
+        self._resources: Dict[str, Dict[str, Any]] = {kind: {} for kind in self.sources}
+        self._subscribers: List[Callable[[StoreChange], None]] = []
+        self._lock = threading.RLock()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._stream = None
+        self.synced = threading.Event()
+
+    def subscribe(self, callback: Callable[[StoreChange], None]) -> Callable[[], None]:
+        """
+        Register a callback for change notifications.
+
+        Args:
+            callback (Callable[[StoreChange], None]): Called with every StoreChange.
+
+        Returns:
+            Callable[[], None]: A function that removes the subscription.
+        """
+        with self._lock:
+            self._subscribers.append(callback)
+        return lambda: self.unsubscribe(callback)
+
+    def unsubscribe(self, callback: Callable[[StoreChange], None]) -> None:
+        """
+        Remove a callback registered with subscribe().
+        """
+        with self._lock:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+
+    def _publish(self, change: StoreChange) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for callback in subscribers:
+            try:
+                callback(change)
+            except Exception:
+                logger.exception(f"State store subscriber failed on {change.kind} {change.action}")
+
+    def get(self, kind: str, key: str) -> Any:
+        """
+        Get a resource by kind and key without touching the daemon.
+
+        Returns:
+            Any: The resource (a list of per-tag rows for images), or None if it is unknown.
+        """
+        with self._lock:
+            return self._resources[kind].get(key)
+
+    def snapshot(self, kind: str) -> Dict[str, Any]:
+        """
+        Get every known resource of a kind, keyed as by get(), without touching the daemon.
+        """
+        with self._lock:
+            return dict(self._resources[kind])
+
+    def get_containers(self) -> List[Container]:
+        """
+        Get every known container without touching the daemon.
+
+        Returns:
+            List[Container]: The current containers.
+        """
+        with self._lock:
+            return list(self._resources[CONTAINER].values())
+
+    def get_images(self) -> List[Image]:
+        """
+        Get every known image (one row per tag) without touching the daemon.
+
+        Returns:
+            List[Image]: The current images.
+        """
+        with self._lock:
+            return [row for rows in self._resources[IMAGE].values() for row in rows]
+
+    def get_volumes(self) -> List[Volume]:
+        """
+        Get every known volume without touching the daemon.
+
+        Returns:
+            List[Volume]: The current volumes.
+        """
+        with self._lock:
+            return list(self._resources[VOLUME].values())
+
+    def get_networks(self) -> List[Network]:
+        """
+        Get every known network without touching the daemon.
+
+        Returns:
+            List[Network]: The current networks.
+        """
+        with self._lock:
+            return list(self._resources[NETWORK].values())
+
+    def resync(self) -> None:
+        """
+        Replace every kind with a fresh snapshot and publish a RESET for each.
+
+        A kind whose snapshot fails keeps its previous resources.
+
+        Raises:
+            DockerClientError: If any kind could not be loaded, once the others have been.
+        """
+        # Events may have been missed, so nothing cached before now can be trusted
+        inspect_cache.clear()
+        errors = []
+        for kind, source in self.sources.items():
+            try:
+                resources = source.snapshot()
+            except DockerClientError as e:
+                logger.warning(f"Failed to load {kind}s, keeping the previous ones: {e}")
+                errors.append(f"{kind}s: {e}")
+                continue
+            with self._lock:
+                self._resources[kind] = resources
+            self._publish(StoreChange(kind, RESET, None, None))
+        if errors:
+            raise DockerClientError(f"Resync failed for {'; '.join(errors)}")
+        self.synced.set()
+
+    def apply_event(self, event: dict) -> Optional[StoreChange]:
+        """
+        Apply one daemon event as an incremental upsert or removal.
+
+        Args:
+            event (dict): A message from the `/events` stream.
+
+        Returns:
+            Optional[StoreChange]: The change that was published, or None if the event was ignored.
+        """
+        kind = event.get("Type")
+        if kind not in self.sources:
+            return None
+        # Some actions carry details after a colon, e.g. "health_status: healthy"
+        action = (event.get("Action") or "").split(":", 1)[0]
+        if action in IGNORED_ACTIONS.get(kind, ()):
+            return None
+        key = (event.get("Actor") or {}).get("ID") or event.get("id")
+        if not key:
+            return None
+        if kind == IMAGE:
+            key = key.split(":", 1)[1] if key.startswith("sha256:") else key
+
+        inspect_cache.invalidate(kind, key)
+        if kind == NETWORK and action in ENDPOINT_ACTIONS:
+            # Network models do not list their members, but the container's networks changed
+            container_id = ((event.get("Actor") or {}).get("Attributes") or {}).get("container")
+            if not container_id:
+                return None
+            return self.apply_event({"Type": CONTAINER, "Action": action, "Actor": {"ID": container_id}})
+        source = self.sources[kind]
+        try:
+            resource = None if action in REMOVE_ACTIONS.get(kind, ()) else source.fetch(key)
+        except DockerClientError as e:
+            # Only a fetch that finds nothing means the object is gone
+            logger.warning(f"Failed to reload {kind} {key} after {action}, keeping it as it was: {e}")
+            return None
+        if resource is None:
+            with self._lock:
+                if self._resources[kind].pop(key, None) is None:
+                    return None
+            change = StoreChange(kind, REMOVE, key, None)
+        else:
+            # Pull events name a reference rather than the image ID
+            key = source.key(resource)
+            with self._lock:
+                self._resources[kind][key] = resource
+            change = StoreChange(kind, UPSERT, key, resource)
+        self._publish(change)
+        return change
+
+    def replay(self, events: Iterable[dict]) -> None:
+        """
+        Apply a sequence of recorded events in order, e.g. from a saved event log.
+        """
+        for event in events:
+            self.apply_event(event)
+
+    def start(self) -> None:
+        """
+        Start following the daemon in a background thread.
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name="docky-state-store", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = 5.0) -> None:
+        """
+        Stop following the daemon and wait for the background thread to exit.
+        """
+        self._stopped.set()
+        stream = self._stream
+        if stream is not None:
+            stream.interrupt()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self) -> None:
+        delay = self.min_backoff
+        while not self._stopped.is_set():
+            client = self.client or get_client()
+            try:
+                with client.stream("GET", "/events", params={"filters": {"type": list(self.sources)}}) as stream:
+                    self._stream = stream
+                    # Snapshot only once the stream is open, so no event can fall in between
+                    self.resync()
+                    delay = self.min_backoff
+                    for event in stream.iter_json():
+                        if self._stopped.is_set():
+                            break
+                        self.apply_event(event)
+            except DockerClientError as e:
+                logger.warning(f"Docker event stream unavailable: {e}")
+            finally:
+                self._stream = None
+
+            if self._stopped.is_set():
+                break
+            self.synced.clear()
+            logger.info(f"Docker event stream dropped, resyncing in {delay:.0f}s")
+            self._stopped.wait(delay)
+            delay = min(delay * 2, self.max_backoff)
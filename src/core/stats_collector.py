@@ -0,0 +1,317 @@
+# src/core/stats_collector.py
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+from .docker_client import DockerClient, DockerClientError, get_client, quote_path
+from .state_store import StateStore
+from src.utils.ring_buffer import SeriesBuffer
+
+# Set up logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+DEFAULT_INTERVAL = 2.0
+DEFAULT_CAPACITY = 300  # 10 minutes at the default interval
+DEFAULT_MAX_WORKERS = 8
+
+# The fields of every sample, in SeriesBuffer order
+SAMPLE_FIELDS = ("time", "cpu_percent", "memory_bytes", "memory_limit", "network_rx_bytes", "network_tx_bytes",
+                 "block_read_bytes", "block_write_bytes")
+
+
+class StatsSample(NamedTuple):
+    """
+    One stats reading of a container. Network and block I/O are totals since the container started.
+    """
+    time: float
+    cpu_percent: float
+    memory_bytes: float
+    memory_limit: float
+    network_rx_bytes: float
+    network_tx_bytes: float
+    block_read_bytes: float
+    block_write_bytes: float
+
+    @property
+    def memory_percent(self) -> float:
+        return self.memory_bytes / self.memory_limit * 100.0 if self.memory_limit > 0 else 0.0
+
+
+class _CpuReading(NamedTuple):
+    total: int
+    system: int
+    online_cpus: int
+
+
+def _cpu_reading(cpu_stats: dict) -> Optional[_CpuReading]:
+    usage = cpu_stats.get('cpu_usage') or {}
+    if 'system_cpu_usage' not in cpu_stats or 'total_usage' not in usage:
+        return None
+    online = cpu_stats.get('online_cpus') or len(usage.get('percpu_usage') or []) or 1
+    return _CpuReading(usage['total_usage'], cpu_stats['system_cpu_usage'], online)
+
+
+def cpu_percent(previous: Optional[_CpuReading], current: Optional[_CpuReading]) -> float:
+    """
+    Compute CPU usage between two readings the way `docker stats` does.
+
+    Returns:
+        float: The usage in percent of one CPU (so up to 100 x the number of CPUs), 0.0 without a previous reading.
+    """
+    if previous is None or current is None:
+        return 0.0
+    cpu_delta = current.total - previous.total
+    system_delta = current.system - previous.system
+    if cpu_delta < 0 or system_delta <= 0:
+        return 0.0
+    return cpu_delta / system_delta * current.online_cpus * 100.0
+
+
+def memory_usage(memory_stats: dict) -> float:
+    """
+    Compute memory usage the way `docker stats` does: usage minus the inactive page cache.
+
+    Returns:
+        float: The memory in use in bytes.
+    """
+    usage = memory_stats.get('usage', 0)
+    stats = memory_stats.get('stats') or {}
+    # cgroup v1 reports total_inactive_file, v2 inactive_file
+    inactive = stats.get('total_inactive_file', stats.get('inactive_file', 0))
+    return float(usage - inactive if inactive < usage else usage)
+
+
+def _block_io(blkio_stats: dict) -> tuple:
+    read = write = 0
+    for entry in (blkio_stats or {}).get('io_service_bytes_recursive') or []:
+        op = entry.get('op', '').lower()
+        if op == 'read':
+            read += entry.get('value', 0)
+        elif op == 'write':
+            write += entry.get('value', 0)
+    return float(read), float(write)
+
+
+def sample_from_api(stats: dict, previous_cpu: Optional[_CpuReading], now: float) -> tuple:
+    """
+    Turn a `GET /containers/{id}/stats` payload into a sample.
+
+    Args:
+        stats (dict): The stats payload.
+        previous_cpu: The CPU reading of the container's previous sample, if any.
+        now (float): The sample time in seconds since the epoch.
+
+    Returns:
+        tuple: The StatsSample and the CPU reading to keep for the next sample.
+    """
+    current_cpu = _cpu_reading(stats.get('cpu_stats') or {})
+    # Streamed stats carry the previous reading themselves; one-shot stats do not
+    previous_cpu = previous_cpu or _cpu_reading(stats.get('precpu_stats') or {})
+    memory_stats = stats.get('memory_stats') or {}
+    networks = (stats.get('networks') or {}).values()
+    block_read, block_write = _block_io(stats.get('blkio_stats'))
+    sample = StatsSample(
+        time=now,
+        cpu_percent=cpu_percent(previous_cpu, current_cpu),
+        memory_bytes=memory_usage(memory_stats),
+        memory_limit=float(memory_stats.get('limit', 0)),
+        network_rx_bytes=float(sum(network.get('rx_bytes', 0) for network in networks)),
+        network_tx_bytes=float(sum(network.get('tx_bytes', 0) for network in networks)),
+        block_read_bytes=block_read,
+        block_write_bytes=block_write,
+    )
+    return sample, current_cpu
+
+
+class StatsCollector:
+    """
+    Collects live CPU, memory, network and block I/O stats of every running container.
+
+    A single background thread wakes up every `interval` seconds and takes one-shot stats
+    readings of all running containers in parallel over the client's keep-alive connection
+    pool, so there is no process, and no dedicated connection, per container. CPU usage is
+    computed from the difference to the container's previous reading. Each container's
+    samples go into a fixed-size SeriesBuffer; series of containers that stop running are
+    dropped.
+    """
+
+    def __init__(self, client: Optional[DockerClient] = None, store: Optional[StateStore] = None,
+                 interval: float = DEFAULT_INTERVAL, capacity: int = DEFAULT_CAPACITY,
+                 max_workers: int = DEFAULT_MAX_WORKERS, clock: Callable[[], float] = time.time):
+        """
+        Args:
+            client (Optional[DockerClient]): The client to use, defaults to the shared client.
+            store (Optional[StateStore]): Where to find the running containers; without one they are listed every tick.
+            interval (float): The time between readings in seconds.
+            capacity (int): The number of samples kept per container.
+            max_workers (int): The maximum number of readings in flight at once.
+            clock (Callable[[], float]): The wall-clock time source for sample times.
+        """
+        self.client = client
+        self.store = store
+        self.interval = interval
+        self.capacity = capacity
+        self.max_workers = max_workers
+        self.clock = clock
+        self._series: Dict[str, SeriesBuffer] = {}
+        self._cpu: Dict[str, _CpuReading] = {}
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def start(self) -> None:
+        """
+        Start collecting in a background thread.
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stopped.clear()
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="docky-stats")
+        self._thread = threading.Thread(target=self._run, name="docky-stats-collector", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = 5.0) -> None:
+        """
+        Stop collecting and wait for the background thread to exit.
+        """
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            started = time.monotonic()
+            try:
+                self.collect_once()
+            except Exception:
+                logger.exception("Failed to collect container stats")
+            self._stopped.wait(max(self.interval - (time.monotonic() - started), 0.0))
+
+    def running_container_ids(self) -> List[str]:
+        """
+        Get the IDs of the running containers.
+        """
+        if self.store is not None and self.store.synced.is_set():
+            return [container.id for container in self.store.get_containers() if container.state == "running"]
+        client = self.client or get_client()
+        try:
+            # Without all=1 the daemon lists only running containers
+            return [container['Id'] for container in client.request_json("GET", "/containers/json")]
+        except DockerClientError as e:
+            logger.debug(f"Failed to list running containers: {e}")
+            return []
+
+    def _read(self, container_id: str) -> Optional[dict]:
+        client = self.client or get_client()
+        try:
+            return client.request_json("GET", f"/containers/{quote_path(container_id)}/stats",
+                                       params={"stream": False, "one-shot": True})
+        except DockerClientError as e:
+            logger.debug(f"Failed to read stats of container {container_id}: {e}")
+            return None
+
+    def collect_once(self) -> int:
+        """
+        Take one reading of every running container.
+
+        Returns:
+            int: The number of containers sampled.
+        """
+        container_ids = self.running_container_ids()
+        if self._executor is not None:
+            payloads = list(self._executor.map(self._read, container_ids))
+        else:
+            payloads = [self._read(container_id) for container_id in container_ids]
+        now = self.clock()
+
+        sampled = 0
+        with self._lock:
+            for container_id, stats in zip(container_ids, payloads):
+                if stats is None:
+                    continue
+                sample, cpu = sample_from_api(stats, self._cpu.get(container_id), now)
+                self._cpu[container_id] = cpu
+                series = self._series.get(container_id)
+                if series is None:
+                    series = self._series[container_id] = SeriesBuffer(SAMPLE_FIELDS, self.capacity)
+                series.append(sample)
+                sampled += 1
+            # Forget containers that are no longer running
+            running = set(container_ids)
+            for container_id in [key for key in self._series if key not in running]:
+                del self._series[container_id]
+                self._cpu.pop(container_id, None)
+        return sampled
+
+    def container_ids(self) -> List[str]:
+        """
+        Get the IDs of the containers with samples.
+        """
+        with self._lock:
+            return list(self._series)
+
+    def series(self, container_id: str) -> Optional[SeriesBuffer]:
+        """
+        Get the sample buffer of a container, e.g. to read windows of several fields.
+        """
+        with self._lock:
+            return self._series.get(container_id)
+
+    def latest(self, container_id: str) -> Optional[StatsSample]:
+        """
+        Get the newest sample of a container.
+
+        Returns:
+            Optional[StatsSample]: The sample, or None if the container has none.
+        """
+        series = self.series(container_id)
+        values = series.latest() if series is not None else None
+        return StatsSample(**values) if values is not None else None
+
+    def window(self, container_id: str, field: str, seconds: Optional[float] = None) -> List[memoryview]:
+        """
+        Get the recent values of one field of a container without copying them.
+
+        Args:
+            container_id (str): The ID of the container.
+            field (str): One of SAMPLE_FIELDS.
+            seconds (Optional[float]): How far back to go; None for every kept sample.
+
+        Returns:
+            List[memoryview]: The values oldest first, in one or two segments.
+        """
+        series = self.series(container_id)
+        if series is None:
+            return []
+        return series.window(field, None if seconds is None else self.clock() - seconds)
+
+    def totals(self) -> Optional[StatsSample]:
+        """
+        Sum the newest samples of all containers, e.g. for a status bar.
+
+        Returns:
+            Optional[StatsSample]: The summed sample (memory limit is the largest single limit), or None without samples.
+        """
+        samples = [sample for sample in map(self.latest, self.container_ids()) if sample is not None]
+        if not samples:
+            return None
+        return StatsSample(
+            time=max(sample.time for sample in samples),
+            cpu_percent=sum(sample.cpu_percent for sample in samples),
+            memory_bytes=sum(sample.memory_bytes for sample in samples),
+            # Containers without a limit report the host memory
+            memory_limit=max(sample.memory_limit for sample in samples),
+            network_rx_bytes=sum(sample.network_rx_bytes for sample in samples),
+            network_tx_bytes=sum(sample.network_tx_bytes for sample in samples),
+            block_read_bytes=sum(sample.block_read_bytes for sample in samples),
+            block_write_bytes=sum(sample.block_write_bytes for sample in samples),
+        )
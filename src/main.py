@@ -1,23 +1,17 @@
+from src.utils.startup_trace import IMPORTED, WINDOW_SHOWN, startup_trace
 import sys
 from PySide6.QtWidgets import QApplication
 from ui.main_window import MainWindow
-from core.docker_engine import DockerEngineManager
 
 def main():
-
-    # Check if Docker is running
-    if not DockerEngineManager.is_docker_running():
-        print("Docker is not running. Attempting to start...")
-        success = DockerEngineManager.start_docker_engine()
-        if not success:
-            print(f"Failed to start Docker")
-            sys.exit(1)
-        print("Docker started successfully.")
-
-if __name__ == "__main__":
-    main()
-    # Create and show the main window
+    startup_trace.mark(IMPORTED)
+    # Show the window first; the engine is probed (and started if need be) in the background
+    # and its state shown in the status bar
     app = QApplication(sys.argv)
     window = MainWindow()
     window.show()
-    sys.exit(app.exec())
\ No newline at end of file
+    startup_trace.mark(WINDOW_SHOWN)
+    sys.exit(app.exec())
+
+if __name__ == "__main__":
+    main()
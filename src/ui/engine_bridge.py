@@ -0,0 +1,26 @@
+# ui/engine_bridge.py
+from PySide6.QtCore import QObject, Signal
+from src.core.engine_monitor import EngineHealth, EngineMonitor
+
+class EngineBridge(QObject):
+    """
+    Re-emits EngineMonitor pings as Qt signals, on the GUI thread.
+
+    `health_changed` carries every EngineHealth, for latency read-outs; `state_changed`
+    only fires when the engine moves between starting, up, degraded and down.
+    """
+    health_changed = Signal(object)
+    state_changed = Signal(str)
+
+    def __init__(self, monitor: EngineMonitor, parent=None):
+        super().__init__(parent)
+        self.monitor = monitor
+        self._state = monitor.state
+        unsubscribe = monitor.subscribe(self._on_health)
+        self.destroyed.connect(lambda *args: unsubscribe())
+
+    def _on_health(self, health: EngineHealth):
+        self.health_changed.emit(health)
+        if health.state != self._state:
+            self._state = health.state
+            self.state_changed.emit(health.state)
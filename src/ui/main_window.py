@@ -1,15 +1,48 @@
 # ui/main_window.py
-from PySide6.QtWidgets import QMainWindow, QHBoxLayout, QWidget, QStackedWidget
+from PySide6.QtCore import QEvent, QThreadPool, QTimer
+from PySide6.QtWidgets import QMainWindow, QHBoxLayout, QWidget, QStackedWidget, QLabel
+from .engine_bridge import EngineBridge
 from .sidebar import Sidebar
-from .views.containers.container_list_view import ContainerListView
-from .views.images.image_list_view import ImageListView
-from .views.volumes.volume_list_view import VolumeListView
+from .workers import TaskWorker
+from src.core.docker_engine import DockerEngineManager
+from src.core.engine_monitor import DOWN, EngineMonitor
+from src.core.state_store import StateStore
+from src.core.stats_collector import StatsCollector
+from src.utils.docker_utils import format_size
+from src.utils.startup_trace import ENGINE_PROBED, FIRST_PAINT, startup_trace
+
+STATS_REFRESH_MS = 2000
+
+CONTAINERS = "containers"
+IMAGES = "images"
+VOLUMES = "volumes"
+
+# The views are imported and built on first use, so startup only pays for the one on screen
+def _container_view(store):
+    from .views.containers.container_list_view import ContainerListView
+    return ContainerListView(store)
+
+def _image_view(store):
+    from .views.images.image_list_view import ImageListView
+    return ImageListView()
+
+def _volume_view(store):
+    from .views.volumes.volume_list_view import VolumeListView
+    return VolumeListView(store)
+
+VIEW_FACTORIES = {
+    CONTAINERS: _container_view,
+    IMAGES: _image_view,
+    VOLUMES: _volume_view,
+}
 
 class MainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Docker Desktop Clone")
         self.setGeometry(100, 100, 1200, 800)
+        self.views = {}
+        self.probe_worker = None
 
         # Create main layout
         main_layout = QHBoxLayout()
@@ -25,16 +58,92 @@ class MainWindow(QMainWindow):
         self.content_stack = QStackedWidget()
         main_layout.addWidget(self.content_stack)
 
-        # Add views to the stack
-        self.container_view = ContainerListView()
-        self.image_view = ImageListView()
-        self.volume_view = VolumeListView()
+        # Mirror the daemon's state in the background; views follow its change notifications
+        self.store = StateStore()
+        self.store.start()
 
-        self.content_stack.addWidget(self.container_view)
-        self.content_stack.addWidget(self.image_view)
-        self.content_stack.addWidget(self.volume_view)
+        # Sample resource usage of all running containers from one background thread
+        self.stats = StatsCollector(store=self.store)
+        self.stats.start()
+        self.engine_label = QLabel("Docker: checking...")
+        self.statusBar().addWidget(self.engine_label)
+
+        # Ping the engine in the background; while it is down, requests fail at once
+        self.engine_monitor = EngineMonitor()
+        self.engine_bridge = EngineBridge(self.engine_monitor, self)
+        self.engine_bridge.health_changed.connect(self.update_engine_health)
+        self.engine_monitor.start()
+        self.stats_label = QLabel()
+        self.statusBar().addPermanentWidget(self.stats_label)
+        self.stats_timer = QTimer(self)
+        self.stats_timer.timeout.connect(self.update_stats)
+        self.stats_timer.start(STATS_REFRESH_MS)
 
         # Connect sidebar signals
-        self.sidebar.containers_clicked.connect(lambda: self.content_stack.setCurrentWidget(self.container_view))
-        self.sidebar.images_clicked.connect(lambda: self.content_stack.setCurrentWidget(self.image_view))
-        self.sidebar.volumes_clicked.connect(lambda: self.content_stack.setCurrentWidget(self.volume_view))
\ No newline at end of file
+        self.sidebar.containers_clicked.connect(lambda: self.show_view(CONTAINERS))
+        self.sidebar.images_clicked.connect(lambda: self.show_view(IMAGES))
+        self.sidebar.volumes_clicked.connect(lambda: self.show_view(VOLUMES))
+
+        # The initial view is built once the window has painted
+        central_widget.installEventFilter(self)
+        self.probe_engine()
+
+    def eventFilter(self, watched, event):
+        if event.type() == QEvent.Paint and watched is self.centralWidget():
+            watched.removeEventFilter(self)
+            startup_trace.mark(FIRST_PAINT)
+            QTimer.singleShot(0, lambda: self.show_view(CONTAINERS))
+        return super().eventFilter(watched, event)
+
+    def show_view(self, name):
+        """
+        Switch the content area to a view, building the view the first time it is shown.
+        """
+        view = self.views.get(name)
+        if view is None:
+            view = self.views[name] = VIEW_FACTORIES[name](self.store)
+            self.content_stack.addWidget(view)
+        self.content_stack.setCurrentWidget(view)
+        return view
+
+    def probe_engine(self):
+        """
+        Check that the engine runs, starting it if need be, on a pool thread.
+        """
+        if self.probe_worker is not None:
+            return
+        self.probe_worker = TaskWorker(DockerEngineManager.ensure_docker_running)
+        self.probe_worker.signals.finished.connect(self.on_engine_probed)
+        self.probe_worker.signals.failed.connect(lambda message: self.on_engine_probed(False))
+        QThreadPool.globalInstance().start(self.probe_worker)
+
+    def on_engine_probed(self, running):
+        self.probe_worker = None
+        startup_trace.mark(ENGINE_PROBED)
+        # The engine may just have been started; the state store reconnects on its own once it is up
+        self.engine_monitor.check_now()
+
+    def update_engine_health(self, health):
+        text = f"Docker: {health.state}"
+        if health.latency is not None:
+            text += f" ({health.latency * 1000:.0f} ms, avg {health.average_latency * 1000:.0f} ms)"
+        elif health.state == DOWN:
+            text += f", retrying in {self.engine_monitor.next_delay():.0f}s"
+        self.engine_label.setText(text)
+        self.engine_label.setToolTip(health.error)
+
+    def update_stats(self):
+        totals = self.stats.totals()
+        running = len(self.stats.container_ids())
+        if totals is None:
+            self.stats_label.setText(f"{running} running")
+            return
+        self.stats_label.setText(f"{running} running | CPU {totals.cpu_percent:.1f}% | "
+                                 f"Memory {format_size(totals.memory_bytes)}")
+
+    def closeEvent(self, event):
+        self.stats_timer.stop()
+        self.stats.stop()
+        self.store.stop()
+        self.engine_monitor.stop()
+        super().closeEvent(event)
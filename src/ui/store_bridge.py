@@ -0,0 +1,21 @@
+# ui/store_bridge.py
+from PySide6.QtCore import QObject, Signal
+from src.core.state_store import StateStore, StoreChange
+
+class StoreBridge(QObject):
+    """
+    Re-emits StateStore notifications as a Qt signal.
+
+    The store publishes from its background thread; because the bridge lives on the GUI
+    thread, connected slots are invoked there through a queued connection.
+    """
+    changed = Signal(object)
+
+    def __init__(self, store: StateStore, parent=None):
+        super().__init__(parent)
+        self.store = store
+        unsubscribe = store.subscribe(self._on_change)
+        self.destroyed.connect(lambda *args: unsubscribe())
+
+    def _on_change(self, change: StoreChange):
+        self.changed.emit(change)
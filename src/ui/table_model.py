@@ -0,0 +1,183 @@
+# ui/table_model.py
+from PySide6.QtCore import QAbstractTableModel, QModelIndex, QSortFilterProxyModel, Qt
+
+class ResourceTableModel(QAbstractTableModel):
+    """
+    A table model over a compact row store for containers, images, volumes or networks.
+
+    Each resource is kept with its key, and its `to_tuple()` display row and, if the resource
+    has one, its `sort_tuple()` of typed sort keys (served as Qt.UserRole, so sizes and times
+    sort by value rather than by their display text) are built the first time a cell asks
+    for them; the view asks for the cells it paints, so only rows that are painted, sorted or
+    searched are ever materialized. Column 0 is a checkbox column whose state lives in
+    Qt.CheckStateRole data rather than in widgets.
+    """
+
+    def __init__(self, headers, key, parent=None):
+        """
+        Args:
+            headers (list): The headers of the data columns (the checkbox column is added in front).
+            key (callable): Returns the unique key (ID or name) of a resource.
+        """
+        super().__init__(parent)
+        self.headers = [""] + list(headers)
+        self.key = key
+        self._keys = []
+        self._resources = []
+        self._rows = []  # Display rows, None until first asked for
+        self._sort_rows = []  # Sort rows, likewise
+        self._index = {}  # key -> row
+        self._checked = set()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._resources)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.headers)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self.headers[section]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row, column = index.row(), index.column()
+        if column == 0:
+            if role == Qt.CheckStateRole:
+                return Qt.Checked if self._keys[row] in self._checked else Qt.Unchecked
+            return None
+        if role in (Qt.DisplayRole, Qt.ToolTipRole):
+            return self._row(row)[column - 1]
+        if role == Qt.UserRole:
+            return self._sort_row(row)[column - 1]
+        return None
+
+    def _row(self, row):
+        cells = self._rows[row]
+        if cells is None:
+            cells = self._rows[row] = self._resources[row].to_tuple()
+        return cells
+
+    def _sort_row(self, row):
+        cells = self._sort_rows[row]
+        if cells is None:
+            resource = self._resources[row]
+            cells = resource.sort_tuple() if hasattr(resource, "sort_tuple") else self._row(row)
+            self._sort_rows[row] = cells
+        return cells
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if not index.isValid() or index.column() != 0 or role != Qt.CheckStateRole:
+            return False
+        key = self._keys[index.row()]
+        if Qt.CheckState(value) == Qt.Checked:
+            self._checked.add(key)
+        else:
+            self._checked.discard(key)
+        self.dataChanged.emit(index, index, [Qt.CheckStateRole])
+        return True
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        flags = Qt.ItemIsEnabled | Qt.ItemIsSelectable
+        if index.column() == 0:
+            flags |= Qt.ItemIsUserCheckable
+        return flags
+
+    def key_at(self, row):
+        return self._keys[row]
+
+    def keys(self):
+        return list(self._keys)
+
+    def checked_keys(self):
+        """
+        Get the keys of the checked rows, in row order.
+        """
+        return [key for key in self._keys if key in self._checked]
+
+    def set_all_checked(self, checked):
+        self._checked = set(self._keys) if checked else set()
+        if self._keys:
+            self.dataChanged.emit(self.index(0, 0), self.index(len(self._keys) - 1, 0), [Qt.CheckStateRole])
+
+    def clear(self):
+        self.beginResetModel()
+        self._keys, self._resources, self._rows, self._sort_rows = [], [], [], []
+        self._index, self._checked = {}, set()
+        self.endResetModel()
+
+    def upsert_many(self, resources):
+        """
+        Update the rows of known resources in place and append the new ones in a single insert.
+        """
+        new_keys, new_resources = [], []
+        for resource in resources:
+            key = self.key(resource)
+            row = self._index.get(key)
+            if row is None:
+                self._index[key] = len(self._keys) + len(new_keys)
+                new_keys.append(key)
+                new_resources.append(resource)
+            elif row < len(self._resources):
+                self._resources[row] = resource
+                self._rows[row] = self._sort_rows[row] = None
+                self.dataChanged.emit(self.index(row, 1), self.index(row, len(self.headers) - 1))
+            else:
+                # Seen twice in the same batch
+                new_resources[row - len(self._resources)] = resource
+        if new_resources:
+            first = len(self._resources)
+            self.beginInsertRows(QModelIndex(), first, first + len(new_resources) - 1)
+            self._keys.extend(new_keys)
+            self._resources.extend(new_resources)
+            self._rows.extend([None] * len(new_resources))
+            self._sort_rows.extend([None] * len(new_resources))
+            self.endInsertRows()
+
+    def upsert(self, resource):
+        self.upsert_many([resource])
+
+    def remove(self, key):
+        row = self._index.pop(key, None)
+        if row is None:
+            return
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self._keys[row]
+        del self._resources[row]
+        del self._rows[row]
+        del self._sort_rows[row]
+        self._checked.discard(key)
+        for moved in range(row, len(self._keys)):
+            self._index[self._keys[moved]] = moved
+        self.endRemoveRows()
+
+class ResourceFilterProxy(QSortFilterProxyModel):
+    """
+    Sorts and filters a ResourceTableModel; rows sort by their typed sort keys and the filter
+    matches any displayed column, ignoring case. Rows can also be restricted to a set of
+    keys, e.g. the result of a label selector.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.allowed_keys = None
+        self.setSortRole(Qt.UserRole)
+        self.setFilterCaseSensitivity(Qt.CaseInsensitive)
+        self.setFilterKeyColumn(-1)
+        self.setSortCaseSensitivity(Qt.CaseInsensitive)
+
+    def set_allowed_keys(self, keys):
+        """
+        Show only the rows whose key is in `keys`, or every row if `keys` is None.
+        """
+        self.allowed_keys = keys
+        self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        if self.allowed_keys is not None and self.sourceModel().key_at(source_row) not in self.allowed_keys:
+            return False
+        return super().filterAcceptsRow(source_row, source_parent)
@@ -1,55 +1,183 @@
 # ui/views/containers/container_list_view.py
-from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel, QTableWidget, QTableWidgetItem, QHeaderView, QCheckBox
-from PySide6.QtCore import Qt
-from src.core.services.container_service import get_containers
-
-class ContainerListView(QWidget):
-    def __init__(self):
-        super().__init__()
-        layout = QVBoxLayout()
-        self.setLayout(layout)
-
-        # Title
-        title = QLabel("Containers")
-        title.setStyleSheet("font-size: 24px; padding: 20px 0;")
-        layout.addWidget(title)
-
-        # Table
-        self.table = QTableWidget()
-        self.table.setColumnCount(6)  # 5 columns + 1 for checkbox
-        self.table.setHorizontalHeaderLabels(["", "Name", "Image", "Status", "Port(s)", "Created"])
-        self.table.setStyleSheet(f"""
-            QTableWidget {{
-                border: none;
-            }}
-            QHeaderView::section {{
-                padding: 4px;
-                border: none;
-                font-weight: bold;
-            }}
-        """)
-
-        # Make columns resizable by dragging
-        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Interactive)
-
-        layout.addWidget(self.table)
-
-        # Populate with sample data
-        self.populate_sample_data()
-
-    def populate_sample_data(self):
-        container_data = get_containers()
-
-        self.table.setRowCount(len(container_data))
-        for row, container in enumerate(container_data):
-            # Add checkbox to the first column
-            checkbox = QCheckBox()
-            checkbox.setStyleSheet("margin-left: 10px; margin-right: 10px;")  # Optional styling
-            checkbox.setChecked(False)
-            self.table.setCellWidget(row, 0, checkbox)
-
-            # Add the rest of the container data
-            container_tuple = container.to_tuple()  # Extract the tuple representation
-            for col, value in enumerate(container_tuple):
-                self.table.setItem(row, col + 1, QTableWidgetItem(value))
+from PySide6.QtWidgets import QHBoxLayout, QLineEdit, QPushButton, QComboBox
+from PySide6.QtCore import QThreadPool, QTimer
+from src.core.label_index import COMPOSE_PROJECT, LabelIndex, parse_selector
+from src.core.services.container_service import iter_containers, remove_containers, start_containers, stop_containers
+from src.core.state_store import CONTAINER, REMOVE, RESET, UPSERT
+from ...store_bridge import StoreBridge
+from ...workers import BulkActionWorker
+from ..resource_list_view import ResourceListView
+from .container_logs_view import ContainerLogsView
 
+LABELS_REFRESH_MS = 200
+
+class ContainerListView(ResourceListView):
+    def __init__(self, store=None):
+        super().__init__("Containers", ["Name", "Image", "Status", "Port(s)", "Created"],
+                         key=lambda container: container.id)
+        self.store = store
+        self.bulk_worker = None
+        self.log_views = {}
+        self.label_index = LabelIndex()
+        # Recounting projects and refiltering costs a pass over every row, so a burst of events does it once
+        self.labels_timer = QTimer(self)
+        self.labels_timer.setSingleShot(True)
+        self.labels_timer.setInterval(LABELS_REFRESH_MS)
+        self.labels_timer.timeout.connect(self.update_labels)
+
+        # Actions on the checked containers
+        actions = QHBoxLayout()
+        self.action_buttons = []
+        for label, verb, action in (("Start", "Starting", start_containers),
+                                    ("Stop", "Stopping", stop_containers),
+                                    ("Remove", "Removing", remove_containers)):
+            button = QPushButton(label)
+            button.clicked.connect(lambda _=False, verb=verb, action=action: self.run_bulk_action(verb, action))
+            actions.addWidget(button)
+            self.action_buttons.append(button)
+        actions.addStretch()
+        # Label filtering, answered by the label index
+        self.project_box = QComboBox()
+        self.project_box.setMinimumWidth(160)
+        self.project_box.addItem("All projects", None)
+        self.project_box.activated.connect(self.on_project_selected)
+        actions.addWidget(self.project_box)
+        self.selector_box = QLineEdit()
+        self.selector_box.setPlaceholderText("Label selector, e.g. env in (prod,staging)")
+        self.selector_box.setClearButtonEnabled(True)
+        self.selector_box.textChanged.connect(self.apply_selector)
+        actions.addWidget(self.selector_box)
+        self.layout().insertLayout(1, actions)
+
+        self.table.doubleClicked.connect(self.open_logs)
+
+        if store is None:
+            self.refresh()
+        else:
+            # Follow the state store instead of polling the daemon
+            self.bridge = StoreBridge(store, self)
+            self.bridge.changed.connect(self.on_store_change)
+            if store.synced.is_set():
+                self.load(store.get_containers)
+            else:
+                self.set_loading("Connecting to Docker...")
+
+    def refresh(self):
+        self.load(iter_containers)
+
+    def load(self, source):
+        self.label_index.clear()
+        super().load(source)
+
+    def on_batch(self, generation, containers):
+        super().on_batch(generation, containers)
+        if generation != self.generation:
+            return
+        for container in containers:
+            self.label_index.add_resource(container.id, container)
+
+    def loaded(self):
+        self.update_labels()
+
+    def on_store_change(self, change):
+        if change.kind != CONTAINER:
+            return
+        if change.action == RESET:
+            self.load(self.store.get_containers)
+        elif change.action == UPSERT:
+            self.model.upsert(change.resource)
+            self.label_index.add_resource(change.key, change.resource)
+            self.schedule_label_update()
+        elif change.action == REMOVE:
+            self.model.remove(change.key)
+            self.label_index.remove(change.key)
+            self.schedule_label_update()
+
+    def schedule_label_update(self):
+        if not self.labels_timer.isActive():
+            self.labels_timer.start()
+
+    def update_labels(self):
+        """
+        Refresh the project list and the rows the label selector lets through.
+        """
+        counts = self.label_index.counts(COMPOSE_PROJECT)
+        projects = [(f"{project} ({count})", project) for project, count in sorted(counts.items())]
+        current = self.project_box.currentData()
+        if [(self.project_box.itemText(i), self.project_box.itemData(i))
+                for i in range(1, self.project_box.count())] != projects:
+            self.project_box.clear()
+            self.project_box.addItem("All projects", None)
+            for text, project in projects:
+                self.project_box.addItem(text, project)
+            self.project_box.setCurrentIndex(max(self.project_box.findData(current), 0))
+        self.apply_selector(self.selector_box.text())
+
+    def on_project_selected(self, index):
+        project = self.project_box.itemData(index)
+        self.selector_box.setText(f"{COMPOSE_PROJECT}={project}" if project else "")
+
+    def apply_selector(self, text):
+        try:
+            selector = parse_selector(text)
+        except ValueError as e:
+            self.selector_box.setToolTip(str(e))
+            return
+        self.selector_box.setToolTip("")
+        if selector:
+            self.proxy.set_allowed_keys(self.label_index.select(selector))
+        elif self.proxy.allowed_keys is not None:
+            self.proxy.set_allowed_keys(None)
+
+    def checked_container_ids(self):
+        return self.model.checked_keys()
+
+    def open_logs(self, index):
+        row = self.proxy.mapToSource(index).row()
+        container_id = self.model.key_at(row)
+        view = self.log_views.get(container_id)
+        if view is None or not view.isVisible():
+            view = self.log_views[container_id] = ContainerLogsView(container_id, self.model.data(
+                self.model.index(row, 1)))
+        view.show()
+        view.raise_()
+
+    def run_bulk_action(self, verb, action):
+        """
+        Apply a bulk container operation to the checked rows on a pool thread.
+        """
+        container_ids = self.checked_container_ids()
+        if not container_ids or self.bulk_worker is not None:
+            return
+        self.bulk_verb = verb
+        self.bulk_total = len(container_ids)
+        self.bulk_done = 0
+        for button in self.action_buttons:
+            button.setEnabled(False)
+        self.set_loading(f"{verb} containers... 0/{self.bulk_total}")
+
+        self.bulk_worker = BulkActionWorker(action, container_ids)
+        self.bulk_worker.signals.progress.connect(self.on_bulk_progress)
+        self.bulk_worker.signals.finished.connect(self.on_bulk_finished)
+        QThreadPool.globalInstance().start(self.bulk_worker)
+
+    def on_bulk_progress(self, container_id, outcome, message):
+        self.bulk_done += 1
+        self.status_label.setText(f"{self.bulk_verb} containers... {self.bulk_done}/{self.bulk_total}")
+
+    def on_bulk_finished(self, result):
+        self.bulk_worker = None
+        for button in self.action_buttons:
+            button.setEnabled(True)
+        self.loading_bar.hide()
+        summary = f"{len(result.succeeded)}/{self.bulk_total} containers done"
+        if result.failed:
+            summary += f", {len(result.failed)} failed ({next(iter(result.failed.values()))})"
+        if result.timed_out:
+            summary += f", {len(result.timed_out)} timed out"
+        self.status_label.setText(summary)
+        self.status_label.setToolTip("\n".join(f"{container_id[:12]}: {message}"
+                                               for container_id, message in result.failed.items()))
+        if self.store is None:
+            # Without the state store nothing else will pick up the new states
+            self.refresh()
@@ -0,0 +1,129 @@
+# ui/views/containers/container_logs_view.py
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPlainTextEdit, QPushButton, QCheckBox
+from PySide6.QtGui import QColor, QFont, QTextCharFormat, QTextCursor
+from PySide6.QtCore import QThreadPool, QTimer
+from src.core.services.container_service import STDERR
+from src.utils.ring_buffer import RingBuffer
+from ...workers import LogStreamWorker
+
+MAX_LINES = 5000
+TAIL = 1000
+FLUSH_INTERVAL_MS = 100
+
+class ContainerLogsView(QWidget):
+    """
+    Follows the logs of one container.
+
+    Only the last MAX_LINES lines are kept, both in the ring buffer and in the document, and new
+    lines are appended at the end of the document in a single edit per flush instead of
+    re-setting the whole text.
+    """
+
+    def __init__(self, container_id, name=None, max_lines=MAX_LINES):
+        super().__init__()
+        self.container_id = container_id
+        self.lines = RingBuffer(max_lines)
+        self.worker = None
+        self.setWindowTitle(f"Logs - {name or container_id[:12]}")
+        self.resize(900, 600)
+
+        layout = QVBoxLayout()
+        self.setLayout(layout)
+
+        header = QHBoxLayout()
+        self.timestamps_box = QCheckBox("Timestamps")
+        self.timestamps_box.toggled.connect(self.rerender)
+        header.addWidget(self.timestamps_box)
+        header.addStretch()
+        self.status_label = QLabel()
+        header.addWidget(self.status_label)
+        clear_button = QPushButton("Clear")
+        clear_button.clicked.connect(self.clear)
+        header.addWidget(clear_button)
+        layout.addLayout(header)
+
+        self.text = QPlainTextEdit()
+        self.text.setReadOnly(True)
+        self.text.setLineWrapMode(QPlainTextEdit.NoWrap)
+        self.text.setUndoRedoEnabled(False)
+        # The document drops its oldest blocks itself once it reaches the limit
+        self.text.setMaximumBlockCount(max_lines)
+        self.text.setFont(QFont("monospace"))
+        layout.addWidget(self.text)
+
+        self.stdout_format = QTextCharFormat()
+        self.stderr_format = QTextCharFormat()
+        self.stderr_format.setForeground(QColor("#d9534f"))
+
+        self.flush_timer = QTimer(self)
+        self.flush_timer.setInterval(FLUSH_INTERVAL_MS)
+        self.flush_timer.timeout.connect(self.flush)
+
+        self.start()
+
+    def start(self):
+        self.worker = LogStreamWorker(self.container_id, tail=TAIL, timestamps=True)
+        self.worker.signals.finished.connect(self.on_finished)
+        self.worker.signals.failed.connect(self.on_failed)
+        self.status_label.setText("Following")
+        QThreadPool.globalInstance().start(self.worker)
+        self.flush_timer.start()
+
+    def stop(self):
+        self.flush_timer.stop()
+        if self.worker is not None:
+            self.worker.cancel()
+            self.worker = None
+
+    def flush(self):
+        if self.worker is None:
+            return
+        lines = self.worker.drain()
+        if lines:
+            self.lines.extend(lines)
+            self.append_lines(lines)
+
+    def append_lines(self, lines):
+        scrollbar = self.text.verticalScrollBar()
+        at_bottom = scrollbar.value() >= scrollbar.maximum() - 2
+        show_timestamps = self.timestamps_box.isChecked()
+
+        cursor = QTextCursor(self.text.document())
+        cursor.movePosition(QTextCursor.End)
+        cursor.beginEditBlock()
+        for line in lines:
+            if not self.text.document().isEmpty():
+                cursor.insertBlock()
+            text = line.text
+            if show_timestamps and line.timestamp is not None:
+                text = f"{line.timestamp.isoformat(timespec='milliseconds')} {text}"
+            cursor.insertText(text, self.stderr_format if line.stream == STDERR else self.stdout_format)
+        cursor.endEditBlock()
+
+        if at_bottom:
+            scrollbar.setValue(scrollbar.maximum())
+
+    def rerender(self):
+        self.text.clear()
+        self.append_lines(self.lines.snapshot())
+
+    def clear(self):
+        self.lines.clear()
+        self.text.clear()
+
+    def on_finished(self):
+        self.flush()
+        self.flush_timer.stop()
+        self.worker = None
+        self.status_label.setText("Container stopped")
+
+    def on_failed(self, message):
+        # Show what was read before the stream broke
+        self.flush()
+        self.flush_timer.stop()
+        self.worker = None
+        self.status_label.setText(f"Failed to read logs: {message}")
+
+    def closeEvent(self, event):
+        self.stop()
+        super().closeEvent(event)
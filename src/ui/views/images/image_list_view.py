@@ -1,8 +1,80 @@
-from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel
+# ui/views/images/image_list_view.py
+from PySide6.QtWidgets import QLabel
+from PySide6.QtCore import Qt, QThreadPool
+from src.core.layer_index import LayerIndex, LayerSelection
+from src.core.services.image_service import get_images
+from src.utils.docker_utils import format_size
+from ...workers import TaskWorker
+from ..resource_list_view import ResourceListView
 
-class ImageListView(QWidget):
+def image_row_key(image):
+    # get_images() lists one row per tag of an image
+    return f"{image.id}/{image.repository}:{image.tag}"
+
+class ImageListView(ResourceListView):
     def __init__(self):
-        super().__init__()
-        layout = QVBoxLayout()
-        layout.addWidget(QLabel("Image List View"))
-        self.setLayout(layout)
\ No newline at end of file
+        super().__init__("Images", ["Repository", "Tag", "Image ID", "Created", "Size"], key=image_row_key)
+        self.layer_index = LayerIndex()
+        self.selection = None
+        self.index_worker = None
+        self.index_generation = 0
+        self.model.dataChanged.connect(self.on_data_changed)
+
+        # Space held by the checked images, from the layer index
+        self.space_label = QLabel()
+        self.layout().addWidget(self.space_label)
+
+        self.refresh()
+
+    def refresh(self):
+        self.load(get_images)
+
+    def loaded(self):
+        self.index_layers()
+
+    def index_layers(self):
+        """
+        Bring the layer index up to date on a pool thread; only new images are inspected.
+        """
+        if self.index_worker is not None:
+            return
+        self.selection = None
+        self.space_label.setText("Analyzing layers...")
+        image_ids = {key.split("/", 1)[0] for key in self.model.keys()}
+        self.index_generation = self.generation
+        self.index_worker = TaskWorker(self.layer_index.refresh, image_ids)
+        self.index_worker.signals.finished.connect(self.on_indexed)
+        self.index_worker.signals.failed.connect(self.on_index_failed)
+        QThreadPool.globalInstance().start(self.index_worker)
+
+    def on_indexed(self, fetched):
+        self.index_worker = None
+        if self.index_generation != self.generation:
+            # The images were reloaded while indexing
+            if self.loader is None:
+                self.index_layers()
+            return
+        self.selection = LayerSelection(self.layer_index)
+        self.update_space()
+
+    def on_index_failed(self, message):
+        self.index_worker = None
+        self.space_label.setText(f"Failed to analyze layers: {message}")
+
+    def on_data_changed(self, top_left, bottom_right, roles=()):
+        if Qt.CheckStateRole in roles:
+            self.update_space()
+
+    def checked_image_ids(self):
+        return {key.split("/", 1)[0] for key in self.model.checked_keys()}
+
+    def update_space(self):
+        if self.selection is None:
+            return
+        self.selection.update(self.checked_image_ids())
+        report = self.selection.report()
+        text = f"All images: {format_size(self.layer_index.total_size())}"
+        if report.images:
+            text += (f" | {report.images} selected: {format_size(report.unique_bytes)} reclaimable, "
+                     f"{format_size(report.shared_bytes)} shared with other images")
+        self.space_label.setText(text)
@@ -0,0 +1,149 @@
+# ui/views/resource_list_view.py
+from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QTableView, QHeaderView,
+                               QAbstractItemView, QLineEdit, QPushButton, QProgressBar)
+from PySide6.QtCore import Qt, QThreadPool
+from src.utils.startup_trace import FIRST_DATA, startup_trace
+from ..table_model import ResourceFilterProxy, ResourceTableModel
+from ..workers import BatchLoader
+
+ROW_HEIGHT = 28
+
+class ResourceListView(QWidget):
+    """
+    A searchable table of one kind of resource, reloaded on a pool thread batch by batch.
+
+    Subclasses implement refresh(), usually as `self.load(source)`, and may override loaded()
+    to act once every row is in. Extra rows of controls go between the header and the
+    table with `self.layout().insertLayout(1, ...)`, anything below the table with addWidget().
+    """
+
+    def __init__(self, title, columns, key):
+        """
+        Args:
+            title (str): The title of the view, e.g. "Containers", also used in status messages.
+            columns (list): The column headers of the table.
+            key (callable): Gets the key of a resource, e.g. `lambda container: container.id`.
+        """
+        super().__init__()
+        self.noun = title.lower()
+        self.loader = None
+        self.generation = 0
+
+        layout = QVBoxLayout()
+        self.setLayout(layout)
+
+        # Title
+        header = QHBoxLayout()
+        title_label = QLabel(title)
+        title_label.setStyleSheet("font-size: 24px; padding: 20px 0;")
+        header.addWidget(title_label)
+        header.addStretch()
+        self.search_box = QLineEdit()
+        self.search_box.setPlaceholderText("Search")
+        self.search_box.setClearButtonEnabled(True)
+        header.addWidget(self.search_box)
+        self.refresh_button = QPushButton("Refresh")
+        self.refresh_button.clicked.connect(self.on_refresh_clicked)
+        header.addWidget(self.refresh_button)
+        layout.addLayout(header)
+
+        # Loading state, shown while rows are streaming in
+        self.loading_bar = QProgressBar()
+        self.loading_bar.setRange(0, 0)  # Busy indicator
+        self.loading_bar.setTextVisible(False)
+        self.loading_bar.setFixedHeight(4)
+        self.loading_bar.hide()
+        layout.addWidget(self.loading_bar)
+        self.status_label = QLabel()
+        self.status_label.hide()
+        layout.addWidget(self.status_label)
+
+        # Table: the model keeps one compact display row per resource and the view only
+        # paints what is visible; sorting and searching go through the proxy
+        self.model = ResourceTableModel(columns, key=key, parent=self)
+        self.proxy = ResourceFilterProxy(self)
+        self.proxy.setSourceModel(self.model)
+        self.search_box.textChanged.connect(self.proxy.setFilterFixedString)
+
+        self.table = QTableView()
+        self.table.setModel(self.proxy)
+        self.table.setSortingEnabled(True)
+        self.table.sortByColumn(1, Qt.AscendingOrder)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setShowGrid(False)
+        self.table.verticalHeader().hide()
+        # Fixed row heights let the view skip measuring rows it does not paint
+        self.table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.table.verticalHeader().setDefaultSectionSize(ROW_HEIGHT)
+        self.table.setStyleSheet("""
+            QTableView {
+                border: none;
+            }
+            QHeaderView::section {
+                padding: 4px;
+                border: none;
+                font-weight: bold;
+            }
+        """)
+
+        # Make columns resizable by dragging
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Interactive)
+        self.table.setColumnWidth(0, 36)
+        layout.addWidget(self.table)
+
+    def refresh(self):
+        raise NotImplementedError
+
+    def on_refresh_clicked(self):
+        self.refresh()
+
+    def load(self, source):
+        """
+        Reload the table on a pool thread; rows appear batch by batch as they are parsed.
+
+        Args:
+            source (callable): Returns the resources, ideally as a generator.
+        """
+        if self.loader is not None:
+            self.loader.cancel()
+        self.generation += 1
+        self.model.clear()
+        self.set_loading(f"Loading {self.noun}...")
+
+        self.loader = BatchLoader(self.generation, source)
+        self.loader.signals.batch.connect(self.on_batch)
+        self.loader.signals.finished.connect(self.on_loaded)
+        self.loader.signals.failed.connect(self.on_load_failed)
+        QThreadPool.globalInstance().start(self.loader)
+
+    def set_loading(self, message):
+        self.loading_bar.show()
+        self.status_label.setText(message)
+        self.status_label.show()
+
+    def on_batch(self, generation, resources):
+        if generation != self.generation:
+            return
+        self.model.upsert_many(resources)
+        self.status_label.setText(f"Loading {self.noun}... {self.model.rowCount()}")
+
+    def on_loaded(self, generation):
+        if generation != self.generation:
+            return
+        startup_trace.mark(FIRST_DATA)
+        self.loader = None
+        self.loading_bar.hide()
+        self.status_label.hide()
+        self.loaded()
+
+    def loaded(self):
+        """
+        Called once every row of the current load is in the table.
+        """
+
+    def on_load_failed(self, generation, message):
+        if generation != self.generation:
+            return
+        self.loader = None
+        self.loading_bar.hide()
+        self.status_label.setText(f"Failed to load {self.noun}: {message}")
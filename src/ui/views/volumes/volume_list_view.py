@@ -1,8 +1,68 @@
-from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel
-
-class VolumeListView(QWidget):
-    def __init__(self):
-        super().__init__()
-        layout = QVBoxLayout()
-        layout.addWidget(QLabel("Volume List View"))
-        self.setLayout(layout)
\ No newline at end of file
+# ui/views/volumes/volume_list_view.py
+from dataclasses import replace
+from PySide6.QtWidgets import QLabel
+from src.core.disk_usage import disk_usage_index
+from src.core.services.volume_service import get_volumes
+from src.core.state_store import VOLUME, REMOVE, RESET, UPSERT
+from src.utils.docker_utils import format_size
+from ...store_bridge import StoreBridge
+from ..resource_list_view import ResourceListView
+
+def load_volumes(max_age=None):
+    """
+    Get every volume with its size from one `system df` report, or without sizes if there is none.
+    """
+    usage = disk_usage_index.get(max_age)
+    if usage is None:
+        return get_volumes()
+    return list(usage.volumes.values())
+
+class VolumeListView(ResourceListView):
+    def __init__(self, store=None):
+        super().__init__("Volumes", ["Name", "Driver", "Size", "Containers", "Mountpoint"],
+                         key=lambda volume: volume.name)
+        self.store = store
+
+        self.summary_label = QLabel()
+        self.layout().addWidget(self.summary_label)
+
+        if store is not None:
+            # Creations and removals come from the state store; sizes from the disk usage report
+            self.bridge = StoreBridge(store, self)
+            self.bridge.changed.connect(self.on_store_change)
+        self.refresh()
+
+    def refresh(self, max_age=None):
+        self.load(lambda: load_volumes(max_age))
+
+    def on_refresh_clicked(self):
+        # Sizes are only recomputed on request; automatic loads reuse the shared report
+        self.refresh(max_age=0)
+
+    def loaded(self):
+        self.update_summary()
+
+    def update_summary(self):
+        usage = disk_usage_index.peek()
+        summary = f"{self.model.rowCount()} volumes"
+        if usage is not None:
+            summary += f", {format_size(usage.volumes_size)} in use"
+        self.summary_label.setText(summary)
+
+    def on_store_change(self, change):
+        if change.kind != VOLUME:
+            return
+        if change.action == RESET:
+            self.refresh()
+        elif change.action == UPSERT:
+            volume = change.resource
+            usage = disk_usage_index.peek()
+            known = usage.volumes.get(volume.name) if usage is not None else None
+            if known is not None and volume.size_bytes < 0:
+                # Listings carry no usage data; keep the size from the last report
+                volume = replace(volume, size_bytes=known.size_bytes, links_count=known.links_count)
+            self.model.upsert(volume)
+            self.update_summary()
+        elif change.action == REMOVE:
+            self.model.remove(change.key)
+            self.update_summary()
@@ -0,0 +1,180 @@
+# ui/workers.py
+from PySide6.QtCore import QObject, QRunnable, Signal
+from collections import deque
+import logging
+from src.core.docker_client import DockerClientError
+from src.core.services.batch import BulkResult
+from src.core.services.container_service import stream_container_logs
+
+logger = logging.getLogger(__name__)
+
+class BatchLoaderSignals(QObject):
+    # Every signal carries the loader's generation so views can drop results of superseded loads
+    batch = Signal(int, list)
+    finished = Signal(int)
+    failed = Signal(int, str)
+
+class BatchLoader(QRunnable):
+    """
+    Runs a blocking load on a QThreadPool thread and streams the results back in batches.
+
+    `load` returns an iterable (ideally a generator, so parsing is spread over the run); every
+    `batch_size` items are emitted through `signals.batch`, which is delivered on the GUI
+    thread, so rows can be rendered as they arrive.
+    """
+
+    def __init__(self, generation, load, batch_size=200):
+        super().__init__()
+        self.generation = generation
+        self.load = load
+        self.batch_size = batch_size
+        self.cancelled = False
+        self.signals = BatchLoaderSignals()
+
+    def cancel(self):
+        self.cancelled = True
+
+    def run(self):
+        batch = []
+        try:
+            for item in self.load():
+                if self.cancelled:
+                    return
+                batch.append(item)
+                if len(batch) >= self.batch_size:
+                    self.signals.batch.emit(self.generation, batch)
+                    batch = []
+            if batch and not self.cancelled:
+                self.signals.batch.emit(self.generation, batch)
+        except Exception as e:
+            logger.exception("Background load failed")
+            self.signals.failed.emit(self.generation, str(e))
+            return
+        if not self.cancelled:
+            self.signals.finished.emit(self.generation)
+
+class BulkActionSignals(QObject):
+    progress = Signal(str, str, str)  # key, outcome, error message
+    finished = Signal(object)         # BulkResult
+
+class BulkActionWorker(QRunnable):
+    """
+    Runs a bulk service operation (e.g. stop_containers) on a QThreadPool thread.
+
+    `action` is called with the keys and an `on_progress` callback; per-object outcomes are
+    relayed through `signals.progress` as they complete and the aggregated result through
+    `signals.finished`, both delivered on the GUI thread.
+    """
+
+    def __init__(self, action, keys):
+        super().__init__()
+        self.action = action
+        self.keys = list(keys)
+        self.signals = BulkActionSignals()
+
+    def run(self):
+        try:
+            result = self.action(self.keys, on_progress=self.signals.progress.emit)
+        except Exception as e:
+            logger.exception("Bulk action failed")
+            # Views wait for `finished` to re-enable their actions, so it must come either way
+            result = BulkResult([], {key: str(e) for key in self.keys}, [])
+        self.signals.finished.emit(result)
+
+class TaskSignals(QObject):
+    finished = Signal(object)  # The task's return value
+    failed = Signal(str)
+
+class TaskWorker(QRunnable):
+    """
+    Runs one blocking call on a QThreadPool thread and delivers its result on the GUI thread.
+    """
+
+    def __init__(self, task, *args):
+        super().__init__()
+        self.task = task
+        self.args = args
+        self.signals = TaskSignals()
+
+    def run(self):
+        try:
+            result = self.task(*self.args)
+        except Exception as e:
+            logger.exception("Background task failed")
+            self.signals.failed.emit(str(e))
+            return
+        self.signals.finished.emit(result)
+
+class LogStreamSignals(QObject):
+    finished = Signal()
+    failed = Signal(str)
+
+class LogStreamWorker(QRunnable):
+    """
+    Follows a container's logs on a QThreadPool thread.
+
+    Lines are queued rather than signalled one by one; the view drains the queue on a timer,
+    so a burst of output costs one document update per tick. The queue is capped at
+    `max_pending` lines, dropping the oldest, in case the view falls behind. If a
+    ContainerLogCache is given, the streamed lines are also appended to it in batches.
+    """
+
+    def __init__(self, container_id, tail=1000, timestamps=True, max_pending=10000, cache=None,
+                 cache_batch_size=256):
+        super().__init__()
+        self.container_id = container_id
+        self.cache = cache
+        self.cache_batch_size = cache_batch_size
+        self.cache_batch = []
+        self.tail = tail
+        self.timestamps = timestamps
+        self.pending = deque(maxlen=max_pending)
+        self.cancelled = False
+        self.stream = None
+        self.signals = LogStreamSignals()
+
+    def cancel(self):
+        self.cancelled = True
+        stream = self.stream
+        if stream is not None:
+            # Unblock the read the worker is waiting on
+            stream.interrupt()
+
+    def drain(self):
+        lines = []
+        while self.pending:
+            lines.append(self.pending.popleft())
+        return lines
+
+    def flush_cache(self):
+        lines, self.cache_batch = self.cache_batch, []
+        # Resuming from the cache's newest line may stream a few lines it already has
+        last = self.cache.last_timestamp()
+        self.cache.append(line for line in lines if last is None or line.timestamp is None or line.timestamp > last)
+
+    def _opened(self, stream):
+        self.stream = stream
+        if self.cancelled:
+            stream.interrupt()
+
+    def run(self):
+        try:
+            for line in stream_container_logs(self.container_id, follow=True, timestamps=self.timestamps,
+                                              tail=self.tail, on_open=self._opened):
+                if self.cancelled:
+                    return
+                self.pending.append(line)
+                if self.cache is not None:
+                    self.cache_batch.append(line)
+                    if len(self.cache_batch) >= self.cache_batch_size:
+                        self.flush_cache()
+        except DockerClientError as e:
+            if not self.cancelled:
+                self.signals.failed.emit(str(e))
+            return
+        finally:
+            self.stream = None
+            if self.cache is not None:
+                self.flush_cache()
+        if not self.cancelled:
+            self.signals.finished.emit()
@@ -0,0 +1,221 @@
+import bz2
+import gzip
+import lzma
+import os
+import queue
+import threading
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, Iterable, Iterator, NamedTuple, Optional
+
+DEFAULT_BLOCK_SIZE = 4 * 1024 * 1024
+READ_SIZE = 1024 * 1024
+
+
+class Codec(NamedTuple):
+    """
+    A compression format that can be written in independent blocks.
+
+    Every block is compressed into a complete member (a gzip member, a bz2 stream, an xz
+    stream); the members are simply concatenated, which every tool for these formats reads
+    as one file. That lets blocks be compressed in parallel.
+    """
+    name: str
+    extension: str
+    magic: bytes
+    compress: Callable[[bytes], bytes]
+    decompressor: Optional[Callable[[], Any]]  # Makes an object with decompress(), eof and unused_data
+
+
+CODECS: Dict[str, Codec] = {}
+
+
+def register_codec(codec: Codec) -> None:
+    """
+    Make a codec available by name, e.g. a zstd codec built on an optional package.
+    """
+    CODECS[codec.name] = codec
+
+
+register_codec(Codec("none", ".tar", b"", lambda data: data, None))
+register_codec(Codec("gzip", ".tar.gz", b"\x1f\x8b", partial(gzip.compress, compresslevel=6, mtime=0),
+                     lambda: zlib.decompressobj(31)))
+register_codec(Codec("bz2", ".tar.bz2", b"BZh", partial(bz2.compress, compresslevel=9), bz2.BZ2Decompressor))
+register_codec(Codec("xz", ".tar.xz", b"\xfd7zXZ\x00", lzma.compress, lzma.LZMADecompressor))
+
+
+def get_codec(name: str) -> Codec:
+    """
+    Get a registered codec by name.
+
+    Raises:
+        ValueError: If there is no codec with that name.
+    """
+    codec = CODECS.get(name)
+    if codec is None:
+        raise ValueError(f"Unknown compression: {name} (available: {', '.join(sorted(CODECS))})")
+    return codec
+
+
+def detect_codec(header: bytes) -> Codec:
+    """
+    Find the codec of a file from its first bytes; files no codec recognizes are taken as uncompressed.
+    """
+    for codec in CODECS.values():
+        if codec.magic and header.startswith(codec.magic):
+            return codec
+    return CODECS["none"]
+
+
+def _blocks(chunks: Iterable[bytes], block_size: int) -> Iterator[bytes]:
+    pending = []
+    size = 0
+    for chunk in chunks:
+        pending.append(chunk)
+        size += len(chunk)
+        if size >= block_size:
+            yield b"".join(pending)
+            pending, size = [], 0
+    if pending:
+        yield b"".join(pending)
+
+
+def compress_blocks(chunks: Iterable[bytes], codec: Codec, block_size: int = DEFAULT_BLOCK_SIZE,
+                    max_workers: Optional[int] = None) -> Iterator[bytes]:
+    """
+    Compress a stream on a pool of threads, one block per task.
+
+    The codecs' compressors release the GIL, so blocks really are compressed in parallel
+    while the caller keeps producing input and writing output. At most two blocks per worker
+    are in flight, which bounds memory use.
+
+    Args:
+        chunks (Iterable[bytes]): The data to compress.
+        codec (Codec): The compression format.
+        block_size (int): The amount of input compressed per block.
+        max_workers (Optional[int]): The number of compression threads, defaults to the CPU count.
+
+    Yields:
+        bytes: The compressed members, in input order.
+    """
+    max_workers = max_workers or os.cpu_count() or 1
+    in_flight = deque()
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="docky-compress") as executor:
+        for block in _blocks(chunks, block_size):
+            in_flight.append(executor.submit(codec.compress, block))
+            if len(in_flight) >= 2 * max_workers:
+                yield in_flight.popleft().result()
+        while in_flight:
+            yield in_flight.popleft().result()
+
+
+def decompress_stream(read: Callable[[int], bytes], codec: Codec, read_size: int = READ_SIZE) -> Iterator[bytes]:
+    """
+    Decompress a stream of concatenated members, as written by compress_blocks().
+
+    Args:
+        read (Callable[[int], bytes]): Reads compressed data, e.g. a file's read().
+        codec (Codec): The compression format.
+        read_size (int): The amount of compressed data read at a time.
+
+    Yields:
+        bytes: The decompressed data.
+    """
+    if codec.decompressor is None:
+        while True:
+            data = read(read_size)
+            if not data:
+                return
+            yield data
+
+    decompressor = codec.decompressor()
+    started = False  # Whether the current member has been fed any data
+    while True:
+        data = read(read_size)
+        if not data:
+            if started and not decompressor.eof:
+                raise EOFError("Compressed stream ended before the end of its last member")
+            return
+        while data:
+            started = True
+            output = decompressor.decompress(data)
+            if output:
+                yield output
+            if not decompressor.eof:
+                break
+            # Start the next member with whatever followed the one that just ended
+            data = decompressor.unused_data
+            decompressor = codec.decompressor()
+            started = False
+
+
+class BackgroundReader:
+    """
+    A file-like reader over an iterator of bytes that is consumed on a background thread.
+
+    Lets producing the data (e.g. reading and decompressing a file) overlap with whatever
+    consumes it. At most `max_chunks` chunks are buffered.
+    """
+
+    def __init__(self, chunks: Iterable[bytes], max_chunks: int = 16):
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_chunks)
+        self._chunk = b""
+        self._offset = 0
+        self._closed = threading.Event()
+        self._finished = False
+        self._thread = threading.Thread(target=self._run, args=(iter(chunks),), name="docky-reader", daemon=True)
+        self._thread.start()
+
+    def _put(self, item: Any) -> bool:
+        while not self._closed.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _run(self, chunks: Iterator[bytes]) -> None:
+        try:
+            for chunk in chunks:
+                if not self._put(chunk):
+                    return
+        except BaseException as e:
+            self._put(e)
+            return
+        self._put(None)
+
+    def read(self, amount: int = -1) -> bytes:
+        """
+        Read up to `amount` bytes (all remaining data if negative); b"" at the end of the data.
+
+        Raises:
+            Exception: Whatever the iterator raised on the background thread.
+        """
+        parts = []
+        wanted = amount
+        while amount < 0 or wanted > 0:
+            if self._offset >= len(self._chunk):
+                if self._finished:
+                    break
+                item = self._queue.get()
+                if item is None or isinstance(item, BaseException):
+                    self._finished = True
+                    if item is not None:
+                        raise item
+                    break
+                self._chunk, self._offset = item, 0
+            end = len(self._chunk) if amount < 0 else min(len(self._chunk), self._offset + wanted)
+            parts.append(self._chunk[self._offset:end])
+            wanted -= end - self._offset
+            self._offset = end
+        return b"".join(parts)
+
+    def close(self) -> None:
+        """
+        Stop the background thread, dropping any data it has not delivered.
+        """
+        self._closed.set()
+        self._thread.join()
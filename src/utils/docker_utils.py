@@ -0,0 +1,418 @@
+# src/utils/docker_utils.py
+
+from collections.abc import Mapping
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from sys import intern
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+_SIZE_UNITS = ["B", "kB", "MB", "GB", "TB", "PB", "EB", "ZB", "YB"]
+
+# The layout the docker CLI uses for CreatedAt columns
+CLI_TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S %z %Z"
+
+
+def format_size(num_bytes: Optional[float]) -> str:
+    """
+    Format a byte count the way the docker CLI does (decimal units, 3 significant digits).
+
+    Args:
+        num_bytes (Optional[float]): The size in bytes; None or a negative value means unknown.
+
+    Returns:
+        str: The human-readable size, e.g. "1.2GB", or "N/A" if the size is unknown.
+    """
+    if num_bytes is None or num_bytes < 0:
+        return "N/A"
+    size = float(num_bytes)
+    unit = 0
+    while size >= 1000.0 and unit < len(_SIZE_UNITS) - 1:
+        size /= 1000.0
+        unit += 1
+    return f"{size:.3g}{_SIZE_UNITS[unit]}"
+
+
+@lru_cache(maxsize=4096)
+def parse_size(value: Optional[str]) -> int:
+    """
+    Parse a size the docker CLI printed, e.g. "1.2GB" or "0B (virtual 187MB)".
+
+    Args:
+        value (Optional[str]): The size as displayed.
+
+    Returns:
+        int: The size in bytes, or -1 if it is unknown ("N/A", empty or unparseable).
+    """
+    token = (value or "").split(" ", 1)[0]
+    number = token.rstrip("kKMGTPEZYiB")
+    unit = token[len(number):]
+    try:
+        size = float(number)
+    except ValueError:
+        return -1
+    unit = unit.replace("i", "").upper()
+    for power, name in enumerate(_SIZE_UNITS):
+        if unit == name.upper():
+            return int(size * 1000 ** power)
+    return -1
+
+
+def format_duration(seconds: float) -> str:
+    """
+    Format a duration the way the docker CLI does, e.g. "About an hour" or "3 weeks".
+
+    Args:
+        seconds (float): The duration in seconds.
+
+    Returns:
+        str: The human-readable duration.
+    """
+    seconds = int(seconds)
+    if seconds < 1:
+        return "Less than a second"
+    if seconds == 1:
+        return "1 second"
+    if seconds < 60:
+        return f"{seconds} seconds"
+    minutes = seconds // 60
+    if minutes == 1:
+        return "About a minute"
+    if minutes < 60:
+        return f"{minutes} minutes"
+    hours = int(seconds / 3600 + 0.5)
+    if hours == 1:
+        return "About an hour"
+    if hours < 48:
+        return f"{hours} hours"
+    if hours < 24 * 7 * 2:
+        return f"{hours // 24} days"
+    if hours < 24 * 30 * 2:
+        return f"{hours // 24 // 7} weeks"
+    if hours < 24 * 365 * 2:
+        return f"{hours // 24 // 30} months"
+    return f"{seconds // 3600 // 24 // 365} years"
+
+
+def format_since(timestamp: datetime, now: Optional[datetime] = None) -> str:
+    """
+    Format how long ago a timestamp was, e.g. "2 hours ago".
+
+    Args:
+        timestamp (datetime): A timezone-aware timestamp.
+        now (Optional[datetime]): The reference time, defaults to the current time.
+
+    Returns:
+        str: The human-readable age.
+    """
+    now = now or datetime.now(timestamp.tzinfo)
+    return f"{format_duration((now - timestamp).total_seconds())} ago"
+
+
+def format_timestamp(timestamp: datetime) -> str:
+    """
+    Format a timestamp in the docker CLI CreatedAt layout.
+
+    Args:
+        timestamp (datetime): A timezone-aware timestamp.
+
+    Returns:
+        str: The formatted timestamp, e.g. "2024-07-23 16:11:49 +0530 IST".
+    """
+    return timestamp.strftime(CLI_TIMESTAMP_FORMAT)
+
+
+def from_epoch(seconds: int) -> datetime:
+    """
+    Convert an Engine API epoch timestamp to a local, timezone-aware datetime.
+
+    Args:
+        seconds (int): Seconds since the epoch.
+
+    Returns:
+        datetime: The local timestamp.
+    """
+    return datetime.fromtimestamp(seconds).astimezone()
+
+
+@lru_cache(maxsize=None)
+def _fixed_timezone(offset: timedelta, name: Optional[str]) -> timezone:
+    if not offset and name in (None, "UTC"):
+        return timezone.utc
+    return timezone(offset, name) if name else timezone(offset)
+
+
+def parse_docker_timestamp(value: str) -> datetime:
+    """
+    Parse a timestamp in any of the layouts Docker prints, without going through strptime.
+
+    Accepts Engine API RFC 3339 timestamps and the CLI CreatedAt layout, with up to
+    nanosecond precision (truncated to microseconds). The timezone objects are cached per
+    offset and zone name, so a whole listing shares a handful of them.
+
+    Args:
+        value (str): The timestamp, e.g. "2024-07-23T16:11:49.402882301+05:30" or "2024-07-23 16:11:49 +0530 IST".
+
+    Returns:
+        datetime: The timezone-aware timestamp, in the offset it was written with.
+
+    Raises:
+        ValueError: If the value is not a Docker timestamp.
+    """
+    # The CLI layout ends with a zone name, which fromisoformat() does not accept
+    stamp, name = value, None
+    if value[-1:].isalpha() and value[-1] != "Z":
+        stamp, _, name = value.rpartition(" ")
+    try:
+        parsed = datetime.fromisoformat(stamp)
+    except ValueError:
+        parsed = None
+    if parsed is None or parsed.tzinfo is None:
+        raise ValueError(f"Invalid Docker timestamp: {value!r}")
+    # Same offset, so this only swaps in the shared (and named) timezone
+    return parsed.astimezone(_fixed_timezone(parsed.utcoffset(), name))
+
+
+def parse_rfc3339(value: str) -> datetime:
+    """
+    Parse an Engine API RFC 3339 timestamp (with up to nanosecond precision).
+
+    Args:
+        value (str): The timestamp, e.g. "2024-07-23T16:11:49.402882301+05:30".
+
+    Returns:
+        datetime: The local, timezone-aware timestamp.
+    """
+    return parse_docker_timestamp(value).astimezone()
+
+
+class LazyTimestamp:
+    """
+    A timestamp field of a slotted model whose slot may hold the raw timestamp, parsed on first access.
+
+    Listings build many models whose timestamps are never looked at; deferring the parse
+    keeps it out of the refresh path. Raw strings are parsed with `parser` and epoch seconds
+    with from_epoch(), and the result is stored back into the slot. Installed with
+    lazy_timestamps().
+    """
+
+    def __init__(self, slot: Any, parser: Callable[[str], datetime]):
+        self.slot = slot
+        self.parser = parser
+
+    def __get__(self, instance: Any, owner: type) -> Any:
+        if instance is None:
+            return self
+        value = self.slot.__get__(instance, owner)
+        if isinstance(value, str):
+            value = self.parser(value)
+            self.slot.__set__(instance, value)
+        elif isinstance(value, (int, float)):
+            value = from_epoch(value)
+            self.slot.__set__(instance, value)
+        return value
+
+    def __set__(self, instance: Any, value: Any) -> None:
+        self.slot.__set__(instance, value)
+
+    def raw(self, instance: Any) -> Any:
+        """
+        Get the value held in the slot without parsing it.
+        """
+        return self.slot.__get__(instance, type(instance))
+
+    def epoch(self, instance: Any) -> float:
+        """
+        Get the timestamp in seconds since the epoch, without building a datetime if the slot holds epoch seconds.
+        """
+        value = self.raw(instance)
+        if isinstance(value, (int, float)):
+            return float(value)
+        return self.__get__(instance, type(instance)).timestamp()
+
+
+def lazy_timestamps(*names: str, parser: Callable[[str], datetime] = parse_docker_timestamp) -> Callable[[type], type]:
+    """
+    Class decorator that makes timestamp fields of a slotted dataclass accept raw values and parse them lazily.
+
+    Apply it above `@dataclass(slots=True)`; the constructor then takes either a datetime or
+    the raw timestamp for each named field.
+
+    Args:
+        *names (str): The names of the timestamp fields.
+        parser (Callable[[str], datetime]): Parses a raw timestamp string.
+
+    Returns:
+        Callable[[type], type]: The decorator.
+    """
+    def decorate(cls: type) -> type:
+        for name in names:
+            setattr(cls, name, LazyTimestamp(cls.__dict__[name], parser))
+        return cls
+    return decorate
+
+
+class PortMapping(NamedTuple):
+    """
+    A container port, published on a host address or not.
+    """
+    private_port: int
+    protocol: str = "tcp"
+    ip: str = ""
+    public_port: int = 0  # 0 when the port is not published
+
+
+def port_mappings_from_api(ports: Optional[List[dict]]) -> Tuple[PortMapping, ...]:
+    """
+    Convert the `Ports` list of an Engine API container summary.
+
+    Args:
+        ports (Optional[List[dict]]): The port bindings.
+
+    Returns:
+        Tuple[PortMapping, ...]: The distinct mappings, in order.
+    """
+    mappings = (PortMapping(port.get('PrivatePort', 0), port.get('Type', 'tcp'),
+                            port.get('IP', '') if port.get('PublicPort') else '', port.get('PublicPort') or 0)
+                for port in ports or [])
+    return tuple(dict.fromkeys(mappings))
+
+
+def _port_range(value: str) -> List[int]:
+    first, _, last = value.partition('-')
+    return list(range(int(first), int(last or first) + 1))
+
+
+@lru_cache(maxsize=4096)
+def parse_ports(value: Optional[str]) -> Tuple[PortMapping, ...]:
+    """
+    Parse the ports column the docker CLI printed, e.g. "0.0.0.0:8000-8001->8000-8001/tcp, 443/tcp".
+
+    Args:
+        value (Optional[str]): The ports as displayed.
+
+    Returns:
+        Tuple[PortMapping, ...]: The distinct mappings, in order, with port ranges expanded. Results are
+            cached, so rows with the same ports share one tuple.
+    """
+    mappings = []
+    for entry in filter(None, (part.strip() for part in (value or "").split(","))):
+        host, _, container = entry.rpartition("->")
+        ports, _, protocol = container.partition("/")
+        try:
+            private_ports = _port_range(ports)
+            if host:
+                ip, _, public = host.rpartition(":")
+                public_ports = _port_range(public)
+            else:
+                ip, public_ports = "", [0] * len(private_ports)
+        except ValueError:
+            continue
+        ip = ip.strip("[]")
+        mappings.extend(PortMapping(private, protocol or "tcp", ip, public)
+                        for private, public in zip(private_ports, public_ports))
+    return tuple(dict.fromkeys(mappings))
+
+
+def format_ports(ports: Iterable[PortMapping]) -> str:
+    """
+    Format port mappings the way `docker ps` displays them.
+
+    Args:
+        ports (Iterable[PortMapping]): The mappings.
+
+    Returns:
+        str: The ports, e.g. "0.0.0.0:8080->80/tcp, 443/tcp".
+    """
+    displayed = []
+    for port in ports:
+        private = f"{port.private_port}/{port.protocol}"
+        if port.public_port:
+            host = f"[{port.ip}]" if ':' in port.ip else port.ip
+            displayed.append(f"{host}:{port.public_port}->{private}")
+        else:
+            displayed.append(private)
+    return ", ".join(displayed)
+
+
+def format_labels(labels: Optional[Dict[str, str]]) -> str:
+    """
+    Format a label map the way `--format {{json .}}` renders it.
+
+    Args:
+        labels (Optional[Dict[str, str]]): The labels.
+
+    Returns:
+        str: The comma-joined "key=value" pairs.
+    """
+    return ",".join(f"{key}={value}" for key, value in sorted((labels or {}).items()))
+
+
+def parse_labels(value: Optional[str]) -> Dict[str, str]:
+    """
+    Parse labels formatted by format_labels() or `--format {{json .}}` back into a map.
+
+    Commas inside label values cannot be told apart from separators; such values are cut short.
+
+    Args:
+        value (Optional[str]): The comma-joined "key=value" pairs.
+
+    Returns:
+        Dict[str, str]: The labels.
+    """
+    labels = {}
+    for pair in (value or "").split(","):
+        key, _, label_value = pair.partition("=")
+        if key:
+            labels[key] = label_value
+    return labels
+
+
+class LabelMap(Mapping):
+    """
+    An immutable, hashable label map with interned keys and values.
+
+    Label keys and values repeat across a listing (every container of a compose project
+    carries the same project, service and config labels), so interning them keeps large
+    inventories compact. Being hashable, a LabelMap can sit in a frozen model and in a
+    ColumnarSnapshot string table. str() gives the `--format {{json .}}` rendering.
+    """
+    __slots__ = ("_labels", "_hash")
+
+    def __init__(self, labels: Optional[Dict[str, str]] = None):
+        self._labels = {intern(key): intern(value or "") for key, value in sorted((labels or {}).items())}
+        self._hash = None
+
+    @classmethod
+    def parse(cls, value: Optional[str]) -> 'LabelMap':
+        """
+        Create a LabelMap from the comma-joined "key=value" pairs of `--format {{json .}}`.
+        """
+        return cls(parse_labels(value)) if value else EMPTY_LABELS
+
+    def __getitem__(self, key: str) -> str:
+        return self._labels[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._labels)
+
+    def __len__(self) -> int:
+        return len(self._labels)
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, LabelMap):
+            return self._labels == other._labels
+        return isinstance(other, Mapping) and self._labels == dict(other)
+
+    def __hash__(self) -> int:
+        if self._hash is None:
+            self._hash = hash(tuple(self._labels.items()))
+        return self._hash
+
+    def __repr__(self) -> str:
+        return f"LabelMap({self._labels!r})"
+
+    def __str__(self) -> str:
+        return format_labels(self._labels)
+
+
+EMPTY_LABELS = LabelMap()
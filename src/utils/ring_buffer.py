@@ -0,0 +1,137 @@
+import threading
+from array import array
+from collections import deque
+from typing import Deque, Dict, Generic, Iterable, Iterator, List, Optional, Sequence, TypeVar
+
+T = TypeVar("T")
+
+
+class RingBuffer(Generic[T]):
+    """
+    A fixed-capacity FIFO that drops its oldest items once full.
+
+    Memory stays bounded however long a stream runs; `dropped` counts what has been discarded.
+    """
+
+    def __init__(self, capacity: int):
+        """
+        Args:
+            capacity (int): The maximum number of items kept.
+        """
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self._items: Deque[T] = deque(maxlen=capacity)
+        self.dropped = 0
+
+    @property
+    def capacity(self) -> int:
+        return self._items.maxlen
+
+    def append(self, item: T) -> None:
+        if len(self._items) == self._items.maxlen:
+            self.dropped += 1
+        self._items.append(item)
+
+    def extend(self, items: Iterable[T]) -> None:
+        for item in items:
+            self.append(item)
+
+    def clear(self) -> None:
+        self._items.clear()
+        self.dropped = 0
+
+    def latest(self) -> Optional[T]:
+        return self._items[-1] if self._items else None
+
+    def snapshot(self) -> List[T]:
+        """
+        Copy the buffered items, oldest first.
+        """
+        return list(self._items)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __iter__(self) -> Iterator[T]:
+        return iter(self._items)
+
+
+class SeriesBuffer:
+    """
+    A fixed-capacity ring buffer of numeric samples, stored as one preallocated array per field.
+
+    Appending overwrites the oldest sample in place, so nothing is allocated once the buffer
+    exists. window() hands out memoryviews over the arrays instead of copies; they stay
+    valid until the buffer wraps around past them.
+    """
+
+    def __init__(self, fields: Sequence[str], capacity: int):
+        """
+        Args:
+            fields (Sequence[str]): The field names; the first one is the sample time and must not decrease.
+            capacity (int): The maximum number of samples kept.
+        """
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.fields = tuple(fields)
+        self.capacity = capacity
+        self._columns = {name: array("d", bytes(8 * capacity)) for name in self.fields}
+        self._next = 0
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def append(self, values: Sequence[float]) -> None:
+        """
+        Add a sample, given as one value per field in field order.
+        """
+        with self._lock:
+            for name, value in zip(self.fields, values):
+                self._columns[name][self._next] = value
+            self._next = (self._next + 1) % self.capacity
+            self._count = min(self._count + 1, self.capacity)
+
+    def latest(self) -> Optional[Dict[str, float]]:
+        """
+        Get the newest sample as a field -> value map, or None if the buffer is empty.
+        """
+        with self._lock:
+            if not self._count:
+                return None
+            index = (self._next - 1) % self.capacity
+            return {name: column[index] for name, column in self._columns.items()}
+
+    def window(self, name: str, since: Optional[float] = None) -> List[memoryview]:
+        """
+        Get the values of one field, oldest first, without copying them.
+
+        Args:
+            name (str): The field.
+            since (Optional[float]): Only include samples whose time (first field) is at least this; None for all.
+
+        Returns:
+            List[memoryview]: One or two consecutive segments (two when the window wraps around the end of the buffer).
+        """
+        with self._lock:
+            start = (self._next - self._count) % self.capacity
+            count = self._count
+            if since is not None:
+                times = self._columns[self.fields[0]]
+                # Samples are in time order from `start`, so bisect over the logical positions
+                low, high = 0, count
+                while low < high:
+                    middle = (low + high) // 2
+                    if times[(start + middle) % self.capacity] < since:
+                        low = middle + 1
+                    else:
+                        high = middle
+                start, count = (start + low) % self.capacity, count - low
+            view = memoryview(self._columns[name])
+        if not count:
+            return []
+        end = start + count
+        if end <= self.capacity:
+            return [view[start:end]]
+        return [view[start:], view[:end - self.capacity]]
@@ -0,0 +1,91 @@
+import json
+import logging
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Milestones of a cold start, in the order they usually happen
+IMPORTED = "imported"
+WINDOW_SHOWN = "window shown"
+FIRST_PAINT = "first paint"
+ENGINE_PROBED = "engine probed"
+FIRST_DATA = "first data"
+
+# Set to a file path to append every startup's trace to it as one JSON line
+TRACE_FILE_VARIABLE = "DOCKY_STARTUP_TRACE"
+
+
+class StartupTrace:
+    """
+    Records how long after launch each startup milestone was reached.
+
+    Only the first occurrence of a milestone counts, so any number of views can mark
+    FIRST_DATA and the earliest wins. Once FIRST_DATA is reached the trace is logged and, if
+    DOCKY_STARTUP_TRACE names a file, appended to it as one JSON line so startup times can
+    be compared across versions.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.perf_counter, final: str = FIRST_DATA,
+                 path: Optional[str] = None):
+        """
+        Args:
+            clock (Callable[[], float]): A monotonic clock in seconds.
+            final (str): The milestone that completes the trace.
+            path (Optional[str]): The file the completed trace is appended to, defaults to $DOCKY_STARTUP_TRACE.
+        """
+        self.clock = clock
+        self.final = final
+        self.path = path if path is not None else os.environ.get(TRACE_FILE_VARIABLE)
+        self.started = clock()
+        self._marks: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def mark(self, name: str) -> bool:
+        """
+        Record that a milestone was reached now, unless it already was.
+
+        Returns:
+            bool: True if this was the first time the milestone was reached.
+        """
+        with self._lock:
+            if name in self._marks:
+                return False
+            self._marks[name] = self.clock() - self.started
+        logger.info(f"Startup: {name} after {self._marks[name] * 1000:.0f} ms")
+        if name == self.final:
+            logger.info(f"Startup trace: {self.report()}")
+            self._write()
+        return True
+
+    def elapsed(self, name: str) -> Optional[float]:
+        """
+        Get the seconds from launch to a milestone, or None if it was not reached yet.
+        """
+        return self._marks.get(name)
+
+    def marks(self) -> List[Tuple[str, float]]:
+        """
+        Get the milestones reached so far with their times in seconds, earliest first.
+        """
+        with self._lock:
+            return sorted(self._marks.items(), key=lambda mark: mark[1])
+
+    def report(self) -> str:
+        return ", ".join(f"{name} {seconds * 1000:.0f} ms" for name, seconds in self.marks())
+
+    def _write(self) -> None:
+        if not self.path:
+            return
+        record = {"time": time.time(), "marks": {name: round(seconds, 4) for name, seconds in self.marks()}}
+        try:
+            with open(self.path, "a", encoding="utf-8") as trace_file:
+                trace_file.write(json.dumps(record) + "\n")
+        except OSError as e:
+            logger.warning(f"Failed to write startup trace to {self.path}: {e}")
+
+
+# Created on first import, which main.py does before anything else, so it times the imports too
+startup_trace = StartupTrace()
@@ -0,0 +1,122 @@
+import tarfile
+from typing import BinaryIO, Callable, Iterator, Optional
+
+BLOCK_SIZE = tarfile.BLOCKSIZE
+CHUNK_SIZE = 1024 * 1024
+END_OF_ARCHIVE = b"\0" * (2 * BLOCK_SIZE)
+
+
+class TarCancelled(Exception):
+    """
+    Raised inside a tar stream when its `cancelled` check turns true.
+    """
+
+
+def relative_name(name: str, root: str = "") -> str:
+    """
+    Strip the leading "./" and `root` directory from a member or file name.
+
+    Args:
+        name (str): The name, e.g. "from/a/b", "./a/b" or "/from/a/b".
+        root (str): The directory the names are relative to, e.g. "from".
+
+    Returns:
+        str: The relative name, e.g. "a/b", or "" for the root itself.
+    """
+    name = name.lstrip("/")
+    while name.startswith("./"):
+        name = name[2:]
+    if name == ".":
+        return ""
+    if root:
+        root = root.strip("/")
+        if name == root:
+            return ""
+        if name.startswith(root + "/"):
+            name = name[len(root) + 1:]
+    return name
+
+
+def _padding(size: int) -> bytes:
+    remainder = size % BLOCK_SIZE
+    return b"\0" * (BLOCK_SIZE - remainder) if remainder else b""
+
+
+def tar_file(name: str, data: bytes, mtime: float = 0.0, mode: int = 0o644) -> bytes:
+    """
+    Build a single regular-file tar member (header, data and padding), e.g. to prepend to a stream.
+    """
+    member = tarfile.TarInfo(name)
+    member.size = len(data)
+    member.mtime = mtime
+    member.mode = mode
+    return member.tobuf(tarfile.PAX_FORMAT) + data + _padding(len(data))
+
+
+def repack_tar(source: BinaryIO, keep: Callable[[tarfile.TarInfo], bool] = lambda member: True,
+               root: str = "", prefix: bytes = b"", chunk_size: int = CHUNK_SIZE,
+               on_data: Optional[Callable[[tarfile.TarInfo, int], None]] = None,
+               on_dropped: Optional[Callable[[tarfile.TarInfo, Optional[BinaryIO]], None]] = None,
+               cancelled: Optional[Callable[[], bool]] = None, terminate: bool = True) -> Iterator[bytes]:
+    """
+    Re-stream a tar archive, dropping members and renaming the rest relative to `root`.
+
+    The source is read sequentially and the output is produced chunk by chunk, so memory use
+    does not depend on the size of the archive or of any file in it.
+
+    Args:
+        source (BinaryIO): The archive, read with `read()` only (e.g. a DockerStream).
+        keep (Callable[[tarfile.TarInfo], bool]): Whether to pass a member on; gets the member with its relative name.
+        root (str): The directory to strip from member names; the root member itself is dropped.
+        prefix (bytes): Members (as built by tar_file()) to emit before the archive's own.
+        chunk_size (int): The size of the data chunks read and yielded.
+        on_data (Optional[Callable[[tarfile.TarInfo, int], None]]): Called with each kept member and the number of its
+            data bytes just passed on; called once with 0 for members without data.
+        on_dropped (Optional[Callable[[tarfile.TarInfo, Optional[BinaryIO]], None]]): Called with each member
+            `keep` rejected and, for regular files, a reader of its data, e.g. to pick up a manifest.
+        cancelled (Optional[Callable[[], bool]]): Checked between chunks; when it returns True the stream raises
+            TarCancelled before the end-of-archive marker, so the output is left truncated.
+        terminate (bool): If False, leave out the end-of-archive marker so the caller can append members.
+
+    Yields:
+        bytes: The new archive.
+    """
+    if prefix:
+        yield prefix
+    with tarfile.open(fileobj=source, mode="r|") as archive:
+        for member in archive:
+            if cancelled is not None and cancelled():
+                raise TarCancelled()
+            name = relative_name(member.name, root)
+            if not name:
+                continue
+            member.name = name
+            if member.islnk():
+                member.linkname = relative_name(member.linkname, root)
+            if not keep(member):
+                if on_dropped is not None:
+                    on_dropped(member, archive.extractfile(member) if member.isreg() else None)
+                continue
+            yield member.tobuf(tarfile.PAX_FORMAT)
+            if not member.isreg() or member.size == 0:
+                if on_data is not None:
+                    on_data(member, 0)
+                continue
+
+            data = archive.extractfile(member)
+            remaining = member.size
+            while remaining > 0:
+                if cancelled is not None and cancelled():
+                    raise TarCancelled()
+                chunk = data.read(min(chunk_size, remaining))
+                if not chunk:
+                    raise tarfile.ReadError(f"Unexpected end of archive in {name}")
+                remaining -= len(chunk)
+                yield chunk
+                if on_data is not None:
+                    on_data(member, len(chunk))
+            padding = _padding(member.size)
+            if padding:
+                yield padding
+    if terminate:
+        yield END_OF_ARCHIVE
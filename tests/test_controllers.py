@@ -0,0 +1,267 @@
+import json
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from src.core.docker_client import DockerClientError
+from src.core.label_index import COMPOSE_PROJECT, LabelIndex, parse_selector
+from src.core.layer_index import LayerIndex, LayerSelection, SpaceReport
+from src.core.log_cache import ContainerLogCache
+from src.core.search_index import EXACT, NAME, OTHER, PREFIX, SearchIndex
+from src.core.services.container_service import LogLine
+from src.core.state_store import CONTAINER, NETWORK, REMOVE, RESET, UPSERT, ResourceSource, StateStore
+from src.utils.startup_trace import FIRST_DATA, FIRST_PAINT, IMPORTED, StartupTrace
+
+
+class FakeDaemonState:
+    def __init__(self, containers):
+        self.containers = dict(containers)
+        self.fetches = []
+
+    def source(self):
+        return ResourceSource(
+            snapshot=lambda: {key: SimpleNamespace(id=key, state=state) for key, state in self.containers.items()},
+            fetch=self.fetch,
+            key=lambda container: container.id,
+        )
+
+    def fetch(self, key):
+        self.fetches.append(key)
+        state = self.containers.get(key)
+        return None if state is None else SimpleNamespace(id=key, state=state)
+
+
+def event(action, actor_id, kind="container"):
+    return {"Type": kind, "Action": action, "Actor": {"ID": actor_id, "Attributes": {}}}
+
+
+def test_state_store_applies_replayed_events_incrementally():
+    daemon = FakeDaemonState({"a": "running", "b": "exited"})
+    store = StateStore(sources={CONTAINER: daemon.source()})
+    changes = []
+    store.subscribe(changes.append)
+
+    store.resync()
+    daemon.containers.update({"b": "running", "c": "created"})
+    del daemon.containers["a"]
+    store.replay([
+        event("start", "b"),
+        event("exec_start: sh -c true", "b"),
+        event("create", "c"),
+        event("destroy", "a"),
+        event("create", "ignored", kind="plugin"),
+    ])
+
+    assert [(change.action, change.key) for change in changes] == [
+        (RESET, None), (UPSERT, "b"), (UPSERT, "c"), (REMOVE, "a"),
+    ]
+    # Only the objects named by events were reloaded, and destroy needed no round trip
+    assert daemon.fetches == ["b", "c"]
+    assert sorted((c.id, c.state) for c in store.get_containers()) == [("b", "running"), ("c", "created")]
+
+
+def test_state_store_drops_objects_that_vanish_before_refetch():
+    daemon = FakeDaemonState({"a": "running"})
+    store = StateStore(sources={CONTAINER: daemon.source()})
+    store.resync()
+    daemon.containers.clear()
+
+    change = store.apply_event(event("die", "a"))
+
+    assert change.action == REMOVE
+    assert store.get_containers() == []
+
+
+def test_state_store_refreshes_containers_on_network_connect_events():
+    daemon = FakeDaemonState({"a": "running"})
+    networks = ResourceSource(snapshot=dict, fetch=lambda key: None, key=lambda network: network.id)
+    store = StateStore(sources={CONTAINER: daemon.source(), NETWORK: networks})
+    store.resync()
+    connect = {"Type": "network", "Action": "connect",
+               "Actor": {"ID": "net1", "Attributes": {"container": "a", "name": "backend"}}}
+
+    change = store.apply_event(connect)
+
+    assert (change.kind, change.action, change.key) == (CONTAINER, UPSERT, "a")
+    assert daemon.fetches == ["a"]
+
+
+def test_state_store_keeps_resources_when_the_daemon_cannot_be_asked():
+    daemon = FakeDaemonState({"a": "running"})
+    store = StateStore(sources={CONTAINER: daemon.source()})
+    store.resync()
+    changes = []
+    store.subscribe(changes.append)
+
+    def fail(*args):
+        raise DockerClientError("connection refused")
+
+    store.sources = {CONTAINER: daemon.source()._replace(snapshot=fail, fetch=fail)}
+    with pytest.raises(DockerClientError):
+        store.resync()
+    assert store.apply_event(event("die", "a")) is None
+
+    # Neither a failed snapshot nor a failed reload is taken for an empty daemon
+    assert changes == []
+    assert [c.id for c in store.get_containers()] == ["a"]
+
+
+def test_log_cache_seeks_searches_and_evicts(tmp_path):
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    lines = [LogLine("stderr" if i % 10 == 0 else "stdout", f"request {i} done", start + timedelta(seconds=i))
+             for i in range(1000)]
+    cache = ContainerLogCache("web", root=str(tmp_path), segment_bytes=8 * 1024, max_bytes=10 ** 6)
+    assert cache.append(lines) == 1000
+    cache.close()
+
+    # Reopened from disk: sealed segments load their indexes, the active one is rebuilt
+    cache = ContainerLogCache("web", root=str(tmp_path), segment_bytes=8 * 1024, max_bytes=32 * 1024)
+    window = cache.read_range(start + timedelta(seconds=500), start + timedelta(seconds=502))
+    assert [line.text for line in window] == ["request 500 done", "request 501 done", "request 502 done"]
+    assert window[0].stream == "stderr"
+    assert [line.text for line in cache.search("REQUEST 77")] == \
+        [f"request {i} done" for i in [77] + list(range(770, 780))]
+
+    cache.append([LogLine("stdout", "late", start + timedelta(seconds=5000))])
+    assert cache.size() <= 32 * 1024 + 8 * 1024
+    assert cache.read_range(end=start + timedelta(seconds=100)) == []
+    assert cache.last_timestamp() == start + timedelta(seconds=5000)
+    cache.close()
+
+
+def test_log_cache_finds_multiline_entries_as_they_were_written(tmp_path):
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    lines = [LogLine("stdout", "Traceback:\n  KeyError" if i == 3 else f"tick {i}", start + timedelta(seconds=i))
+             for i in range(200)]
+    cache = ContainerLogCache("web", root=str(tmp_path), max_bytes=10 ** 6)
+    cache.append(lines)
+
+    # The entry sits in an indexed block, so only the trigram index can lead the search to it
+    assert [line.text for line in cache.search("traceback:   keyerror")] == ["Traceback:   KeyError"]
+    cache.close()
+
+
+def test_layer_selection_tracks_reclaimable_space():
+    layers = {
+        "app": [("base", 100), ("runtime", 50), ("app", 10)],
+        "worker": [("base", 100), ("runtime", 50), ("worker", 20)],
+        "tool": [("base", 100), ("tool", 5)],
+    }
+    index = LayerIndex(fetch_layers=layers.get)
+    assert index.refresh(layers) == 3
+    assert index.total_size() == 185
+
+    selection = LayerSelection(index)
+    selection.add("app")
+    assert selection.report() == SpaceReport(1, 160, 10, 150)
+    selection.update(["app", "worker"])
+    assert selection.report() == SpaceReport(2, 180, 80, 100)
+    selection.update(["app", "worker", "tool"])
+    assert selection.report().unique_bytes == 185
+    selection.discard("tool")
+    assert index.report(["app", "worker"]) == selection.report()
+
+    # Only new images are fetched; removed ones drop out of the index
+    del layers["tool"]
+    assert index.refresh(layers) == 0
+    assert index.report(["app", "worker"]).unique_bytes == 180
+
+
+def test_search_index_ranks_matches_and_follows_the_store():
+    def container(key, name, image, labels=None):
+        return SimpleNamespace(id=key * 16, name=name, image=image, label_map=labels or {})
+
+    containers = {
+        "a": container("a", "web", "nginx:latest", {"env": "prod", "team": "shop"}),
+        "b": container("b", "web-worker", "python:3.11", {"env": "dev"}),
+        "c": container("c", "api", "web-base:1", {"env": "prod"}),
+        "d": container("d", "old-web", "nginx:1.25"),
+    }
+    store = StateStore(sources={CONTAINER: ResourceSource(
+        snapshot=lambda: dict(containers), fetch=containers.get, key=lambda resource: resource.id[0])})
+    store.resync()
+    index = SearchIndex()
+    index.attach(store)
+
+    assert [(hit.key, hit.rank) for hit in index.search("WEB")] == [
+        ("a", EXACT), ("b", PREFIX), ("d", NAME), ("c", OTHER)]
+    assert [hit.key for hit in index.search("web env=prod")] == ["a", "c"]
+    assert [hit.key for hit in index.search("team=")] == ["a"]
+    assert [hit.key for hit in index.search("bbbbbbbbbbbbbbbb")] == ["b"]
+    assert len(index.search("web", limit=2)) == 2
+    assert index.search("web env=staging") == []
+
+    containers["e"] = container("e", "webhook", "alpine")
+    del containers["a"]
+    store.replay([event("create", "e"), event("destroy", "a")])
+
+    assert [hit.key for hit in index.search("web")] == ["b", "e", "d", "c"]
+
+
+def test_search_index_reset_mixes_new_renamed_and_removed_resources():
+    def containers(names):
+        return {key: SimpleNamespace(id=key * 64, name=name, image="alpine", label_map={})
+                for key, name in names.items()}
+
+    index = SearchIndex()
+    index.reset(CONTAINER, containers({f"{i:x}": f"svc-{i}" for i in range(100)}))
+    # New keys and renamed ones interleaved, and every tenth key gone
+    renamed = {f"{i:x}": f"renamed-{i}" for i in range(100) if i % 10}
+    renamed.update({f"{i:x}": f"new-{i}" for i in range(100, 150)})
+    index.reset(CONTAINER, containers(renamed))
+
+    assert len(index) == 140
+    assert len(index._prefixes) == len(index) * 2  # A name and an ID each
+    assert index._prefixes == sorted(index._prefixes)
+    assert [hit.name for hit in index.search("renamed-1", limit=3)] == ["renamed-1", "renamed-11", "renamed-12"]
+    assert index.search("svc") == []
+    # Terms shorter than a trigram still only match where they occur
+    assert {hit.name for hit in index.search("w-", limit=100)} == {f"new-{i}" for i in range(100, 150)}
+    assert index.search("zz") == []
+
+
+def test_label_index_answers_selectors_and_groups():
+    index = LabelIndex(labels_of=lambda labels: labels)
+    index.reset({
+        "web": {COMPOSE_PROJECT: "shop", "tier": "front", "env": "prod"},
+        "api": {COMPOSE_PROJECT: "shop", "tier": "back", "env": "prod"},
+        "db": {COMPOSE_PROJECT: "shop", "tier": "data", "env": "prod", "canary": ""},
+        "blog": {COMPOSE_PROJECT: "blog", "env": "dev"},
+        "tool": {},
+    })
+
+    assert index.select(parse_selector(f"{COMPOSE_PROJECT}=shop")) == {"web", "api", "db"}
+    assert index.select(parse_selector("tier in (front, back), !canary")) == {"web", "api"}
+    assert index.select(parse_selector("env!=prod")) == {"blog", "tool"}
+    assert index.select(parse_selector("canary")) == {"db"}
+    assert index.select(parse_selector("tier notin (data),env=prod")) == {"web", "api"}
+    assert index.group_by(COMPOSE_PROJECT) == {"shop": {"web", "api", "db"}, "blog": {"blog"}, None: {"tool"}}
+    with pytest.raises(ValueError):
+        parse_selector("tier in (front")
+
+    index.add("api", {COMPOSE_PROJECT: "blog"})
+    index.remove("web")
+
+    assert index.counts(COMPOSE_PROJECT) == {"shop": 1, "blog": 2}
+    assert "tier" in index.keys() and "web" not in index
+
+
+def test_startup_trace_keeps_first_marks_and_appends_completed_traces(tmp_path):
+    now = [10.0]
+    path = tmp_path / "startup.jsonl"
+    trace = StartupTrace(clock=lambda: now[0], path=str(path))
+
+    now[0] = 10.25
+    assert trace.mark(IMPORTED)
+    now[0] = 10.5
+    trace.mark(FIRST_PAINT)
+    now[0] = 11.0
+    assert not trace.mark(IMPORTED)
+    trace.mark(FIRST_DATA)
+    trace.mark(FIRST_DATA)
+
+    assert trace.marks() == [(IMPORTED, 0.25), (FIRST_PAINT, 0.5), (FIRST_DATA, 1.0)]
+    assert trace.report() == "imported 250 ms, first paint 500 ms, first data 1000 ms"
+    lines = path.read_text().splitlines()
+    assert len(lines) == 1 and json.loads(lines[0])["marks"] == {IMPORTED: 0.25, FIRST_PAINT: 0.5, FIRST_DATA: 1.0}
@@ -0,0 +1,796 @@
+import asyncio
+import io
+import json
+import socketserver
+import struct
+import tarfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler
+from types import SimpleNamespace
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from src.core import image_gc
+from src.core.disk_usage import DiskUsageIndex, disk_usage_index
+from src.core.docker_client import DockerClient, DockerClientError, api_request, get_client, set_client
+from src.core.engine_monitor import DEGRADED, DOWN, STARTING, UP, EngineMonitor
+from src.core.inspect_cache import InspectCache, inspect_cache
+from src.core.network_topology import TopologyIndex
+from src.core.services import container_service, image_service, network_service, system_service, volume_service
+from src.core.stats_collector import StatsCollector
+from src.utils.ring_buffer import RingBuffer
+
+CONTAINER_SUMMARY = {
+    "Id": "8dfafdbc3a40" + "0" * 52,
+    "Names": ["/web", "/proxy/web"],
+    "Image": "nginx:latest",
+    "Command": "nginx -g 'daemon off;'",
+    "Created": 1721731309,
+    "Ports": [{"IP": "0.0.0.0", "PrivatePort": 80, "PublicPort": 8080, "Type": "tcp"}],
+    "Labels": {"com.docker.compose.project": "shop"},
+    "State": "running",
+    "Status": "Up 2 hours",
+    "NetworkSettings": {"Networks": {"bridge": {}}},
+    "Mounts": [{"Name": "web-data", "Source": "/var/lib/docker/volumes/web-data/_data"}],
+}
+
+
+class FakeDaemonHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        self.server.connections += 1
+
+    def log_message(self, format, *args):
+        pass
+
+    def handle_one_request(self):
+        # Unix socket peers have no address; keep the base class from formatting one
+        self.client_address = ("fake-daemon", 0)
+        super().handle_one_request()
+
+    def _read_body(self):
+        if self.headers.get("Transfer-Encoding") != "chunked":
+            length = int(self.headers.get("Content-Length") or 0)
+            return self.rfile.read(length) if length else b""
+        chunks = []
+        while True:
+            size = int(self.rfile.readline().split(b";")[0], 16)
+            chunks.append(self.rfile.read(size))
+            self.rfile.readline()
+            if size == 0:
+                return b"".join(chunks)
+
+    def _respond(self):
+        body = self._read_body()
+        self.server.requests.append((self.command, self.path, body))
+        status, content_type, payload = self.server.routes.get(
+            (self.command, self.path.split("?")[0]),
+            (404, "application/json", json.dumps({"message": "page not found"}).encode()),
+        )
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    do_GET = do_POST = do_PUT = do_DELETE = _respond
+
+
+class FakeDaemon(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, path):
+        super().__init__(path, FakeDaemonHandler)
+        self.connections = 0
+        self.requests = []
+        self.routes = {}
+
+    def route(self, method, path, payload, status=200, content_type="application/json"):
+        if not isinstance(payload, bytes):
+            payload = json.dumps(payload).encode()
+        self.routes[(method, path)] = (status, content_type, payload)
+
+
+@pytest.fixture
+def daemon(tmp_path):
+    socket_path = str(tmp_path / "docker.sock")
+    server = FakeDaemon(socket_path)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    set_client(DockerClient(f"unix://{socket_path}"))
+    inspect_cache.clear()
+    disk_usage_index.invalidate()
+    yield server
+    set_client(None)
+    server.shutdown()
+    server.server_close()
+
+
+def test_get_containers_builds_models_from_api(daemon):
+    daemon.route("GET", "/containers/json", [CONTAINER_SUMMARY])
+
+    containers = container_service.get_containers()
+
+    assert len(containers) == 1
+    container = containers[0]
+    assert container.name == "web"
+    assert container.ports == "0.0.0.0:8080->80/tcp"
+    assert container.labels == "com.docker.compose.project=shop"
+    assert container.networks == "bridge"
+    assert container.mounts == "web-data"
+    assert container.to_tuple()[:3] == ("web", "nginx:latest", "running")
+    assert daemon.requests[0][1] == "/containers/json?all=1"
+
+
+def test_iter_containers_parses_rows_as_they_are_consumed(daemon):
+    broken = {key: value for key, value in CONTAINER_SUMMARY.items() if key != "Image"}
+    daemon.route("GET", "/containers/json", [CONTAINER_SUMMARY, broken, dict(CONTAINER_SUMMARY, Id="db")])
+
+    containers = container_service.iter_containers()
+    assert not daemon.requests  # Nothing is fetched before the first row is asked for
+    assert next(containers).id == CONTAINER_SUMMARY["Id"]
+    # A row that cannot be parsed is skipped, not the rest of the listing
+    assert [container.id for container in containers] == ["db"]
+    assert len(daemon.requests) == 1
+
+    daemon.route("GET", "/containers/json", {"message": "server error"}, status=500)
+    assert list(container_service.iter_containers()) == []
+
+
+def test_requests_reuse_keep_alive_connection(daemon):
+    daemon.route("GET", "/containers/json", [CONTAINER_SUMMARY])
+    daemon.route("GET", "/volumes", {"Volumes": [], "Warnings": None})
+
+    for _ in range(5):
+        container_service.get_containers()
+        volume_service.get_volumes()
+
+    assert len(daemon.requests) == 10
+    assert daemon.connections == 1
+
+
+def test_streamed_bodies_are_never_resent_on_a_stale_connection(daemon):
+    daemon.route("POST", "/build", {})
+    client = get_client()
+
+    class StaleConnection:
+        sent = 0
+        sock = None
+
+        def request(self, *args, **kwargs):
+            self.sent += 1
+            raise ConnectionResetError("closed by peer")
+
+        def close(self):
+            pass
+
+    stale = StaleConnection()
+    client._idle.append(stale)
+    client.request("POST", "/build", body=iter([b"tar ", b"stream"]))
+    assert stale.sent == 0 and daemon.requests[-1][2] == b"tar stream"
+
+    # A body in memory is simply sent again on a fresh connection
+    client.close()
+    client._idle.append(stale)
+    client.request("POST", "/build", body=b"context")
+    assert stale.sent == 1 and daemon.requests[-1][2] == b"context"
+
+
+def test_error_status_is_reported_as_failure(daemon):
+    daemon.route("POST", "/containers/missing/start", {"message": "No such container: missing"}, status=404)
+
+    success, output = api_request("POST", "/containers/missing/start")
+
+    assert not success
+    assert "No such container: missing" in output
+    assert container_service.start_container("missing") is False
+
+
+def test_unreachable_daemon_is_reported_as_failure(tmp_path):
+    set_client(DockerClient(f"unix://{tmp_path / 'absent.sock'}"))
+    try:
+        assert container_service.get_containers() == []
+    finally:
+        set_client(None)
+
+
+def test_container_logs_are_split_by_stream_across_frames(daemon):
+    frames = b"".join(
+        struct.pack(">BxxxL", stream, len(text)) + text
+        for stream, text in [(1, b"listen"), (2, b"warning\n"), (1, b"ing\n")]
+    )
+    daemon.route("GET", "/containers/web/logs", frames, content_type="application/vnd.docker.multiplexed-stream")
+
+    # A line split over two stdout frames comes out whole, after the stderr line in between
+    assert list(container_service.stream_container_logs("web", tail=10)) == [
+        container_service.LogLine(container_service.STDERR, "warning", None),
+        container_service.LogLine(container_service.STDOUT, "listening", None),
+    ]
+    assert container_service.get_container_logs("web", tail=10) == "warning\nlistening"
+    assert "tail=10" in daemon.requests[0][1]
+
+
+def test_fetch_all_gathers_every_resource_kind(daemon):
+    daemon.route("GET", "/containers/json", [CONTAINER_SUMMARY])
+    daemon.route("GET", "/images/json", [])
+    daemon.route("GET", "/volumes", {"Volumes": [
+        {"Name": "web-data", "Driver": "local", "Mountpoint": "/data", "Labels": None, "Scope": "local"},
+    ]})
+    daemon.route("GET", "/networks", [])
+
+    snapshot = asyncio.run(system_service.fetch_all(max_concurrency=2))
+
+    assert [container.name for container in snapshot.containers] == ["web"]
+    assert [volume.name for volume in snapshot.volumes] == ["web-data"]
+    assert snapshot.images == [] and snapshot.networks == []
+
+
+def test_async_operations_report_success_and_failure_like_the_sync_ones(daemon):
+    daemon.route("POST", "/containers/web/start", b"", status=204)
+    daemon.route("POST", "/containers/web/stop", {"message": "cannot stop container: permission denied"}, status=500)
+    daemon.route("DELETE", "/containers/web", b"", status=204)
+    daemon.route("DELETE", "/images/nginx:latest", {"message": "image is in use by a container"}, status=409)
+    daemon.route("DELETE", "/networks/backend", b"", status=204)
+    daemon.route("DELETE", "/volumes/web-data", {"message": "volume is in use"}, status=409)
+
+    async def run():
+        return await asyncio.gather(
+            container_service.start_container_async("web"),
+            container_service.stop_container_async("web"),
+            container_service.remove_container_async("web", force=True),
+            container_service.start_container_async("missing"),
+            image_service.remove_image_async("nginx:latest"),
+            network_service.remove_network_async("backend"),
+            volume_service.remove_volume_async("web-data"),
+        )
+
+    assert asyncio.run(run()) == [True, False, True, False, False, True, False]
+    assert ("DELETE", "/containers/web?force=1", b"") in daemon.requests
+
+
+def test_inspect_is_cached_until_an_operation_invalidates_it(daemon):
+    daemon.route("GET", "/containers/json", [CONTAINER_SUMMARY])
+    daemon.route("POST", f"/containers/{CONTAINER_SUMMARY['Id']}/start", b"", status=204)
+
+    assert container_service.get_container_by_id(CONTAINER_SUMMARY["Id"]).name == "web"
+    assert container_service.get_container_by_id(CONTAINER_SUMMARY["Id"]).name == "web"
+    assert len(daemon.requests) == 1
+
+    assert container_service.start_container(CONTAINER_SUMMARY["Id"])
+    container_service.get_container_by_id(CONTAINER_SUMMARY["Id"])
+    assert len(daemon.requests) == 3
+
+
+def test_inspect_cache_expires_evicts_and_coalesces():
+    now = [0.0]
+    cache = InspectCache(max_entries=2, ttl=5.0, clock=lambda: now[0])
+    calls = []
+
+    def slow_fetch():
+        calls.append(1)
+        # Hold the fetch open until the other three lookups are waiting on it
+        deadline = time.monotonic() + 5
+        while cache.stats().coalesced < 3 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        return {"Id": "abc"}
+
+    threads = [threading.Thread(target=cache.get_or_fetch, args=("container", "abc", slow_fetch)) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(calls) == 1
+
+    now[0] = 6.0
+    cache.get_or_fetch("container", "abc", lambda: {"Id": "abc"})
+    cache.get_or_fetch("container", "def", lambda: {"Id": "def"})
+    cache.get_or_fetch("container", "ghi", lambda: {"Id": "ghi"})
+
+    stats = cache.stats()
+    assert (stats.misses, stats.coalesced, stats.expirations, stats.evictions, stats.size) == (4, 3, 1, 1, 2)
+
+
+def test_inspect_cache_invalidates_names_exactly_and_ids_by_prefix(daemon):
+    cache = InspectCache()
+    full_id = CONTAINER_SUMMARY["Id"]
+    cache.put("container", "web", {"Id": full_id, "Names": ["/web"]})
+    cache.put("container", "web-2", {"Id": "ab" * 32, "Names": ["/web-2"]})
+
+    cache.invalidate("container", "web")
+    assert cache.get("container", "web") is None
+    assert cache.get("container", "web-2") is not None
+
+    cache.put("container", "web", {"Id": full_id, "Names": ["/web"]})
+    cache.invalidate("container", full_id[:12])
+    assert cache.get("container", "web") is None
+    assert cache.get("container", "web-2") is not None
+
+    # Regex characters in a name are matched literally by the name filter
+    daemon.route("GET", "/containers/json", [])
+    assert container_service.get_container_by_id("web.1+x") is None
+    filters = json.loads(parse_qs(urlparse(daemon.requests[-1][1]).query)["filters"][0])
+    assert filters == {"name": [r"^/web\.1\+x$"]}
+
+
+def test_inspect_containers_reports_failures_per_id(daemon):
+    daemon.route("GET", "/containers/json", [CONTAINER_SUMMARY])
+
+    result = container_service.inspect_containers(["8dfafdbc3a40", "web", "missing"], chunk_size=2)
+
+    assert sorted(result.found) == ["8dfafdbc3a40", "web"]
+    assert result.found["web"].id == CONTAINER_SUMMARY["Id"]
+    assert result.errors == {"missing": "No such container: missing"}
+    # One id lookup per chunk, plus a name lookup for each chunk with unmatched IDs
+    assert len(daemon.requests) == 4
+
+
+def test_bulk_stop_reports_outcome_per_container(daemon):
+    daemon.route("POST", "/containers/web/stop", b"", status=204)
+    daemon.route("POST", "/containers/db/stop", b"", status=304)
+    daemon.route("POST", "/containers/missing/stop", {"message": "No such container: missing"}, status=404)
+    progress = []
+
+    result = container_service.stop_containers(["web", "db", "missing", "web"], grace_period=1, max_workers=2,
+                                               on_progress=lambda *update: progress.append(update))
+
+    assert sorted(result.succeeded) == ["db", "web"]
+    assert result.failed == {"missing": "No such container: missing"}
+    assert result.timed_out == []
+    assert sorted(key for key, _, _ in progress) == ["db", "missing", "web"]
+    assert all("t=1" in path for _, path, _ in daemon.requests)
+
+
+def test_bulk_stop_waits_out_grace_periods_together_with_a_bounded_timeout(monkeypatch):
+    calls = []
+    monkeypatch.setattr(container_service, "_container_operation",
+                        lambda container_id, method, path, params, timeout: calls.append(timeout) or ("succeeded", ""))
+    workers = []
+    real_run_bulk = container_service.run_bulk
+    monkeypatch.setattr(container_service, "run_bulk",
+                        lambda keys, operation, max_workers, on_progress: workers.append(max_workers)
+                        or real_run_bulk(keys, operation, max_workers, on_progress))
+
+    container_service.stop_containers([f"c{i}" for i in range(100)])
+    container_service.stop_containers(["web"], grace_period=30)
+
+    assert workers == [container_service.MAX_STOP_WORKERS, 1]
+    expected = container_service.DEFAULT_STOP_GRACE_PERIOD + container_service.DEFAULT_TIMEOUT
+    assert set(calls[:100]) == {expected} and calls[100] == 30 + container_service.DEFAULT_TIMEOUT
+
+
+def test_stream_container_logs_yields_tagged_lines(daemon):
+    frames = b"".join(
+        struct.pack(">BxxxL", stream, len(text)) + text
+        for stream, text in [
+            (1, b"2024-07-23T10:00:00.123456789Z listening\n"),
+            (2, b"2024-07-23T10:00:01Z warn"),
+            (2, b"ing\n"),
+        ]
+    )
+    daemon.route("GET", "/containers/web/logs", frames, content_type="application/vnd.docker.multiplexed-stream")
+
+    lines = list(container_service.stream_container_logs("web", timestamps=True, since=1721728800, tail=5))
+
+    assert [(line.stream, line.text) for line in lines] == [("stdout", "listening"), ("stderr", "warning")]
+    assert lines[0].timestamp.timestamp() == pytest.approx(1721728800.123456)
+    assert "since=1721728800" in daemon.requests[0][1] and "timestamps=1" in daemon.requests[0][1]
+
+
+def test_ring_buffer_keeps_latest_items():
+    buffer = RingBuffer(3)
+    buffer.extend(range(5))
+
+    assert buffer.snapshot() == [2, 3, 4]
+    assert buffer.dropped == 2
+
+
+def _stats_payload(total_usage, system_usage):
+    return {
+        "cpu_stats": {"cpu_usage": {"total_usage": total_usage}, "system_cpu_usage": system_usage, "online_cpus": 2},
+        "memory_stats": {"usage": 300, "limit": 1000, "stats": {"inactive_file": 100}},
+        "networks": {"eth0": {"rx_bytes": 10, "tx_bytes": 20}, "eth1": {"rx_bytes": 1, "tx_bytes": 2}},
+    }
+
+
+def test_stats_collector_computes_cpu_from_consecutive_samples(daemon):
+    daemon.route("GET", "/containers/json", [CONTAINER_SUMMARY])
+    stats_path = f"/containers/{CONTAINER_SUMMARY['Id']}/stats"
+    now = [100.0]
+    collector = StatsCollector(capacity=4, clock=lambda: now[0])
+
+    daemon.route("GET", stats_path, _stats_payload(1000, 10000))
+    assert collector.collect_once() == 1
+    now[0] = 102.0
+    daemon.route("GET", stats_path, _stats_payload(1500, 12000))
+    collector.collect_once()
+
+    sample = collector.latest(CONTAINER_SUMMARY["Id"])
+    assert sample.cpu_percent == pytest.approx(50.0)
+    assert (sample.memory_bytes, sample.memory_percent, sample.network_rx_bytes) == (200, 20.0, 11)
+    assert [list(segment) for segment in collector.window(CONTAINER_SUMMARY["Id"], "cpu_percent", 1)] == [[50.0]]
+    assert "one-shot=1" in daemon.requests[-1][1]
+
+    daemon.route("GET", "/containers/json", [])
+    collector.collect_once()
+    assert collector.container_ids() == [] and collector.totals() is None
+
+
+def test_volume_usage_is_served_from_one_disk_usage_report(daemon):
+    daemon.route("GET", "/system/df", {
+        "LayersSize": 1000,
+        "Volumes": [
+            {"Name": f"data-{index}", "Driver": "local", "Mountpoint": f"/data/{index}", "Scope": "local",
+             "UsageData": {"Size": 1500 * index, "RefCount": 1}}
+            for index in range(3)
+        ] + [{"Name": "broken"}],
+        "Containers": [dict(CONTAINER_SUMMARY, SizeRw=2000)],
+        "BuildCache": [{"ID": "abc", "Size": 300, "Shared": False}, {"ID": "def", "Size": 100, "Shared": True}],
+    })
+
+    assert [volume_service.get_volume_usage(f"data-{index}") for index in range(3)] == ["0B", "1.5kB", "3kB"]
+    assert volume_service.get_volume_usage("missing") is None
+    usage = system_service.get_disk_usage()
+    assert (usage.volumes_size, usage.containers_size, usage.build_cache_size) == (4500, 2000, 300)
+    assert len(daemon.requests) == 1
+
+
+def test_disk_usage_index_refreshes_after_interval():
+    now = [0.0]
+    reports = []
+
+    def fetch():
+        reports.append(SimpleNamespace(taken_at=now[0]))
+        return reports[-1]
+
+    index = DiskUsageIndex(refresh_interval=10.0, fetch=fetch, clock=lambda: now[0])
+    assert index.get() is index.get()
+    now[0] = 11.0
+    assert index.get() is reports[1]
+    assert index.get(max_age=0) is reports[2]
+
+
+def _tar(files):
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w") as archive:
+        for name, data in files:
+            member = tarfile.TarInfo(name)
+            if data is None:
+                member.type = tarfile.DIRTYPE
+                archive.addfile(member)
+            else:
+                member.size, member.mtime = len(data), 1700000000
+                archive.addfile(member, io.BytesIO(data))
+    return buffer.getvalue()
+
+
+def test_incremental_volume_copy_streams_only_changed_files(daemon):
+    daemon.route("POST", "/containers/create", {"Id": "helper"}, status=201)
+    daemon.route("POST", "/containers/helper/start", b"", status=204)
+    daemon.route("POST", "/containers/helper/wait", {"StatusCode": 0})
+    daemon.route("DELETE", "/containers/helper", b"", status=204)
+    manifest = b"3 1700000000 /from/a.txt\n5 1700000000 /from/sub/b.txt\n3 1700000000 /to/a.txt\n"
+    daemon.route("GET", "/containers/helper/logs", struct.pack(">BxxxL", 1, len(manifest)) + manifest,
+                 content_type="application/vnd.docker.multiplexed-stream")
+    daemon.route("GET", "/containers/helper/archive", _tar([
+        ("from", None), ("from/a.txt", b"abc"), ("from/sub", None), ("from/sub/b.txt", b"hello"),
+    ]), content_type="application/x-tar")
+    daemon.route("PUT", "/containers/helper/archive", b"")
+    progress = []
+
+    assert volume_service.copy_volume("src", "dst", incremental=True, on_progress=progress.append)
+
+    upload = next(body for method, _, body in daemon.requests if method == "PUT")
+    with tarfile.open(fileobj=io.BytesIO(upload)) as archive:
+        assert archive.getnames() == [volume_service.COPY_MARKER, "sub", "sub/b.txt"]
+        assert archive.extractfile("sub/b.txt").read() == b"hello"
+    assert progress[-1] == volume_service.CopyProgress(1, 1, 5, 5)
+    # The marker is only removed by starting the copy helper after the upload
+    assert [path for method, path, _ in daemon.requests if method == "POST"][-1] == "/containers/helper/wait"
+
+
+def test_cancelled_volume_copy_reports_failure(daemon):
+    daemon.route("POST", "/containers/create", {"Id": "helper"}, status=201)
+    daemon.route("POST", "/containers/helper/start", b"", status=204)
+    daemon.route("POST", "/containers/helper/wait", {"StatusCode": 0})
+    daemon.route("DELETE", "/containers/helper", b"", status=204)
+    daemon.route("GET", "/containers/helper/logs", b"", content_type="application/vnd.docker.multiplexed-stream")
+    daemon.route("GET", "/containers/helper/archive", _tar([("from/a.txt", b"abc")]), content_type="application/x-tar")
+    daemon.route("PUT", "/containers/helper/archive", b"")
+    cancel = threading.Event()
+    cancel.set()
+
+    assert not volume_service.copy_volume("src", "dst", cancel=cancel)
+    assert ("DELETE", "/containers/helper?force=1", b"") in daemon.requests
+
+
+def test_volume_backup_round_trips_and_detects_corruption(daemon, tmp_path):
+    daemon.route("POST", "/containers/create", {"Id": "helper"}, status=201)
+    daemon.route("POST", "/containers/helper/start", b"", status=204)
+    daemon.route("POST", "/containers/helper/wait", {"StatusCode": 0})
+    daemon.route("DELETE", "/containers/helper", b"", status=204)
+    daemon.route("GET", "/containers/helper/archive", _tar([
+        ("from", None), ("from/a.txt", b"abc" * 1000), ("from/sub", None), ("from/sub/b.txt", b"hello"),
+    ]), content_type="application/x-tar")
+    daemon.route("PUT", "/containers/helper/archive", b"")
+    archive_path = tmp_path / "data.tar.gz"
+
+    assert volume_service.backup_volume("data", str(archive_path), compression="gzip", max_workers=2)
+    assert archive_path.read_bytes()[:2] == b"\x1f\x8b" and not (tmp_path / "data.tar.gz.partial").exists()
+    with tarfile.open(archive_path) as archive:
+        manifest = json.load(archive.extractfile(volume_service.BACKUP_MANIFEST))
+    assert (manifest["volume"], manifest["files"], manifest["bytes"]) == ("data", 2, 3005)
+
+    daemon.requests.clear()
+    assert volume_service.restore_volume(str(archive_path), "copy")
+    upload = next(body for method, _, body in daemon.requests if method == "PUT")
+    with tarfile.open(fileobj=io.BytesIO(upload)) as archive:
+        assert archive.getnames() == [volume_service.COPY_MARKER, "a.txt", "sub", "sub/b.txt"]
+    assert daemon.requests[-2][1] == "/containers/helper/wait"
+
+    # A backup whose contents no longer match its checksum leaves the marker in place
+    corrupt_path = tmp_path / "corrupt.tar"
+    manifest["sha256"] = "0" * 64
+    corrupt_path.write_bytes(_tar([("a.txt", b"abc"), (volume_service.BACKUP_MANIFEST, json.dumps(manifest).encode())]))
+    daemon.requests.clear()
+    assert not volume_service.restore_volume(str(corrupt_path), "copy")
+    assert not any(path.endswith("/start") for _, path, _ in daemon.requests)
+
+
+def test_concurrent_pulls_count_shared_layers_once(daemon):
+    progress = [
+        {"status": "Pulling from library/app", "id": "latest"},
+        {"status": "Pulling fs layer", "id": "aaa"},
+        {"status": "Downloading", "id": "aaa", "progressDetail": {"current": 50, "total": 100}},
+        {"status": "Downloading", "id": "bbb", "progressDetail": {"current": 10, "total": 40}},
+        {"status": "Pull complete", "id": "aaa"},
+        {"status": "Already exists", "id": "bbb"},
+        {"status": "Status: Downloaded newer image for app:latest"},
+    ]
+    daemon.route("POST", "/images/create", b"\n".join(json.dumps(message).encode() for message in progress))
+    daemon.route("POST", "/images/registry.local:5000/app/push", b'{"status": "Preparing", "id": "aaa"}\n'
+                 b'{"errorDetail": {"message": "denied"}, "error": "denied"}')
+    tracker = image_service.LayerTracker()
+    done = []
+
+    result = image_service.pull_images(["app:1", "worker:1", "app:1"], max_workers=2, on_progress=tracker.update,
+                                       on_done=lambda *update: done.append(update))
+
+    assert sorted(result.succeeded) == ["app:1", "worker:1"] and not result.failed
+    assert tracker.totals() == image_service.TransferTotals(2, 2, 140, 140)
+    assert tracker.shared_layers() == {"aaa": {"app:1", "worker:1"}, "bbb": {"app:1", "worker:1"}}
+    assert sorted(image for image, _, _ in done) == ["app:1", "worker:1"]
+
+    result = image_service.push_images(["registry.local:5000/app:1"])
+    assert result.failed == {"registry.local:5000/app:1": "denied"}
+
+
+def test_image_layers_take_sizes_from_history(daemon):
+    daemon.route("GET", "/images/app/json", {"Id": "sha256:app", "RootFS": {"Layers": [
+        "sha256:base", image_service.EMPTY_LAYER, "sha256:code"]}})
+    daemon.route("GET", "/images/app/history", [
+        {"CreatedBy": "CMD [\"app\"]", "Size": 0},
+        {"CreatedBy": "COPY . /app", "Size": 300},
+        {"CreatedBy": "WORKDIR /app", "Size": 0},
+        {"CreatedBy": "ADD rootfs.tar /", "Size": 7000},
+    ])
+
+    assert image_service.get_image_layers("app") == [
+        ("sha256:base", 7000), (image_service.EMPTY_LAYER, 0), ("sha256:code", 300)]
+
+
+def test_image_layers_keep_the_place_of_zero_byte_layers(daemon, caplog):
+    daemon.route("GET", "/images/app/json", {"Id": "sha256:app", "RootFS": {"Layers": [
+        "sha256:base", "sha256:whiteouts", "sha256:code"]}})
+    daemon.route("GET", "/images/app/history", [
+        {"CreatedBy": "/bin/sh -c #(nop)  CMD [\"app\"]", "Size": 0},
+        {"CreatedBy": "/bin/sh -c #(nop) COPY dir:1f2e in /app", "Size": 300},
+        {"CreatedBy": "/bin/sh -c rm -rf /var/cache/apt", "Size": 0},
+        {"CreatedBy": "/bin/sh -c #(nop)  ENV LANG=C.UTF-8", "Size": 0},
+        {"CreatedBy": "/bin/sh -c #(nop) ADD file:9a3c in / ", "Size": 7000},
+    ])
+
+    assert image_service.get_image_layers("app") == [
+        ("sha256:base", 7000), ("sha256:whiteouts", 0), ("sha256:code", 300)]
+    assert "layer sizes may be off" not in caplog.text
+
+    # A history with fewer layers than the image is reported too, not only one with more
+    daemon.route("GET", "/images/app/history", [{"CreatedBy": "ADD rootfs.tar /", "Size": 7000}])
+    assert image_service.get_image_layers("app") == [
+        ("sha256:base", 7000), ("sha256:whiteouts", 0), ("sha256:code", 0)]
+    assert "has 1 layers but the image has 3" in caplog.text
+
+
+def test_inspect_images_lists_once_and_rejects_empty_or_ambiguous_prefixes(daemon):
+    def image(image_id, tags=(), digests=()):
+        return {"Id": f"sha256:{image_id}", "RepoTags": list(tags), "RepoDigests": list(digests),
+                "Created": 1721731309, "Size": 100}
+
+    daemon.route("GET", "/images/json", [
+        image("abc111", ["app:latest"], ["app@sha256:d1"]),
+        image("abc222"),
+        image("fed333", ["worker:2"]),
+    ])
+    daemon.route("GET", "/images/docker.io/library/worker:2/json", image("fed333", ["worker:2"]))
+
+    result = image_service.inspect_images(["app", "app@sha256:d1", "abc2", "sha256:fed", "abc", "",
+                                           "docker.io/library/worker:2", "missing:1"], chunk_size=3)
+
+    assert {key: image.id for key, image in result.found.items()} == {
+        "app": "abc111", "app@sha256:d1": "abc111", "abc2": "abc222", "sha256:fed": "fed333",
+        "docker.io/library/worker:2": "fed333"}
+    assert "Ambiguous" in result.errors["abc"] and "Invalid" in result.errors[""]
+    assert "missing:1" in result.errors
+    # One listing for every chunk; only references it cannot resolve are inspected
+    assert [path for _, path, _ in daemon.requests] == [
+        "/images/json?all=1", "/images/docker.io/library/worker:2/json", "/images/missing:1/json"]
+
+
+def test_batched_inspect_does_not_shadow_inspect_payloads(daemon):
+    daemon.route("GET", "/images/json", [{"Id": "sha256:app", "RepoTags": ["app:1"], "Created": 1721731309,
+                                          "Size": 7000}])
+    daemon.route("GET", "/images/app:1/json", {"Id": "sha256:app", "RootFS": {"Layers": ["sha256:base"]}})
+    daemon.route("GET", "/images/app:1/history", [{"CreatedBy": "ADD rootfs.tar /", "Size": 7000}])
+    network = {"Id": "net1", "Name": "backend", "Driver": "bridge", "Scope": "local",
+               "Created": "2024-07-23T10:41:49.123456789Z"}
+    daemon.route("GET", "/networks", [network])
+    daemon.route("GET", "/networks/backend", dict(network, Containers={"c1": {"Name": "web"}}))
+
+    assert list(image_service.inspect_images(["app:1"]).found) == ["app:1"]
+    assert image_service.get_image_layers("app:1") == [("sha256:base", 7000)]
+    assert list(network_service.inspect_networks(["backend"]).found) == ["backend"]
+    assert network_service.get_network_by_id("backend").name == "backend"
+    assert "Containers" in inspect_cache.get("network", "backend")
+
+    # Invalidating an image drops its summary too
+    inspect_cache.invalidate("image", "app:1")
+    assert inspect_cache.get("image-summary", "app:1") is None
+
+
+def test_image_gc_plans_children_first_and_skips_ancestors_of_failures(daemon):
+    def image(image_id, tags, created, parent=""):
+        return {"Id": f"sha256:{image_id}", "ParentId": parent and f"sha256:{parent}", "RepoTags": tags,
+                "Created": created, "Size": 1000}
+
+    daemon.route("GET", "/images/json", [
+        image("base", ["base:1"], 100),
+        image("app1", ["app:1"], 100, parent="base"),
+        image("app2", ["app:2"], 200, parent="base"),
+        image("old", ["app:0", "legacy:0"], 50),
+        image("tool1", ["tool:1"], 10),
+        image("tool2", ["tool:2"], 20),
+        image("dangling", ["<none>:<none>"], 150, parent="app1"),
+    ])
+    daemon.route("GET", "/containers/json", [{"Id": "c1", "ImageID": "sha256:tool1"}])
+    daemon.route("GET", "/system/df", {"Images": [
+        {"Id": "sha256:app1", "Created": 100, "Size": 1000, "SharedSize": 400},
+        {"Id": "sha256:dangling", "Created": 150, "Size": 1000, "SharedSize": 900},
+    ]})
+
+    plan = image_gc.plan_gc(image_gc.GCPolicy(keep_last=1))
+
+    assert [action.target for action in plan.untags] == ["app:0"]
+    assert [[action.target for action in wave] for wave in plan.waves] == [["dangling"], ["app1"]]
+    assert plan.kept == {"tool1": "used by 1 container(s)"}
+    assert (plan.freed_bytes, plan.exact) == (700, False)
+    assert not any(method == "DELETE" for method, _, _ in daemon.requests)
+
+    daemon.route("DELETE", "/images/app:0", [{"Untagged": "app:0"}])
+    daemon.route("DELETE", "/images/dangling", {"message": "conflict: image is being used"}, status=409)
+    result = image_gc.run_gc(plan)
+
+    assert result.succeeded == ["app:0"]
+    assert result.failed["dangling"] == "conflict: image is being used"
+    assert "app1" in result.failed
+    assert [path for method, path, _ in daemon.requests if method == "DELETE"] == [
+        "/images/app:0?noprune=1", "/images/dangling?noprune=1"]
+
+
+def test_image_gc_deletes_untagged_intermediate_chains_one_image_at_a_time(daemon):
+    daemon.route("GET", "/images/json", [
+        {"Id": "sha256:app0", "ParentId": "sha256:mid1", "RepoTags": ["app:0"], "Created": 50, "Size": 1000},
+        {"Id": "sha256:mid1", "ParentId": "sha256:mid2", "RepoTags": [], "Created": 40, "Size": 900},
+        {"Id": "sha256:mid2", "ParentId": "", "RepoTags": ["<none>:<none>"], "Created": 30, "Size": 800},
+        {"Id": "sha256:app1", "ParentId": "", "RepoTags": ["app:1"], "Created": 100, "Size": 1000},
+    ])
+    daemon.route("GET", "/containers/json", [])
+    daemon.route("DELETE", "/images/app0", [{"Deleted": "sha256:app0"}])
+    daemon.route("DELETE", "/images/mid1", [{"Deleted": "sha256:mid1"}])
+
+    plan = image_gc.plan_gc(image_gc.GCPolicy(keep_last=1, untagged=True))
+    assert [[action.target for action in wave] for wave in plan.waves] == [["app0"], ["mid1"], ["mid2"]]
+    result = image_gc.run_gc(plan)
+
+    # Nothing is pruned behind the plan's back, and an image that is already gone counts as removed
+    assert result.succeeded == ["app0", "mid1", "mid2"] and not result.failed
+    assert [path for method, path, _ in daemon.requests if method == "DELETE"] == [
+        "/images/app0?noprune=1", "/images/mid1?noprune=1", "/images/mid2?noprune=1"]
+
+
+def test_topology_index_answers_from_two_listings_and_updates_incrementally(daemon):
+    daemon.route("GET", "/networks", [
+        {"Id": "net1", "Name": "backend", "Driver": "bridge",
+         "IPAM": {"Config": [{"Subnet": "172.18.0.0/29", "Gateway": "172.18.0.1"}]}},
+        {"Id": "net2", "Name": "frontend", "Driver": "bridge", "IPAM": {"Config": [{"Subnet": "172.19.0.0/24"}]}},
+    ])
+    daemon.route("GET", "/containers/json", [
+        {"Id": "web1", "Names": ["/web"], "NetworkSettings": {"Networks": {
+            "backend": {"NetworkID": "net1", "IPAddress": "172.18.0.2", "Aliases": ["web"]},
+            "frontend": {"NetworkID": "net2", "IPAddress": "172.19.0.2"}}}},
+        {"Id": "db1", "Names": ["/db"], "NetworkSettings": {"Networks": {
+            "backend": {"NetworkID": "net1", "IPAddress": "172.18.0.3"}}}},
+        {"Id": "proxy1", "Names": ["/proxy"], "NetworkSettings": {"Networks": {
+            "frontend": {"NetworkID": "net2", "IPAddress": "172.19.0.3"}}}},
+    ])
+
+    topology = TopologyIndex.fetch()
+
+    assert topology.reachable_from("db") == {"web1": {"net1"}}
+    assert topology.reachable_from("web") == {"db1": {"net1"}, "proxy1": {"net2"}}
+    # 8 addresses, less network, broadcast, gateway and the two in use
+    assert topology.free_addresses("backend") == {"172.18.0.0/29": 3}
+    assert len(daemon.requests) == 2
+
+    daemon.route("POST", "/networks/backend/connect", b"")
+    daemon.route("POST", "/networks/frontend/disconnect", b"")
+    daemon.route("GET", "/networks/net1", {
+        "Id": "net1", "Name": "backend", "Driver": "bridge",
+        "IPAM": {"Config": [{"Subnet": "172.18.0.0/29", "Gateway": "172.18.0.1"}]},
+        "Containers": {"web1": {"Name": "web", "IPv4Address": "172.18.0.2/29"},
+                       "db1": {"Name": "db", "IPv4Address": "172.18.0.3/29"},
+                       "proxy1": {"Name": "proxy", "IPv4Address": "172.18.0.4/29"}}})
+
+    connected = topology.connect_many([("proxy", "backend")], aliases=["edge"])
+    disconnected = topology.disconnect_many([("web", "frontend"), ("db", "missing")])
+
+    assert connected.succeeded == ["proxy/backend"]
+    assert disconnected.succeeded == ["web/frontend"]
+    assert disconnected.failed == {"db/missing": "page not found"}
+    assert topology.reachable_from("proxy") == {"web1": {"net1"}, "db1": {"net1"}}
+    assert topology.free_addresses("backend") == {"172.18.0.0/29": 2}
+    assert {endpoint.network_id: endpoint.aliases for endpoint in topology.attachments("proxy")} == {
+        "net1": ("edge",), "net2": ()}
+    assert [endpoint.aliases for endpoint in topology.attachments("web")] == [("web",)]
+    assert [path for method, path, _ in daemon.requests if method == "GET"] == [
+        "/networks", "/containers/json?all=1", "/networks/net1"]
+
+
+def test_engine_monitor_backs_off_while_down_and_fails_requests_fast(daemon, tmp_path):
+    monitor = EngineMonitor(interval=5.0, min_backoff=1.0, max_backoff=4.0, clock=lambda: 1000.0)
+    seen = []
+    monitor.subscribe(seen.append)
+    daemon.route("GET", "/_ping", b"OK", content_type="text/plain")
+    daemon.route("GET", "/containers/json", [CONTAINER_SUMMARY])
+
+    assert monitor.state == STARTING
+    health = monitor.check()
+    assert health.state == UP and health.latency is not None and monitor.next_delay() == 5.0
+    assert monitor.check().average_latency is not None
+
+    # A missed ping only degrades the engine; a second one takes it down
+    set_client(DockerClient(f"unix://{tmp_path / 'missing.sock'}"))
+    assert monitor.check().state == DEGRADED
+    assert monitor.next_delay() == 1.0
+    health = monitor.check()
+    assert health.state == DOWN and health.failures == 2 and health.since == 1000.0
+    assert [monitor.check().state, monitor.next_delay()] == [DOWN, 4.0]
+    monitor.check()
+    assert monitor.next_delay() == 4.0
+    with pytest.raises(DockerClientError, match="Docker engine is down"):
+        get_client().request_json("GET", "/containers/json")
+    assert api_request("GET", "/containers/json")[0] is False
+
+    # Once pings are answered again, so are requests
+    set_client(DockerClient(f"unix://{daemon.server_address}"))
+    get_client().unavailable = "stale"
+    assert monitor.check().state == UP
+    assert len(get_client().request_json("GET", "/containers/json")) == 1
+    assert [health.state for health in seen] == [UP, UP, DEGRADED, DOWN, DOWN, DOWN, UP]
+
+    # A daemon that answers with an error is still starting
+    daemon.route("GET", "/_ping", {"message": "starting"}, status=500)
+    health = monitor.check()
+    assert health.state == STARTING and health.error == "starting"
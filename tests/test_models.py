@@ -0,0 +1,142 @@
+from dataclasses import FrozenInstanceError, replace
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.core.models.container import Container
+from src.core.models.image import Image
+from src.core.models.network import Network
+from src.core.models.snapshot import ColumnarSnapshot, StringTable
+from src.utils.docker_utils import LabelMap, PortMapping, format_timestamp, parse_docker_timestamp
+
+CLI_CONTAINER = {
+    "ID": "8dfafdbc3a40", "Names": "web", "Image": "nginx:latest", "Status": "Up 2 hours", "State": "running",
+    "CreatedAt": "2024-07-23 16:11:49 +0530 IST", "Ports": "0.0.0.0:8080->80/tcp", "Command": '"nginx"',
+    "Labels": "", "Networks": "bridge", "Mounts": "", "Size": "0B", "RunningFor": "2 hours ago",
+}
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("2024-07-23T16:11:49.402882301Z", "2024-07-23T16:11:49.402882+00:00"),
+    ("2024-07-23T16:11:49.4+05:30", "2024-07-23T16:11:49.400000+05:30"),
+    ("2024-07-23 16:11:49 -0700 PDT", "2024-07-23T16:11:49-07:00"),
+    ("2024-07-23 16:11:49.123456789 +0000 UTC", "2024-07-23T16:11:49.123456+00:00"),
+])
+def test_parse_docker_timestamp(value, expected):
+    assert parse_docker_timestamp(value).isoformat() == expected
+
+
+@pytest.mark.parametrize("value", ["", "yesterday", "2024-07-23 16:11:49"])
+def test_parse_docker_timestamp_rejects_invalid_values(value):
+    with pytest.raises(ValueError):
+        parse_docker_timestamp(value)
+
+
+def test_parsed_timestamps_share_timezones_and_keep_zone_names():
+    first = parse_docker_timestamp("2024-07-23 16:11:49 +0530 IST")
+    second = parse_docker_timestamp("2024-01-02 03:04:05 +0530 IST")
+
+    assert first.tzinfo is second.tzinfo
+    assert format_timestamp(first) == "2024-07-23 16:11:49 +0530 IST"
+
+
+def test_created_is_parsed_on_first_access():
+    container = Container.from_dict(CLI_CONTAINER)
+
+    assert Container.created.raw(container) == CLI_CONTAINER["CreatedAt"]
+    assert container.created.utcoffset() == timedelta(hours=5, minutes=30)
+    assert isinstance(Container.created.raw(container), datetime)
+
+
+def test_network_from_dict_parses_nanosecond_timestamps():
+    network = Network.from_dict({
+        "ID": "3f2a", "Name": "bridge", "Driver": "bridge", "Scope": "local", "IPv6": "false",
+        "Internal": "false", "Labels": "", "CreatedAt": "2024-07-23 16:11:49.402882301 +0000 UTC",
+    })
+
+    assert network.created_at == parse_docker_timestamp("2024-07-23T16:11:49.402882Z")
+
+
+def test_models_are_slotted_and_immutable():
+    container = Container.from_dict(CLI_CONTAINER)
+
+    assert not hasattr(container, "__dict__")
+    with pytest.raises(FrozenInstanceError):
+        container.state = "exited"
+    assert container.image is Container.from_dict(dict(CLI_CONTAINER, ID="other")).image
+
+
+def test_columnar_snapshot_round_trips_and_diffs():
+    table = StringTable()
+    web = Container.from_dict(CLI_CONTAINER)
+    db = Container.from_dict(dict(CLI_CONTAINER, ID="4c01db0b339c", Names="db", Image="postgres:16"))
+    before = ColumnarSnapshot(Container, [web, db], table=table)
+    after = ColumnarSnapshot(Container, [replace(web, state="exited"),
+                                         Container.from_dict(dict(CLI_CONTAINER, ID="0e5c3a1f", Names="cache"))],
+                             table=table)
+
+    assert [container.to_tuple() for container in before] == [web.to_tuple(), db.to_tuple()]
+    assert str(before.find("4c01db0b339c")) == str(db)
+    # Timestamps that were never read are stored raw and stay lazy
+    assert Container.created.raw(before[0]) == CLI_CONTAINER["CreatedAt"]
+    assert before.column("image") == ["nginx:latest", "postgres:16"]
+    assert before.diff(after) == ({"0e5c3a1f"}, {"4c01db0b339c"}, {"8dfafdbc3a40"})
+
+
+def test_snapshot_diff_compares_parsed_and_raw_timestamps_by_value():
+    table = StringTable()
+    lazy = Container.from_dict(CLI_CONTAINER)
+    parsed = Container.from_dict(CLI_CONTAINER)
+    parsed.created  # Parses the slot in place
+    before = ColumnarSnapshot(Container, [lazy], table=table)
+    after = ColumnarSnapshot(Container, [parsed], table=table)
+
+    assert before.diff(after) == (set(), set(), set())
+    assert before.diff(ColumnarSnapshot(Container, [parsed])) == (set(), set(), set())
+    moved = Container.from_dict(dict(CLI_CONTAINER, CreatedAt="2024-01-01 00:00:00 +0000 UTC"))
+    assert before.diff(ColumnarSnapshot(Container, [moved], table=table)) == (set(), set(), {lazy.id})
+
+
+def test_typed_fields_are_parsed_once_and_displayed_as_before():
+    container = Container.from_dict(dict(CLI_CONTAINER, Ports="0.0.0.0:8000-8001->8000-8001/tcp, 53/udp",
+                                         Size="1.2kB (virtual 187MB)"))
+
+    assert container.port_mappings == (
+        PortMapping(8000, "tcp", "0.0.0.0", 8000), PortMapping(8001, "tcp", "0.0.0.0", 8001), PortMapping(53, "udp"),
+    )
+    assert container.ports == "0.0.0.0:8000->8000/tcp, 0.0.0.0:8001->8001/tcp, 53/udp"
+    assert container.size_bytes == 1200 and container.size == "1.2kB"
+    assert container.created_at == CLI_CONTAINER["CreatedAt"]
+
+    image = Image.from_api({"Id": "sha256:abc", "RepoTags": ["nginx:latest"], "Created": 1721731309,
+                            "Size": 187_000_000, "SharedSize": 7_000_000, "Containers": 2})
+    assert (image.size, image.unique_size_bytes, image.containers) == ("187MB", 180_000_000, "2")
+    assert Image.created_at.epoch(image) == 1721731309
+
+
+def test_snapshot_sorts_and_totals_integer_columns():
+    images = [Image.from_api({"Id": f"sha256:{i}", "RepoTags": [f"app:{i}"], "Created": 0, "Size": size})
+              for i, size in enumerate([300, 100, -1, 200])]
+    snapshot = ColumnarSnapshot(Image, images)
+
+    assert snapshot.total("size_bytes") == 600
+    assert [snapshot[index].tag for index in snapshot.sort_order("size_bytes", reverse=True)] == ["0", "3", "1", "2"]
+
+
+def test_labels_are_parsed_once_into_interned_maps():
+    cli = Container.from_dict(dict(CLI_CONTAINER, Labels="com.docker.compose.project=shop,tier=web"))
+    api = Container.from_api({"Id": "abc", "Names": ["/web"], "Image": "nginx", "Status": "Up", "State": "running",
+                              "Created": 0, "Labels": {"tier": "web", "com.docker.compose.project": "shop"}})
+
+    assert cli.label_map == api.label_map == {"com.docker.compose.project": "shop", "tier": "web"}
+    assert hash(cli.label_map) == hash(api.label_map)
+    assert cli.labels == api.labels == "com.docker.compose.project=shop,tier=web"
+    assert next(iter(cli.label_map)) is next(iter(api.label_map))
+    assert Container.from_dict(CLI_CONTAINER).label_map == LabelMap()
+
+
+def test_api_containers_listed_without_sizes_have_unknown_sizes():
+    summary = {"Id": "abc", "Names": ["/web"], "Image": "nginx", "Status": "Up", "State": "running", "Created": 0}
+
+    assert Container.from_api(summary).size == "N/A"
+    assert Container.from_api(dict(summary, SizeRw=0)).size_bytes == 0
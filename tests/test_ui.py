@@ -0,0 +1,118 @@
+from typing import NamedTuple
+
+from PySide6.QtCore import Qt
+
+from src.ui.table_model import ResourceFilterProxy, ResourceTableModel
+from src.ui.workers import BatchLoader
+
+# Names of the rows whose display tuple was built
+built = []
+
+
+class Row(NamedTuple):
+    name: str
+    size_bytes: int
+
+    def to_tuple(self):
+        built.append(self.name)
+        return (self.name, f"{self.size_bytes}B")
+
+    def sort_tuple(self):
+        return (self.name, self.size_bytes)
+
+
+def table(*rows):
+    model = ResourceTableModel(["Name", "Size"], key=lambda row: row.name)
+    model.upsert_many(rows)
+    return model
+
+
+def cells(model, role=Qt.DisplayRole):
+    return [tuple(model.data(model.index(row, column), role) for column in range(1, model.columnCount()))
+            for row in range(model.rowCount())]
+
+
+def run_loader(load, batch_size=2):
+    loader = BatchLoader(7, load, batch_size=batch_size)
+    events = []
+    loader.signals.batch.connect(lambda generation, items: events.append(("batch", generation, items)))
+    loader.signals.finished.connect(lambda generation: events.append(("finished", generation)))
+    loader.signals.failed.connect(lambda generation, message: events.append(("failed", generation, message)))
+    return loader, events
+
+
+def test_batch_loader_streams_batches_tagged_with_its_generation():
+    loader, events = run_loader(lambda: iter(range(5)))
+
+    loader.run()
+
+    assert events == [("batch", 7, [0, 1]), ("batch", 7, [2, 3]), ("batch", 7, [4]), ("finished", 7)]
+
+
+def test_batch_loader_reports_failures_after_the_rows_it_got():
+    def load():
+        yield "web"
+        yield "db"
+        raise ConnectionError("daemon went away")
+
+    loader, events = run_loader(load)
+
+    loader.run()
+
+    assert events == [("batch", 7, ["web", "db"]), ("failed", 7, "daemon went away")]
+
+
+def test_cancelled_batch_loader_stops_without_finishing():
+    loader, events = run_loader(lambda: iter(range(5)))
+    loader.signals.batch.connect(lambda generation, items: loader.cancel())
+
+    loader.run()
+
+    assert events == [("batch", 7, [0, 1])]
+
+
+def test_table_model_builds_display_rows_only_when_asked():
+    built.clear()
+    model = table(Row("web", 10), Row("db", 20), Row("web", 30))
+
+    assert model.rowCount() == 2 and model.keys() == ["web", "db"]
+    assert built == []
+    assert model.data(model.index(1, 1)) == "db"
+    assert built == ["db"]
+    assert cells(model) == [("web", "30B"), ("db", "20B")]
+
+
+def test_table_model_upserts_in_place_and_removes_rows():
+    model = table(Row("web", 10), Row("db", 20), Row("cache", 5))
+    model.setData(model.index(1, 0), Qt.Checked, Qt.CheckStateRole)
+    model.setData(model.index(2, 0), Qt.Checked, Qt.CheckStateRole)
+    changed = []
+    model.dataChanged.connect(lambda top_left, bottom_right, roles=(): changed.append(top_left.row()))
+
+    model.upsert(Row("web", 15))
+    model.remove("db")
+    model.remove("missing")
+
+    assert changed == [0]
+    assert cells(model) == [("web", "15B"), ("cache", "5B")]
+    assert model.checked_keys() == ["cache"]
+    assert model.key_at(1) == "cache"
+    model.upsert(Row("cache", 50))
+    assert cells(model, Qt.UserRole) == [("web", 15), ("cache", 50)]
+
+
+def test_filter_proxy_sorts_by_value_and_filters_by_text_and_keys():
+    model = table(Row("web", 100), Row("db", 9), Row("worker", 20))
+    proxy = ResourceFilterProxy()
+    proxy.setSourceModel(model)
+
+    proxy.sort(2, Qt.AscendingOrder)
+    assert [proxy.index(row, 1).data() for row in range(proxy.rowCount())] == ["db", "worker", "web"]
+
+    proxy.setFilterFixedString("W")
+    assert [proxy.index(row, 1).data() for row in range(proxy.rowCount())] == ["worker", "web"]
+    proxy.set_allowed_keys({"web", "db"})
+    assert [proxy.index(row, 1).data() for row in range(proxy.rowCount())] == ["web"]
+    proxy.set_allowed_keys(None)
+    proxy.setFilterFixedString("")
+    assert proxy.rowCount() == 3